@@ -83,6 +83,14 @@ def create_app(config=None):
     app.config['STRIPE_SECRET_KEY'] = os.environ.get("STRIPE_SECRET_KEY", "")
     app.config['STRIPE_PUBLIC_KEY'] = os.environ.get("STRIPE_PUBLIC_KEY", "")
     app.config['STRIPE_WEBHOOK_SECRET'] = os.environ.get("STRIPE_WEBHOOK_SECRET", "")
+    # Shadow-mode parser comparison (see app/utils/shadow_parser.py); disabled unless both are set
+    app.config['SHADOW_PARSER'] = os.environ.get("SHADOW_PARSER", "")
+    app.config['SHADOW_SAMPLE_RATE'] = float(os.environ.get("SHADOW_SAMPLE_RATE", 0))
+    # Slow/failed parse capture (see app/utils/parse_quarantine.py); off unless a folder is set, and bounded
+    app.config['PARSE_QUARANTINE_FOLDER'] = os.environ.get("PARSE_QUARANTINE_FOLDER", "")
+    app.config['PARSE_QUARANTINE_MAX_FILES'] = int(os.environ.get("PARSE_QUARANTINE_MAX_FILES", 200))
+    app.config['PARSE_QUARANTINE_MAX_BYTES'] = int(os.environ.get("PARSE_QUARANTINE_MAX_BYTES", 256 * 1024 * 1024))
+    app.config['SLOW_PARSE_SECONDS'] = float(os.environ.get("SLOW_PARSE_SECONDS", 5.0))
     # Ensure BASE_URL is always set for Stripe success/cancel URLs
     app.config['BASE_URL'] = os.environ.get("BASE_URL", "http://localhost:5000")
     logging.info(f"BASE_URL at app startup: {app.config['BASE_URL']}")
@@ -40,14 +40,13 @@ def order_detail(order_id):
             if os.path.exists(file_path):
                 try:
                     parse_result = dxf_parser.parse_dxf(file_path, material=item.material, thickness=item.thickness)
-                    total_length, net_area_sqin, gross_min_x, gross_min_y, gross_max_x, gross_max_y, gross_area_sqin, gross_weight_lb, net_weight_lb, entity_count_dict, outer_perimeter, preview, pierce_count = parse_result
                     previews.append({
                         'part_number': item.part_number,
-                        'preview': json.dumps(preview),
-                        'gross_min_x': gross_min_x,
-                        'gross_max_x': gross_max_x,
-                        'gross_min_y': gross_min_y,
-                        'gross_max_y': gross_max_y
+                        'preview': parse_result.preview_json(),
+                        'gross_min_x': parse_result.gross_min_x,
+                        'gross_max_x': parse_result.gross_max_x,
+                        'gross_min_y': parse_result.gross_min_y,
+                        'gross_max_y': parse_result.gross_max_y
                     })
                 except Exception as e:
                     logger.error(f"Error parsing {file_path} for preview: {str(e)}", exc_info=True)
@@ -86,27 +85,23 @@ def reorder(order_id):
         copyfile(src_path, new_path)
         try:
             parse_result = dxf_parser.parse_dxf(new_path, material=item.material, thickness=item.thickness)
-            total_length, net_area_sqin, gross_min_x, gross_min_y, gross_max_x, gross_max_y, gross_area_sqin, gross_weight_lb, net_weight_lb, entity_count_dict, outer_perimeter, preview, pierce_count = parse_result
-            entity_count = sum(entity_count_dict.values())
+            # Weights and the outer perimeter are no longer parser outputs (costing computes them)
             new_item = OrderItem(
                 order_id=new_order.id,
                 part_number=item.part_number,
                 quantity=item.quantity,
                 material=item.material,
                 thickness=item.thickness,
-                length=total_length,
-                net_area_sqin=net_area_sqin,
-                gross_area_sqin=gross_area_sqin,
-                net_weight_lb=net_weight_lb,
-                outer_perimeter=outer_perimeter,
-                gross_min_x=gross_min_x,
-                gross_min_y=gross_min_y,
-                gross_max_x=gross_max_x,
-                gross_max_y=gross_max_y,
-                gross_weight_lb=gross_weight_lb,
-                entity_count=entity_count,
-                preview=json.dumps(preview),
-                pierce_count=pierce_count,
+                length=parse_result.total_length,
+                net_area_sqin=parse_result.net_area_sqin,
+                gross_area_sqin=parse_result.gross_area_sqin,
+                gross_min_x=parse_result.gross_min_x,
+                gross_min_y=parse_result.gross_min_y,
+                gross_max_x=parse_result.gross_max_x,
+                gross_max_y=parse_result.gross_max_y,
+                entity_count=sum(parse_result.entity_count.values()),
+                preview=parse_result.preview_json(),
+                pierce_count=parse_result.entity_count.get('PIERCE', 0),
                 unit_price=0,
                 cost_per_part=0
             )
@@ -548,17 +543,15 @@ def customer_index():
                             material = request.form.get(f"material_{filename}", "A36 Steel")
                             thickness = float(request.form.get(f"thickness_{filename}", "0.25"))
                             parse_result = dxf_parser.parse_dxf(file_path, material=material, thickness=thickness)
-                            (total_length, net_area_sqin, gross_min_x, gross_min_y, gross_max_x, gross_max_y,
-                             gross_area_sqin, gross_weight_lb, net_weight_lb, entity_count_dict, outer_perimeter,
-                             preview, pierce_count) = parse_result
-                            entity_count = sum(entity_count_dict.values())
                             new_item = OrderItem(
                                 order_id=order_id, part_number=filename, quantity=0, material=material, thickness=thickness,
-                                length=total_length, net_area_sqin=net_area_sqin, gross_area_sqin=gross_area_sqin,
-                                net_weight_lb=net_weight_lb, outer_perimeter=outer_perimeter,
-                                gross_min_x=gross_min_x, gross_min_y=gross_min_y, gross_max_x=gross_max_x,
-                                gross_max_y=gross_max_y, gross_weight_lb=gross_weight_lb, entity_count=entity_count,
-                                preview=json.dumps(preview), pierce_count=pierce_count, unit_price=0, cost_per_part=0
+                                length=parse_result.total_length, net_area_sqin=parse_result.net_area_sqin,
+                                gross_area_sqin=parse_result.gross_area_sqin,
+                                gross_min_x=parse_result.gross_min_x, gross_min_y=parse_result.gross_min_y,
+                                gross_max_x=parse_result.gross_max_x, gross_max_y=parse_result.gross_max_y,
+                                entity_count=sum(parse_result.entity_count.values()),
+                                preview=parse_result.preview_json(),
+                                pierce_count=parse_result.entity_count.get('PIERCE', 0), unit_price=0, cost_per_part=0
                             )
                             new_items.append(new_item)
                             flash(f"Added {filename} to cart", "success")
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.utils import dxf_parser, costing
+from app.utils.parse_result import dump_preview
 from app import db
 from app.routes.main import load_inputs
 import json
@@ -39,13 +40,14 @@ def parse_dxf():
                 'cart_uid': cart_uid,
                 'order_id': order_id,
                 'part_number': file.filename,
-                'preview': json.dumps(parse_result.get('preview', [])),
+                'preview': dump_preview(parse_result),
                 'gross_min_x': parse_result.get('gross_min_x', 0),
                 'gross_max_x': parse_result.get('gross_max_x', 0),
                 'gross_min_y': parse_result.get('gross_min_y', 0),
                 'gross_max_y': parse_result.get('gross_max_y', 0),
                 'net_area_sqin': parse_result.get('net_area_sqin', 0),
                 'gross_area_sqin': parse_result.get('gross_area_sqin', 0),
+                'oriented_area_sqin': parse_result.get('oriented_area_sqin', 0),
                 'total_length': parse_result.get('total_length', 0),
                 'pierce_count': parse_result.get('entity_count', {}).get('PIERCE', 0),
                 'material': material,
@@ -9,6 +9,7 @@ import secrets
 from shutil import copyfile
 from werkzeug.utils import secure_filename
 import math
+import time
 import stripe
 import logging
 from flask_cors import cross_origin  # For React dev mode
@@ -17,8 +18,9 @@ from app import db
 from app.models.order import create_order, get_user_orders
 from app.models.upload import create_upload, get_user_uploads
 from app.models.user import create_user, get_user
-from app.utils import dxf_parser, costing
+from app.utils import dxf_parser, dxf_preflight, costing, shadow_parser, parse_quarantine, pricing_config
 from app.utils.email import send_receipt_email
+from app.utils.parse_result import dump_preview
 from app import mail, login_manager
 
 STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY')
@@ -49,41 +51,23 @@ AVAILABLE_THICKNESSES = [0.25, 0.5, 0.75, 1.0, 1.5, 2.0]
 AVAILABLE_MATERIALS = ["A36 Steel", "Stainless 304", "Stainless 316", "Aluminum 3003", "Aluminum 6061"]
 
 def load_inputs():
-    """Load input parameters from inputs.csv, providing safe defaults if file is missing."""
-    inputs = {}
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-    inputs_file = os.path.join(project_root, 'inputs.csv')
-    resolved_path = os.path.abspath(inputs_file)
-    logging.info(f"Attempting to load inputs.csv from: {resolved_path}")
-    if os.path.exists(resolved_path):
-        try:
-            with open(resolved_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                logging.info(f"inputs.csv content: {lines}")
-                for line in lines:
-                    if line.strip() and not line.startswith('#'):
-                        parts = [x.strip() for x in line.split(',')]
-                        if len(parts) < 3:
-                            logging.warning(f"Skipping invalid line in inputs.csv: {line.strip()}")
-                            continue
-                        key, value, unit = parts[:3]
-                        if key in REQUIRED_INPUTS:
-                            try:
-                                inputs[key] = {"value": float(value), "unit": unit}
-                            except ValueError:
-                                logging.warning(f"Invalid value for {key} in inputs.csv: {value}")
-                                inputs[key] = {"value": 0.0, "unit": unit}
-                logging.info(f"Loaded inputs: {inputs}")
-        except Exception as e:
-            logging.error(f"Failed to parse inputs.csv: {e}")
-            for key in REQUIRED_INPUTS:
-                inputs[key] = {"value": 0.0, "unit": "unitless"}
-    else:
-        logging.warning(f"Could not load inputs.csv from {resolved_path}. Using safe defaults.")
-        for key in REQUIRED_INPUTS:
-            inputs[key] = {"value": 0.0, "unit": "unitless"}
+    """Pricing inputs from inputs.csv via the shared config registry (re-read only when the file changes)."""
+    inputs = pricing_config.get_inputs()
+    missing = [key for key in REQUIRED_INPUTS if key not in inputs]
+    if missing:
+        logging.warning(f"inputs.csv (version {inputs.version}) is missing {missing}; costing defaults apply")
     return inputs
 
+def capture_parse(save_path, reason, parse_seconds, **kwargs):
+    """Quarantine an upload's parse with the app's store settings and the parser's effective config."""
+    return parse_quarantine.capture_parse(
+        save_path, current_app.config.get('PARSE_QUARANTINE_FOLDER'), reason, parse_seconds,
+        parser_config=dxf_parser.parser_config() if reason else None,
+        max_files=current_app.config.get('PARSE_QUARANTINE_MAX_FILES', parse_quarantine.DEFAULT_MAX_FILES),
+        max_bytes=current_app.config.get('PARSE_QUARANTINE_MAX_BYTES', parse_quarantine.DEFAULT_MAX_BYTES),
+        **kwargs
+    )
+
 @main_bp.route('/preview_data')
 @cross_origin()
 def preview_data():
@@ -186,8 +170,13 @@ def parse_dxf():
             db.order_items.update_one({"cart_uid": item['cart_uid']}, {"$set": {"quantity": item['quantity']}})
         logging.info(f"Updating item {item['cart_uid']}: material={item.get('material', None)}, thickness={item.get('thickness', None)}, quantity={item.get('quantity', 1)}")
 
+    split_parts = request.form.get('split_parts', '').lower() in ('1', 'true', 'on', 'yes')
     results = []
     partial_warnings = []
+    # Geometric fingerprints of the parts already in the cart: a re-export of one of them (moved, rotated or
+    # re-ordered) is reported as a duplicate upload
+    fingerprints = {item['fingerprint']: item.get('part_number') for item in existing_items if item.get('fingerprint')}
+    duplicates = []
     for file in files:
         if file.filename == '':
             continue
@@ -197,9 +186,33 @@ def parse_dxf():
         save_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
         file.save(save_path)
         logging.info(f"Uploaded file saved to {save_path}")
-        
+
+        # Header/entity sniff decides whether the full parse can succeed before paying for ezdxf.readfile
+        preflight = dxf_preflight.preflight(save_path)
+        logging.info(f"Pre-flight for {filename}: route={preflight['route']} reasons={preflight['reasons']}")
+        if preflight['route'] == dxf_preflight.ROUTE_REJECT:
+            return jsonify({"error": f"{filename}: {preflight['reasons'][0]}"}), 400
+        heavy = preflight['route'] == dxf_preflight.ROUTE_HEAVY
+
+        parse_result = None
         try:
+            parse_start = time.perf_counter()
             parse_result = dxf_parser.parse_dxf(save_path)
+            parse_seconds = time.perf_counter() - parse_start
+            # Keep slow, timed-out and failed inputs before a later upload with the same name overwrites them
+            capture_parse(
+                save_path, parse_quarantine.classify_parse(parse_result, parse_seconds,
+                                                           current_app.config.get('SLOW_PARSE_SECONDS')),
+                parse_seconds, part_number=filename
+            )
+            # Sampled uploads are re-parsed off the request path by the candidate engine, if one is configured;
+            # heavy files are not doubled up
+            shadow_parser.submit_shadow_parse(
+                save_path, parse_result, parse_seconds, db.parser_shadow,
+                current_app.config.get('SHADOW_PARSER'),
+                0.0 if heavy else current_app.config.get('SHADOW_SAMPLE_RATE', 0.0),
+                part_number=filename
+            )
             # Accept if at least one valid geometry entity is present (total_length or net_area_sqin > 0)
             has_valid_geometry = (
                 parse_result.get('total_length', 0) > 0 or
@@ -214,39 +227,67 @@ def parse_dxf():
                 return jsonify({"error": "Invalid geometry (infinite bounds)"}), 400
             if not has_valid_geometry:
                 return jsonify({"error": "No valid geometry found"}), 400
-            cart_uid = str(uuid.uuid4())
-            order_item = {
-                'cart_uid': cart_uid,
-                'order_id': order_id,
-                'part_number': filename,
-                'preview': json.dumps(parse_result.get('preview', [])),
-                'gross_min_x': parse_result.get('gross_min_x', 0),
-                'gross_max_x': parse_result.get('gross_max_x', 0),
-                'gross_min_y': parse_result.get('gross_min_y', 0),
-                'gross_max_y': parse_result.get('gross_max_y', 0),
-                'net_area_sqin': parse_result.get('net_area_sqin', 0),
-                'total_length': parse_result.get('total_length', 0),
-                'pierce_count': parse_result.get('entity_count', {}).get('PIERCE', 0),
-                'material': None,
-                'thickness': None,
-                'quantity': 1
-            }
-            db.order_items.insert_one(order_item)  # MongoDB insert
-            results.append(order_item)
+            # A drawing holding several separate parts becomes one cart item per part when the client asks;
+            # each part is then priced as cut on its own, without common-line savings. Every contour is pierced
+            # once, so the split items' pierces add up to the whole drawing's. Open geometry closes no contour
+            # at all and stays a single item.
+            parts = parse_result.get('parts', [])
+            pierce_count = parse_result.get('contour_count', 0)
+            if split_parts and len(parts) > 1:
+                pieces = [(f"{filename} part {i} of {len(parts)}", part, 0, 1, part.get('contour_count', 1))
+                          for i, part in enumerate(parts, 1)]
+            else:
+                pieces = [(filename, parse_result, parse_result.get('common_line_length', 0), max(len(parts), 1),
+                           pierce_count)]
+            for part_number, piece, common_line_length, part_count, pierce_count in pieces:
+                fingerprint = piece.get('fingerprint', '')
+                if fingerprint in fingerprints:
+                    duplicates.append({"part_number": part_number, "matches": fingerprints[fingerprint]})
+                    logging.info(f"{part_number} is the same part as {fingerprints[fingerprint]} already in the cart")
+                elif fingerprint:
+                    fingerprints[fingerprint] = part_number
+                order_item = {
+                    'cart_uid': str(uuid.uuid4()),
+                    'order_id': order_id,
+                    'part_number': part_number,
+                    'preview': dump_preview(piece),
+                    'gross_min_x': piece.get('gross_min_x', 0),
+                    'gross_max_x': piece.get('gross_max_x', 0),
+                    'gross_min_y': piece.get('gross_min_y', 0),
+                    'gross_max_y': piece.get('gross_max_y', 0),
+                    'oriented_area_sqin': piece.get('oriented_area_sqin', 0),
+                    'oriented_angle_deg': piece.get('oriented_angle_deg', 0),
+                    'net_area_sqin': piece.get('net_area_sqin', 0),
+                    'total_length': piece.get('total_length', 0),
+                    'common_line_length': common_line_length,
+                    'part_count': part_count,
+                    'fingerprint': fingerprint,
+                    'pierce_count': pierce_count,
+                    'material': None,
+                    'thickness': None,
+                    'quantity': 1
+                }
+                db.order_items.insert_one(order_item)  # MongoDB insert
+                results.append(order_item)
         except Exception as e:
             logging.error(f"Error parsing DXF {filename}: {e}", exc_info=True)
+            if parse_result is None:
+                capture_parse(save_path, parse_quarantine.REASON_ERROR, time.perf_counter() - parse_start,
+                              part_number=filename, error=e)
             return jsonify({"error": str(e)}), 500
     if results:
         cart_items = list(db.order_items.find({"order_id": order_id}))
         response = {
             "status": "success",
             "items": [
-                {"cart_uid": item.get('cart_uid'), "part_number": item.get('part_number'), "material": item.get('material', None), "thickness": item.get('thickness', None), "quantity": item.get('quantity', 1)}
+                {"cart_uid": item.get('cart_uid'), "part_number": item.get('part_number'), "material": item.get('material', None), "thickness": item.get('thickness', None), "quantity": item.get('quantity', 1), "part_count": item.get('part_count', 1)}
                 for item in cart_items
             ]
         }
         if partial_warnings:
             response["partial_warnings"] = partial_warnings
+        if duplicates:
+            response["duplicates"] = duplicates
         return jsonify(response)
     return jsonify({"status": "error", "message": "No valid files processed"}), 400
 
@@ -0,0 +1,169 @@
+# block_transforms.py
+# Geometry transforms for block references (INSERT / MINSERT) measured by dxf_parser.
+# An arrayed INSERT (MINSERT: row_count x column_count cells, row/column spacing in the insert's rotated
+# frame, not scaled) places the same block geometry in every grid cell. dxf_parser walks the block once for
+# the first cell and replicate_instances() copies what that walk produced to the other cells by
+# broadcasting the grid offsets over the measured point arrays, so a 20 x 20 hole plate costs one block
+# walk instead of 400.
+#
+# Placement is a 3x3 affine matrix (homogeneous XY). dxf_parser starts from scale_matrix(unit_scale) and
+# every INSERT composes parent @ insert_matrix(insert), so nested blocks keep their parents' offset, scale
+# and rotation, and whole vertex arrays are placed with one matrix multiply (transform_points) instead of
+# per-point trig.
+
+import math
+import numpy as np
+
+# Coordinate columns of the parser's lines (sx, sy, ex, ey, length) and arcs (cx, cy, r, a0, a1, length)
+LINE_XY_COLUMNS = ((0, 1), (2, 3))
+ARC_XY_COLUMNS = ((0, 1),)
+
+
+def scale_matrix(xscale=1.0, yscale=None):
+    """Affine matrix scaling by xscale and yscale (yscale defaults to xscale)."""
+    return np.diag([xscale, xscale if yscale is None else yscale, 1.0])
+
+
+def insert_matrix(insert, base_point=(0.0, 0.0)):
+    """Affine matrix placing block coordinates in the INSERT's parent frame.
+
+    Block base point to the origin, scale, rotate, then move to the insert point (the order AutoCAD uses).
+    """
+    dxf = insert.dxf
+    xscale, yscale = dxf.get('xscale', 1.0), dxf.get('yscale', 1.0)
+    rad = math.radians(dxf.get('rotation', 0.0) or 0.0)
+    cos, sin = math.cos(rad), math.sin(rad)
+    bx, by = base_point[0], base_point[1]
+    matrix = np.array([[cos * xscale, -sin * yscale, 0.0], [sin * xscale, cos * yscale, 0.0], [0.0, 0.0, 1.0]])
+    matrix[:2, 2] = (dxf.insert[0], dxf.insert[1]) - matrix[:2, :2] @ (bx, by)
+    return matrix
+
+
+def transform_point(matrix, x, y):
+    """One point through the matrix, as plain floats."""
+    m = matrix.tolist()
+    return m[0][0] * x + m[0][1] * y + m[0][2], m[1][0] * x + m[1][1] * y + m[1][2]
+
+
+def transform_points(matrix, points):
+    """Points (an (n, 2+) array or a sequence of 2D/3D points) through the matrix with one multiply.
+
+    Returns a list of [x, y] lists of plain floats, ready for the preview JSON.
+    """
+    if isinstance(points, np.ndarray):
+        xy = points.reshape(len(points), -1)[:, :2]
+    else:
+        xy = np.array([(p[0], p[1]) for p in points], dtype=float).reshape(-1, 2)
+    return (xy @ matrix[:2, :2].T + matrix[:2, 2]).tolist()
+
+
+def axis_scales(matrix):
+    """Lengths of the transformed unit x and y vectors: the x/y scale factors curve lengths are measured with.
+
+    Exact when the matrix is a rotation of an axis-aligned scale (any chain whose non-uniform scale is on
+    the innermost INSERT); a sheared chain is measured with its column norms as an approximation.
+    """
+    return math.hypot(matrix[0, 0], matrix[1, 0]), math.hypot(matrix[0, 1], matrix[1, 1])
+
+
+def mirrors(matrix):
+    """True when the matrix reflects (negative determinant), which reverses the sense of arcs and bulges."""
+    return bool(np.linalg.det(matrix[:2, :2]) < 0)
+
+
+def transform_angles(matrix, start_angle, end_angle):
+    """Arc start/end angles (degrees) after the matrix's rotation, swapped and reflected when it mirrors."""
+    rotation = math.degrees(math.atan2(matrix[1, 0], matrix[0, 0]))
+    if mirrors(matrix):
+        return rotation - end_angle, rotation - start_angle
+    return rotation + start_angle, rotation + end_angle
+
+
+def minsert_offsets(insert, parent=None):
+    """WCS offsets, shape (n, 2), of every MINSERT grid cell after the first (row-major).
+
+    parent is the matrix placing the INSERT's own frame (e.g. scale_matrix(unit_scale) at model space).
+    Cells with identical offsets (a zero spacing) are placed once, as ezdxf's Insert.multi_insert() does.
+    Plain INSERTs return an empty array.
+    """
+    dxf = insert.dxf
+    rows = max(int(dxf.get('row_count', 1) or 1), 1)
+    cols = max(int(dxf.get('column_count', 1) or 1), 1)
+    if rows * cols == 1:
+        return np.empty((0, 2))
+    row, col = np.divmod(np.arange(rows * cols), cols)
+    local = np.column_stack([col * float(dxf.get('column_spacing', 0.0)), row * float(dxf.get('row_spacing', 0.0))])
+    _, first = np.unique(local, axis=0, return_index=True)
+    local = local[np.sort(first)][1:]
+    rad = math.radians(dxf.get('rotation', 0.0) or 0.0)
+    rotate = np.array([[math.cos(rad), -math.sin(rad)], [math.sin(rad), math.cos(rad)]])
+    if parent is not None:
+        rotate = parent[:2, :2] @ rotate
+    return local @ rotate.T
+
+
+def offset_bounds(bounds, offsets):
+    """(min_x, max_x, min_y, max_y) covering bounds placed at the origin and at every offset."""
+    min_x, max_x, min_y, max_y = bounds
+    if not len(offsets) or min_x > max_x:
+        return bounds
+    dx_min, dy_min = np.minimum(offsets.min(axis=0), 0.0)
+    dx_max, dy_max = np.maximum(offsets.max(axis=0), 0.0)
+    return min_x + dx_min, max_x + dx_max, min_y + dy_min, max_y + dy_max
+
+
+def _shift_rows(rows, offsets, xy_columns):
+    """Copies of parser tuples (lines or arcs) at every offset, instance-major."""
+    if not rows:
+        return []
+    base = np.asarray(rows, dtype=float)
+    shifted = np.broadcast_to(base, (len(offsets),) + base.shape).copy()
+    for x_col, y_col in xy_columns:
+        shifted[:, :, x_col] += offsets[:, None, 0]
+        shifted[:, :, y_col] += offsets[:, None, 1]
+    return [tuple(row) for row in shifted.reshape(-1, base.shape[1]).tolist()]
+
+
+def _shift_point_list(points, offsets):
+    """(n, k, 2) nested lists: points moved by each offset."""
+    return (np.asarray(points, dtype=float)[None, :, :2] + offsets[:, None, :]).tolist()
+
+
+def _shift_dict(item, offsets):
+    """Copies of a preview item or outer boundary at every offset (center, start/end, points, bounds)."""
+    n = len(offsets)
+    fields = {}
+    for key in ("center", "start", "end"):
+        if key in item:
+            fields[key] = (np.asarray(item[key], dtype=float)[:2] + offsets).tolist()
+    for key in ("points", "control_points"):
+        if item.get(key):
+            fields[key] = _shift_point_list(item[key], offsets)
+    for key, axis in (("min_x", 0), ("max_x", 0), ("min_y", 1), ("max_y", 1)):
+        if key in item:
+            fields[key] = (item[key] + offsets[:, axis]).tolist()
+    copies = []
+    for i in range(n):
+        copy = dict(item)
+        for key, values in fields.items():
+            copy[key] = type(item[key])(values[i]) if key in ("center", "start", "end") else values[i]
+        copies.append(copy)
+    return copies
+
+
+def replicate_instances(offsets, preview=(), lines=(), arcs=(), boundaries=(), curves=(), faces=()):
+    """Copies of one measured block instance at every offset.
+
+    Returns (preview, lines, arcs, boundaries, curves, faces), each instance-major so the copies of one grid
+    cell stay together. Error and warning preview items are not duplicated.
+    """
+    if not len(offsets):
+        return [], [], [], [], [], []
+    per_item = [_shift_dict(item, offsets) for item in preview if item.get("type") not in ("error", "warning")]
+    preview_copies = [copy for cell in zip(*per_item) for copy in cell] if per_item else []
+    per_boundary = [_shift_dict(b, offsets) for b in boundaries]
+    boundary_copies = [copy for cell in zip(*per_boundary) for copy in cell] if per_boundary else []
+    curve_copies = [curve for cell in zip(*[_shift_point_list(c, offsets) for c in curves]) for curve in cell]
+    face_copies = [face for cell in zip(*[_shift_point_list(f, offsets) for f in faces]) for face in cell]
+    return (preview_copies, _shift_rows(list(lines), offsets, LINE_XY_COLUMNS),
+            _shift_rows(list(arcs), offsets, ARC_XY_COLUMNS), boundary_copies, curve_copies, face_copies)
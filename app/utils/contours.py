@@ -0,0 +1,196 @@
+# contours.py
+# Closed contours and common-line detection over the cut path dxf_parser measured.
+# The parser keeps its geometry as loose pieces: straight segments (LINE, polyline edges, HATCH and 3DFACE
+# edges), arcs and circles, and flattened curves (SPLINE, ELLIPSE). build_faces() snaps them to a
+# CONTOUR_TOLERANCE_IN grid anchored on the geometry, nodes them (shapely.unary_union) and polygonizes the
+# result, so every closed contour becomes one face of the planar arrangement no matter how it was drawn (one
+# closed polyline, a chain of LINEs, or edges shared with a neighbouring part). A face's nesting depth (how many other face shells
+# contain it) says what it is: even depth is material (a part, or an island inside a hole), odd depth is a
+# hole.
+#
+# Parts nested edge-to-edge share a cut: the edge between two material faces is drawn once per part but
+# the torch cuts it once. common_lines() finds those pairs with an STRtree over the faces and measures the
+# length of their shared boundary. segment_dedup already keeps a second copy of such an edge out of
+# total_length; common_line_length reports how much shared edge there is, which costing turns into the cut
+# time saved by common-line cutting.
+#
+# One upload often holds several different parts. split_parts() groups the faces into separately cut parts
+# with a union-find over containment (each hole joins the material face around it; material faces, islands
+# included, are roots), and assign_to_parts() maps the parser's edges and preview items onto those parts
+# with one STRtree query, so per-part metrics come from the geometry already collected instead of a
+# second pass over the file.
+
+import math
+import numpy as np
+import shapely
+
+CONTOUR_TOLERANCE_IN = 0.001   # coordinates are snapped to this grid before noding
+ARC_SEGMENTS_PER_TURN = 64     # arc flattening for contour faces
+
+
+def arc_points(cx, cy, radius, start_angle, end_angle):
+    """Flattened arc from start_angle to end_angle (degrees, counter-clockwise) as an (n, 2) array.
+
+    The quadrant points the arc passes through are kept as vertices, so the flattened arc has the exact
+    bounding box.
+    """
+    span = end_angle - start_angle
+    n = max(int(math.ceil(abs(span) / 360.0 * ARC_SEGMENTS_PER_TURN)), 1)
+    t = np.linspace(start_angle, end_angle, n + 1)
+    lo, hi = min(start_angle, end_angle), max(start_angle, end_angle)
+    quadrants = np.arange(math.ceil(lo / 90.0), math.floor(hi / 90.0) + 1) * 90.0
+    quadrants = quadrants[(quadrants > lo) & (quadrants < hi)]
+    if len(quadrants):
+        t = np.sort(np.concatenate([t, quadrants]))
+        if span < 0:
+            t = t[::-1]
+    t = np.radians(t)
+    return np.column_stack([cx + radius * np.cos(t), cy + radius * np.sin(t)])
+
+
+def arc_sagitta(arcs):
+    """Largest gap between an arc in `arcs` and its arc_points() chords (0 without arcs)."""
+    radius = max((arc[2] for arc in arcs), default=0.0)
+    return radius * (1 - math.cos(math.pi / ARC_SEGMENTS_PER_TURN))
+
+
+def hull_arc_sagitta(arcs, hull, tolerance=CONTOUR_TOLERANCE_IN):
+    """arc_sagitta() of the largest arc with a flattened point on the convex hull (counter-clockwise vertices).
+
+    Only those arcs can bulge past a box drawn around the hull; an arc inside it, such as a bore, cannot.
+    """
+    if len(hull) < 3:
+        return arc_sagitta(arcs)
+    ring = shapely.linearrings(hull)
+    for arc in sorted(arcs, key=lambda arc: arc[2], reverse=True):
+        if shapely.distance(ring, shapely.multipoints(arc_points(*arc[:5]))) <= tolerance:
+            return arc_sagitta([arc])
+    return 0.0
+
+
+def edge_coordinates(lines=(), arcs=(), curves=()):
+    """Every piece of cut path as an (n, 2) coordinate array, in the order lines, arcs, curves."""
+    edges = [np.array([line[:2], line[2:4]], dtype=float) for line in lines]
+    edges += [arc_points(*arc[:5]) for arc in arcs]
+    edges += [np.asarray(curve, dtype=float).reshape(-1, 2) for curve in curves if len(curve) >= 2]
+    return edges
+
+
+def build_faces(lines=(), arcs=(), curves=(), tolerance=CONTOUR_TOLERANCE_IN, edges=None):
+    """Faces of the cut path's planar arrangement and their nesting depth.
+
+    Returns (faces, depth): an array of shapely Polygons (holes included, as faces of their own) and an
+    int array of how many other face shells contain each face. edges: edge_coordinates() of the same
+    geometry, when the caller has already built them.
+    """
+    if edges is None:
+        edges = edge_coordinates(lines, arcs, curves)
+    if not edges:
+        return np.empty(0, dtype=object), np.empty(0, dtype=int)
+    coords = np.concatenate(edges)
+    # The grid is anchored on the geometry rather than the origin, so a copy moved elsewhere or turned by
+    # quarter turns snaps to the same faces (part_fingerprint relies on this): at the centre, or at the
+    # corner along an axis whose extent is a whole number of steps (drawn dimensions, whose centre would
+    # fall halfway between grid points)
+    low, high = coords.min(axis=0), coords.max(axis=0)
+    steps = (high - low) / tolerance
+    anchor = np.where(np.abs(steps - np.round(steps)) < 1e-6, low, (low + high) / 2)
+    coords = np.round((coords - anchor) / tolerance) * tolerance + anchor
+    indices = np.repeat(np.arange(len(edges)), [len(edge) for edge in edges])
+    noded = shapely.unary_union(shapely.linestrings(coords, indices=indices))
+    faces = shapely.get_parts(shapely.polygonize(shapely.get_parts(noded)))
+    faces = faces[shapely.area(faces) > tolerance * tolerance]
+    if not len(faces):
+        return faces, np.empty(0, dtype=int)
+    shells = shapely.polygons(shapely.get_exterior_ring(faces))
+    inside, container = shapely.STRtree(shells).query(shapely.point_on_surface(faces), predicate='within')
+    depth = np.bincount(inside[inside != container], minlength=len(faces))
+    return faces, depth
+
+
+def common_lines(faces, depth, tolerance=CONTOUR_TOLERANCE_IN):
+    """Boundary shared between material faces (parts nested edge-to-edge).
+
+    Returns (shared_length, contour_pairs): the total shared boundary length and the number of face pairs
+    that share an edge. Faces touching at a single point share nothing.
+    """
+    material = np.flatnonzero(np.asarray(depth) % 2 == 0)
+    if len(material) < 2:
+        return 0.0, 0
+    parts = faces[material]
+    i, j = shapely.STRtree(parts).query(parts, predicate='touches')
+    keep = i < j
+    i, j = i[keep], j[keep]
+    if not len(i):
+        return 0.0, 0
+    shared = shapely.length(shapely.intersection(shapely.boundary(parts[i]), shapely.boundary(parts[j])))
+    shared = shared[shared > tolerance]
+    return float(shared.sum()), len(shared)
+
+
+def split_parts(faces, depth):
+    """Group faces into separately cut parts.
+
+    Union-find over containment: every hole (odd depth) is joined to the material face directly around it,
+    and every material face (a part, or an island left inside a hole) is a root. Returns one face index
+    array per part, its material face first, largest part first.
+    """
+    depth = np.asarray(depth)
+    if not len(depth):
+        return []
+    parent = np.arange(len(depth))
+    holes = np.flatnonzero(depth % 2 == 1)
+    if len(holes):
+        shells = shapely.polygons(shapely.get_exterior_ring(faces))
+        inside, container = shapely.STRtree(shells).query(shapely.point_on_surface(faces[holes]), predicate='within')
+        inside = holes[inside]
+        # The containing material face is a root, so one union per hole links the whole group
+        direct = depth[container] == depth[inside] - 1
+        parent[inside[direct]] = container[direct]
+    roots = np.flatnonzero(depth % 2 == 0)
+    roots = roots[np.argsort(-shapely.area(faces[roots]), kind='stable')]
+    members = {root: [root] for root in roots.tolist()}
+    for face in holes.tolist():
+        if parent[face] in members:
+            members[parent[face]].append(face)
+    return [np.array(members[root]) for root in roots.tolist()]
+
+
+def sample_points(edges):
+    """A point on each edge (an (n, 2) coordinate array): the middle vertex, or the midpoint of a segment."""
+    return np.array([edge.mean(axis=0) if len(edge) == 2 else edge[len(edge) // 2] for edge in edges],
+                    dtype=float).reshape(-1, 2)
+
+
+def preview_point(item):
+    """A point on a parser preview item's geometry, or None for error and warning items."""
+    kind = item.get("type")
+    if kind == "line":
+        return ((item["start"][0] + item["end"][0]) / 2, (item["start"][1] + item["end"][1]) / 2)
+    if kind in ("arc", "circle"):
+        angle = math.radians((item.get("start_angle", 0.0) + item.get("end_angle", 0.0)) / 2)
+        return (item["center"][0] + item["radius"] * math.cos(angle), item["center"][1] + item["radius"] * math.sin(angle))
+    points = item.get("points") or item.get("control_points")
+    if points:
+        return tuple(points[len(points) // 2][:2])
+    return None
+
+
+def assign_to_parts(parts, points, tolerance=CONTOUR_TOLERANCE_IN):
+    """Which parts each point belongs to.
+
+    parts are the parts' material faces. A point belongs to every part it lies on or in, so an edge shared
+    by two parts nested edge-to-edge counts for both; a point in no part (open geometry outside a contour)
+    goes to the nearest one. Returns (point_index, part_index) arrays sorted by point.
+    """
+    points = shapely.points(np.asarray(points, dtype=float).reshape(-1, 2))
+    if not len(points) or not len(parts):
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    tree = shapely.STRtree(parts)
+    index, part = tree.query(points, predicate='dwithin', distance=tolerance)
+    missing = np.setdiff1d(np.arange(len(points)), index)
+    if len(missing):
+        nearest, near_part = tree.query_nearest(points[missing], all_matches=False)
+        index, part = np.concatenate([index, missing[nearest]]), np.concatenate([part, near_part])
+    order = np.lexsort((part, index))
+    return index[order], part[order]
@@ -4,7 +4,7 @@
 #All code by Grok with Shawn's guidance.
 
 import logging
-from app.utils import dxf_parser
+from app.utils import dxf_parser, pricing_config
 
 def convert_value(value, from_unit, to_unit, unit_conversions):
     """Convert a value from one unit to another using UNIT_CONVERSIONS."""
@@ -12,8 +12,14 @@ def convert_value(value, from_unit, to_unit, unit_conversions):
         return value
     return value * unit_conversions[from_unit][to_unit]
 
-def calculate_costs(cart_items, inputs, material_densities):
-    """Calculate material, labor, and machine costs for cart items, distributing order-level costs by cut time."""
+def calculate_costs(cart_items, inputs, material_densities, catalog=None):
+    """Calculate material, labor, and machine costs for cart items, distributing order-level costs by cut time.
+
+    Cut speed, pierce time and cleanup time come from the material catalog (material_process.csv) for the
+    item's material and thickness; items the catalog does not cover use the inputs.csv thickness buckets.
+    """
+    if catalog is None:
+        catalog = pricing_config.get_material_catalog()
     logging.debug(f"Processing cart_items: {[item.get('part_number') for item in cart_items]}")
     unit_conversions = {
         "hour": {"min": 60}, "min": {"min": 1}, "sec": {"min": 1 / 60},
@@ -50,6 +56,10 @@ def calculate_costs(cart_items, inputs, material_densities):
         gross_area = item.get('gross_area_sqin')
         if gross_area is None:
             gross_area = (item.get('gross_max_x', 0) - item.get('gross_min_x', 0)) * (item.get('gross_max_y', 0) - item.get('gross_min_y', 0))
+        # A part drawn at an angle is nested at its minimum-area orientation, not in its axis-aligned box
+        oriented_area = item.get('oriented_area_sqin') or 0
+        if 0 < oriented_area < gross_area:
+            gross_area = oriented_area
         # NOTE: Pricing now uses gross area instead of net area
         material_efficiency = inputs.get("material_efficiency", {"value": 0.9, "unit": "unitless"})["value"]
         adjusted_gross_area = gross_area / material_efficiency if material_efficiency > 0 else gross_area
@@ -58,32 +68,44 @@ def calculate_costs(cart_items, inputs, material_densities):
         steel_cost_per_lb = inputs.get("steel_cost_per_lb", {"value": 0.0, "unit": "$/lb"})["value"]
         material_cost = weight * steel_cost_per_lb
 
-        # Cutting time based on thickness
+        # Cutting time based on material and thickness
         thickness = item.get('thickness', 0)
-        cut_speed = (
-            inputs.get("cut_speed_0.375", {"value": 60.0, "unit": "in/min"})["value"] if thickness <= 0.375 else
-            inputs.get("cut_speed_0.75", {"value": 40.0, "unit": "in/min"})["value"] if thickness <= 0.75 else
-            inputs.get("cut_speed_1.0", {"value": 25.0, "unit": "in/min"})["value"]
-        )
-        length = item.get('length', 0)
+        process = catalog.process(item.get('material'), thickness)
+        if process is not None:
+            cut_speed = process.cut_speed
+        else:
+            cut_speed = (
+                inputs.get("cut_speed_0.375", {"value": 60.0, "unit": "in/min"})["value"] if thickness <= 0.375 else
+                inputs.get("cut_speed_0.75", {"value": 40.0, "unit": "in/min"})["value"] if thickness <= 0.75 else
+                inputs.get("cut_speed_1.0", {"value": 25.0, "unit": "in/min"})["value"]
+            )
+        # Cart items carry the parser's total_length, with duplicate and overlapping cut path already removed
+        length = item.get('length', item.get('total_length', 0))
         cut_time = length / cut_speed if length and cut_speed > 0 else 0
+        # Edges shared by parts nested edge-to-edge are cut once; report the time that saves over separate cuts
+        common_line_length = item.get('common_line_length', 0) or 0
+        common_line_saved_time = common_line_length / cut_speed if cut_speed > 0 else 0
 
         # Pierce time
         pierce_count = item.get('pierce_count', 0)
-        pierce_time = pierce_count * inputs.get("pierce_time", {"value": 0.0, "unit": "sec"})["value"] / 60 if pierce_count else 0
+        seconds_per_pierce = process.pierce_time if process is not None else inputs.get("pierce_time", {"value": 0.0, "unit": "sec"})["value"]
+        pierce_time = pierce_count * seconds_per_pierce / 60 if pierce_count else 0
 
-        # Cleanup time based on thickness
-        cleanup_time = (
-            inputs.get("cleanup_assembly_time_thick", {"value": 45.0, "unit": "sec"})["value"] / 60 if thickness >= 0.75 else
-            inputs.get("cleanup_assembly_time_thin", {"value": 15.0, "unit": "sec"})["value"] / 60
-        )
+        # Cleanup time based on material and thickness
+        if process is not None:
+            cleanup_time = process.cleanup_time / 60
+        else:
+            cleanup_time = (
+                inputs.get("cleanup_assembly_time_thick", {"value": 45.0, "unit": "sec"})["value"] / 60 if thickness >= 0.75 else
+                inputs.get("cleanup_assembly_time_thin", {"value": 15.0, "unit": "sec"})["value"] / 60
+            )
 
         # Per-part labor time
         per_part_labor_time = cut_time + pierce_time + cleanup_time
-        per_part_labor_times.append((item, per_part_labor_time))
+        per_part_labor_times.append((item, per_part_labor_time, material_cost, cut_time, common_line_saved_time))
 
     # Calculate order-level labor and machine costs
-    total_per_part_labor_time = sum((item.get('quantity', 1) or 1) * per_part_labor_time for item, per_part_labor_time in per_part_labor_times)
+    total_per_part_labor_time = sum((item.get('quantity', 1) or 1) * per_part_labor_time for item, per_part_labor_time, _, _, _ in per_part_labor_times)
     order_labor_time = total_per_part_labor_time + order_setup_time + order_changeover_time
     direct_labor_rate = inputs.get("direct_labor_rate", {"value": 0.0, "unit": "$/hour"})["value"]
     labor_cost = order_labor_time * convert_value(direct_labor_rate, "$/hour", "$/min", unit_conversions)
@@ -93,7 +115,7 @@ def calculate_costs(cart_items, inputs, material_densities):
     order_level_machine_cost = order_setup_machine_cost + changeover_machine_cost
 
     # Distribute costs and calculate final price
-    for item, per_part_labor_time in per_part_labor_times:
+    for item, per_part_labor_time, material_cost, cut_time, common_line_saved_time in per_part_labor_times:
         if total_per_part_labor_time > 0:
             labor_cost_per_part = labor_cost * (per_part_labor_time / total_per_part_labor_time)
             machine_cost_order_per_part = order_level_machine_cost * (per_part_labor_time / total_per_part_labor_time)
@@ -101,7 +123,6 @@ def calculate_costs(cart_items, inputs, material_densities):
             labor_cost_per_part = 0
             machine_cost_order_per_part = 0
 
-        material_cost = material_cost
         machine_cost_per_part = cut_time * machine_rate_per_min
         total_machine_cost_per_part = machine_cost_per_part + machine_cost_order_per_part
         cogs_per_part = material_cost + labor_cost_per_part + total_machine_cost_per_part
@@ -118,7 +139,9 @@ def calculate_costs(cart_items, inputs, material_densities):
             "material": item.get('material'),
             "thickness": item.get('thickness'),
             "unit_price": price_per_part,
-            "sell_price_per_part": sell_price_per_part
+            "sell_price_per_part": sell_price_per_part,
+            "cut_time_min": cut_time,
+            "common_line_saved_min": common_line_saved_time
         })
 
     breakdown = {"total_sell_price": total_sell_price, "detailed_breakdown": detailed_breakdown}
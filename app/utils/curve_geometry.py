@@ -0,0 +1,244 @@
+# curve_geometry.py
+# Flattening tolerances and exact arc lengths for the curved entities dxf_parser measures.
+# Cut length feeds pricing, so it is computed analytically where possible instead of summing the chords of
+# a preview polyline:
+#   - ELLIPSE: incomplete elliptic integral of the second kind (scipy.special.ellipeinc); adaptive Gauss
+#     quadrature when an INSERT scales x and y differently
+#   - SPLINE: adaptive Gauss-Legendre quadrature of |C'(u)| per Bezier segment / knot span
+# The preview polylines only need to look right, so their chord error is derived from the part's extent
+# (chord_tolerance) rather than a fixed drawing-unit constant that ignores units and part size.
+#
+# Parts from the same CAD library repeat identical spline definitions, so flatten_spline() memoizes the
+# flattened points and length in a bounded LRU cache keyed by a hash of the spline's defining data and
+# the tolerance. It is process-wide: hits carry across INSERTs, files and requests.
+
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from scipy.special import ellipeinc
+from scipy.integrate import quad
+
+REL_CHORD_ERROR = 1e-4        # chord error as a fraction of the part's largest extent
+MIN_CHORD_ERROR_IN = 0.0005   # finer than this is invisible at plasma kerf widths
+MAX_CHORD_ERROR_IN = 0.01     # coarser than this shows in previews of large sheets
+DEFAULT_CHORD_ERROR_IN = 0.002
+GAUSS_ORDER = 8
+MAX_QUADRATURE_DEPTH = 12
+LENGTH_REL_TOL = 1e-8
+
+SPLINE_CACHE_MAX_ENTRIES = 4096
+SPLINE_CACHE_MAX_POINTS = 1_000_000  # ~16 MB of float64 point data
+
+_gauss_nodes = np.polynomial.legendre.leggauss(GAUSS_ORDER)
+_spline_cache = OrderedDict()  # key -> (points ndarray, length at unit scale ratio)
+_spline_cache_lock = threading.Lock()
+_spline_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "points": 0}
+
+
+def chord_tolerance(part_extent_in=None):
+    """Target chord error in inches for a part whose largest extent is part_extent_in (None if unknown)."""
+    if not part_extent_in or not math.isfinite(part_extent_in) or part_extent_in <= 0:
+        return DEFAULT_CHORD_ERROR_IN
+    return min(max(part_extent_in * REL_CHORD_ERROR, MIN_CHORD_ERROR_IN), MAX_CHORD_ERROR_IN)
+
+
+def drawing_tolerance(chord_error_in, unit_scale=1.0, xscale=1.0, yscale=1.0):
+    """Convert an inch chord error into the entity's own drawing units (before INSERT scale and units)."""
+    scale = abs(unit_scale) * max(abs(xscale), abs(yscale))
+    return chord_error_in / scale if scale > 0 else chord_error_in
+
+
+def header_extent(extmin, extmax, unit_scale=1.0):
+    """Largest XY extent in inches from $EXTMIN/$EXTMAX, or None when the header values are unset."""
+    try:
+        dx, dy = extmax[0] - extmin[0], extmax[1] - extmin[1]
+    except (TypeError, IndexError):
+        return None
+    extent = max(dx, dy) * abs(unit_scale)
+    if not math.isfinite(extent) or extent <= 0 or extent > 1e6:
+        return None  # AutoCAD writes +/-1e20 for empty or never-regenerated drawings
+    return extent
+
+
+def ellipse_arc_length(major_length, minor_length, start_param, end_param):
+    """Exact length of the ellipse arc P(t) = M cos t + m sin t for t in [start_param, end_param]."""
+    a, b = abs(major_length), abs(minor_length)
+    if a < b:
+        a, b = b, a
+        # Swapping the axes shifts the parameter by a quarter turn; the length over the span is unchanged
+        start_param, end_param = start_param + math.pi / 2, end_param + math.pi / 2
+    if a == 0:
+        return 0.0
+    m = 1.0 - (b / a) ** 2
+    # ds = a * sqrt(1 - m cos^2 t) dt = a * sqrt(1 - m sin^2 (t - pi/2)) dt
+    return a * (ellipeinc(end_param - math.pi / 2, m) - ellipeinc(start_param - math.pi / 2, m))
+
+
+def scaled_ellipse_arc_length(major_axis, minor_axis, start_param, end_param, xscale=1.0, yscale=1.0):
+    """Arc length after an axis-aligned scale; exact when uniform, adaptive Gauss-Kronrod otherwise."""
+    if abs(xscale) == abs(yscale):
+        return abs(xscale) * ellipse_arc_length(math.hypot(major_axis[0], major_axis[1]),
+                                                math.hypot(minor_axis[0], minor_axis[1]), start_param, end_param)
+
+    def speed(t):
+        dx = -major_axis[0] * math.sin(t) + minor_axis[0] * math.cos(t)
+        dy = -major_axis[1] * math.sin(t) + minor_axis[1] * math.cos(t)
+        return math.hypot(xscale * dx, yscale * dy)
+
+    length, _ = quad(speed, start_param, end_param, epsrel=LENGTH_REL_TOL, limit=200)
+    return length
+
+
+def _bernstein(degree, u):
+    """Bernstein basis of `degree` at parameters u (any shape) -> u.shape + (degree + 1,)."""
+    j = np.arange(degree + 1)
+    coeffs = np.array([math.comb(degree, k) for k in j], dtype=float)
+    u = u[..., None]
+    return coeffs * u ** j * (1 - u) ** (degree - j)
+
+
+def _bezier_speed(bspline, xscale, yscale):
+    """Speed function over the Bezier segments of a non-rational spline: (segment index, u in [0,1]) -> |C'|."""
+    segments = np.array([[(p[0] * xscale, p[1] * yscale) for p in seg] for seg in bspline.bezier_decomposition()])
+    degree = segments.shape[1] - 1
+    hodograph = degree * (segments[:, 1:] - segments[:, :-1])  # control points of the derivative curves
+
+    def speed(seg, u):
+        basis = _bernstein(degree - 1, u)
+        derivs = np.einsum('inj,ijd->ind', basis, hodograph[seg])
+        return np.hypot(derivs[..., 0], derivs[..., 1])
+
+    return speed, len(segments)
+
+
+def _knot_span_speed(bspline, xscale, yscale):
+    """Speed function over the knot spans of any spline (rational included), via ezdxf's derivatives."""
+    knots = list(bspline.knots())
+    order = bspline.order
+    breaks = sorted(set(knots[order - 1:len(knots) - order + 1]))
+    spans = np.array([(a, b) for a, b in zip(breaks, breaks[1:]) if b > a]).reshape(-1, 2)
+
+    def speed(seg, u):
+        a, width = spans[seg, 0][:, None], (spans[seg, 1] - spans[seg, 0])[:, None]
+        ts = (a + u * width).ravel()
+        derivs = np.array([(d[1][0], d[1][1]) for d in bspline.derivatives(ts, n=1)]).reshape(u.shape + (2,))
+        return np.hypot(xscale * derivs[..., 0], yscale * derivs[..., 1]) * width
+
+    return speed, len(spans)
+
+
+def _integrate_segments(speed, n_segments):
+    """Sum of the integrals of speed(seg, u) over u in [0, 1] for every segment.
+
+    Adaptive Gauss-Legendre, refined level by level so each level is one vectorized evaluation: an
+    interval is accepted when its two halves agree with the whole to within its share of the error budget.
+    """
+    if n_segments == 0:
+        return 0.0
+    nodes, weights = _gauss_nodes
+
+    def gauss(seg, a, b):
+        half = (b - a) / 2
+        u = half[:, None] * nodes + ((a + b) / 2)[:, None]
+        return half * (speed(seg, u) @ weights)
+
+    seg = np.arange(n_segments)
+    a, b = np.zeros(n_segments), np.ones(n_segments)
+    whole = gauss(seg, a, b)
+    tol = LENGTH_REL_TOL * max(float(whole.sum()), 1e-12) / n_segments
+    total = 0.0
+    for depth in range(MAX_QUADRATURE_DEPTH + 1):
+        mid = (a + b) / 2
+        halves = gauss(np.concatenate([seg, seg]), np.concatenate([a, mid]), np.concatenate([mid, b]))
+        left, right = halves[:len(seg)], halves[len(seg):]
+        done = np.abs(left + right - whole) <= tol * (b - a)
+        if depth == MAX_QUADRATURE_DEPTH:
+            done[:] = True
+        total += float((left + right)[done].sum())
+        if done.all():
+            break
+        keep = ~done
+        seg = np.concatenate([seg[keep], seg[keep]])
+        a, b = np.concatenate([a[keep], mid[keep]]), np.concatenate([mid[keep], b[keep]])
+        whole = np.concatenate([left[keep], right[keep]])
+    return total
+
+
+def spline_arc_length(bspline, xscale=1.0, yscale=1.0):
+    """Length of an ezdxf BSpline in the XY plane after an axis-aligned scale.
+
+    Integrates |C'(u)| with adaptive Gauss-Legendre quadrature per Bezier segment (non-rational) or per knot
+    span (rational). The error budget is relative to the whole curve, so degenerate zero-length segments from
+    repeated control points converge immediately.
+    """
+    if bspline.is_rational:
+        speed, n_segments = _knot_span_speed(bspline, xscale, yscale)
+    else:
+        speed, n_segments = _bezier_speed(bspline, xscale, yscale)
+    return _integrate_segments(speed, n_segments)
+
+
+def spline_key(entity):
+    """Digest of everything that defines a SPLINE entity's curve (independent of layer, handle and INSERT)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((entity.dxf.degree, entity.dxf.flags)).encode())
+    for name, values in (("cp", entity.control_points.values), ("kn", entity.knots), ("w", entity.weights),
+                         ("fp", entity.fit_points.values)):
+        digest.update(name.encode())
+        digest.update(np.asarray(values, dtype=float).tobytes())
+    for tangent in ("start_tangent", "end_tangent"):
+        if entity.dxf.hasattr(tangent):
+            digest.update(repr(tuple(entity.dxf.get(tangent))).encode())
+    return digest.hexdigest()
+
+
+def flatten_spline(entity, tolerance, xscale=1.0, yscale=1.0):
+    """Flattened XY points (drawing units, before any INSERT transform) and scaled length of a SPLINE.
+
+    Returns (points, length) where points is a read-only (n, 2) array shared with the cache and length is
+    None when quadrature failed. Results are memoized by spline_key, the flattening tolerance and the x/y scale ratio; the length
+    is stored for |xscale| = 1 and rescaled.
+    """
+    sx, sy = abs(xscale), abs(yscale)
+    ratio = sy / sx if sx else 1.0
+    key = (spline_key(entity), float(tolerance), ratio)
+    with _spline_cache_lock:
+        entry = _spline_cache.get(key)
+        if entry is not None:
+            _spline_cache.move_to_end(key)
+            _spline_cache_stats["hits"] += 1
+    if entry is None:
+        points = np.array([(p[0], p[1]) for p in entity.flattening(tolerance)], dtype=float).reshape(-1, 2)
+        points.flags.writeable = False
+        try:
+            length = spline_arc_length(entity.construction_tool(), 1.0, ratio)
+        except Exception:
+            length = None  # caller falls back to the chord length of the points
+        entry = (points, length)
+        with _spline_cache_lock:
+            _spline_cache_stats["misses"] += 1
+            if key not in _spline_cache:
+                _spline_cache[key] = entry
+                _spline_cache_stats["points"] += len(points)
+                while _spline_cache and (len(_spline_cache) > SPLINE_CACHE_MAX_ENTRIES or
+                                         _spline_cache_stats["points"] > SPLINE_CACHE_MAX_POINTS):
+                    _, (evicted, _) = _spline_cache.popitem(last=False)
+                    _spline_cache_stats["points"] -= len(evicted)
+                    _spline_cache_stats["evictions"] += 1
+    points, length = entry
+    return points, (length * (sx if sx else 1.0) if length is not None else None)
+
+
+def spline_cache_info():
+    """Hit/miss/eviction counters plus the current entry and point counts of the SPLINE cache."""
+    with _spline_cache_lock:
+        return dict(_spline_cache_stats, entries=len(_spline_cache))
+
+
+def clear_spline_cache():
+    """Empty the SPLINE cache and reset its counters (benchmarks use this to measure cold parses)."""
+    with _spline_cache_lock:
+        _spline_cache.clear()
+        _spline_cache_stats.update(hits=0, misses=0, evictions=0, points=0)
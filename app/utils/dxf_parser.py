@@ -11,83 +11,45 @@ import ezdxf
 from ezdxf.math import Vec2
 import math
 import os
-import csv
 import logging
 import time
-import json
+import numpy as np
+import shapely
 from shapely.geometry import LineString, Polygon
-
-TOLERANCE = 0.001  # Global tolerance for geometric ops
+try:
+    from . import (pricing_config, curve_geometry, block_transforms, segment_dedup, contours, sheet_views, layer_profiles,
+                   mesh_silhouette, parallel_parse, entity_handlers, parse_result, oriented_bounds,
+                   part_fingerprint)
+except ImportError:  # imported as a top-level module by the scripts/ tools
+    import pricing_config
+    import curve_geometry
+    import block_transforms
+    import segment_dedup
+    import contours
+    import sheet_views
+    import layer_profiles
+    import mesh_silhouette
+    import parallel_parse
+    import entity_handlers
+    import parse_result
+    import oriented_bounds
+    import part_fingerprint
 
 def load_material_densities(file_path=None):
-    """Load material density from CSV, robust to working directory and columns."""
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-    search_paths = [
-        os.path.join(project_root, "material_densities.csv"),
-        os.path.join(project_root, "app", "material_densities.csv"),
-        os.path.join(project_root, "app", "utils", "material_densities.csv"),
-    ]
-    if file_path:
-        search_paths.insert(0, file_path)
-    for path in search_paths:
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    if not reader.fieldnames or not set(["material", "density"]).issubset(reader.fieldnames):
-                        logging.error(f"material_densities.csv found at {path} but missing required columns ['material','density']")
-                        return None
-                    data = [row for row in reader]
-                    if not data:
-                        logging.error(f"material_densities.csv at {path} is empty!")
-                        return None
-                    logging.info(f"material_densities.csv loaded from {path}")
-                    return data
-            except Exception as e:
-                logging.error(f"Failed to load material_densities.csv from {path}: {e}")
-                return None
-    logging.warning(f"material_densities.csv not found in any expected location: {search_paths}")
-    return None
+    """Material density rows from material_densities.csv, via the shared config registry (None if missing)."""
+    return pricing_config.get_material_densities(file_path)
 
 def load_inputs_csv():
-    """Load input parameters from inputs.csv for parsing, providing safe defaults if file is missing."""
-    inputs = {}
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-    inputs_file = os.path.join(project_root, 'inputs.csv')
-    resolved_path = os.path.abspath(inputs_file)
-    logging.info(f"Attempting to load inputs.csv from: {resolved_path}")
-    required_keys = ['kerf_thickness', 'skeleton_thickness']
-    if os.path.exists(resolved_path):
-        try:
-            with open(resolved_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                logging.info(f"inputs.csv content: {lines}")
-                for line in lines:
-                    if line.strip() and not line.startswith('#'):
-                        parts = [x.strip() for x in line.split(',')]
-                        if len(parts) < 3:
-                            logging.warning(f"Skipping invalid line in inputs.csv: {line.strip()}")
-                            continue
-                        key, value, unit = parts[:3]
-                        if key in required_keys:
-                            try:
-                                inputs[key] = {"value": float(value), "unit": unit}
-                            except ValueError:
-                                logging.warning(f"Invalid value for {key} in inputs.csv: {value}")
-                                inputs[key] = {"value": 0.0, "unit": unit}
-                logging.info(f"Loaded inputs: {inputs}")
-        except Exception as e:
-            logging.error(f"Failed to parse inputs.csv: {e}")
-            for key in required_keys:
-                inputs[key] = {"value": 0.0, "unit": "unitless"}
-    else:
-        logging.warning(f"Could not load inputs.csv from {resolved_path}. Using safe defaults.")
-        for key in required_keys:
-            inputs[key] = {"value": 0.0, "unit": "unitless"}
-    return inputs
+    """Input parameters from inputs.csv via the shared config registry (re-read only when the file changes)."""
+    return pricing_config.get_inputs()
 
 def get_density(material, material_densities):
     """Retrieve density for a material."""
+    by_material = getattr(material_densities, 'by_material', None)
+    if by_material is not None:
+        if material in by_material:
+            return by_material[material]
+        raise ValueError(f"Material {material} not found in material_densities.csv")
     for mat in material_densities:
         if mat["material"] == material:
             return float(mat["density"])
@@ -115,8 +77,75 @@ def calculate_area(vertices):
         area -= vertices[j][0] * vertices[i][1]
     return abs(area) / 2
 
-def parse_dxf(file_path, config_file=None, material="A36 Steel", thickness=0.25):
-    """Parse DXF to extract cutting geometry for plasma torch cost estimation."""
+def oriented_gross(points, arcs=()):
+    """oriented_* metrics of the minimum-area rectangle around the points (zeros when there are none).
+
+    The points include flattened arcs; the box is grown by the chord sagitta of the arcs on the convex hull so it
+    holds the true arcs.
+    """
+    hull = oriented_bounds.convex_hull(points)
+    box = oriented_bounds.min_area_rectangle(hull, contours.hull_arc_sagitta(arcs, hull))
+    if box is None:
+        return {"oriented_area_sqin": 0.0, "oriented_width": 0.0, "oriented_height": 0.0, "oriented_angle_deg": 0.0}
+    return {"oriented_area_sqin": box["area"], "oriented_width": box["width"], "oriented_height": box["height"],
+            "oriented_angle_deg": box["angle_deg"]}
+
+def split_into_parts(faces, face_depth, lines, arcs, curves, preview, edges=None, curve_lengths=None):
+    """Metrics and preview of every separately cut part in the drawing.
+
+    Parts come from contours.split_parts(); the cut path and the preview items are assigned to them by
+    contours.assign_to_parts(), and each part's length is deduplicated on its own. curve_lengths: the length
+    the handlers measured for each curve (ParseContext.curve_lengths, exact for SPLINE / ELLIPSE), so the
+    parts add up to the drawing's total_length; without them curves are measured by their chords.
+    edges: contours.edge_coordinates() of the same geometry, when the caller has already built them.
+    """
+    groups = contours.split_parts(faces, face_depth)
+    if not groups:
+        return []
+    material = faces[[group[0] for group in groups]]
+    if curve_lengths is None:
+        curve_lengths = [float(np.hypot(*np.diff(np.asarray(curve, dtype=float).reshape(-1, 2), axis=0).T).sum())
+                         for curve in curves]
+    curve_lengths = [length for curve, length in zip(curves, curve_lengths) if len(curve) >= 2]
+    curves = [curve for curve in curves if len(curve) >= 2]
+    if edges is None:
+        edges = contours.edge_coordinates(lines, arcs, curves)
+    edge_lengths = np.array([line[4] for line in lines] + [arc[5] for arc in arcs] + curve_lengths, dtype=float)
+    edge_index, edge_part = contours.assign_to_parts(material, contours.sample_points(edges))
+    drawn = [(i, point) for i, point in ((i, contours.preview_point(item)) for i, item in enumerate(preview)) if point is not None]
+    item_index, item_part = contours.assign_to_parts(material, [point for _, point in drawn])
+
+    def by_part(index, part):
+        order = np.argsort(part, kind='stable')
+        cuts = np.searchsorted(part[order], np.arange(len(groups) + 1))
+        return [index[order][cuts[k]:cuts[k + 1]].tolist() for k in range(len(groups))]
+
+    parts = []
+    bounds = shapely.bounds(material)
+    for k, (own_edges, own_items) in enumerate(zip(by_part(edge_index, edge_part), by_part(item_index, item_part))):
+        part_lines = [lines[i] for i in own_edges if i < len(lines)]
+        part_arcs = [arcs[i - len(lines)] for i in own_edges if len(lines) <= i < len(lines) + len(arcs)]
+        length = float(edge_lengths[own_edges].sum()) - segment_dedup.dedupe(part_lines, part_arcs)["removed_length"]
+        min_x, min_y, max_x, max_y = bounds[k].tolist()
+        parts.append({
+            "total_length": length,
+            "net_area_sqin": float(shapely.area(material[k])),
+            "gross_min_x": min_x,
+            "gross_min_y": min_y,
+            "gross_max_x": max_x,
+            "gross_max_y": max_y,
+            "gross_area_sqin": (max_x - min_x) * (max_y - min_y),
+            **oriented_gross(shapely.get_coordinates(shapely.get_exterior_ring(material[k])), part_arcs),
+            "fingerprint": part_fingerprint.fingerprint(material[k]),
+            "contour_count": len(groups[k]),
+            "preview": [preview[drawn[j][0]] for j in own_items]
+        })
+    return parts
+
+def parser_config():
+    """Settings parse_dxf runs with: entity limits, unit scales and layer lists, plus kerf and skeleton
+    thickness from inputs.csv. A new dict on every call, so callers can record it (parse_quarantine does).
+    """
     config = {
         "unit_scale_mm_to_in": 0.0393701,
         "unit_scale_cm_to_in": 0.393701,
@@ -139,6 +168,20 @@ def parse_dxf(file_path, config_file=None, material="A36 Steel", thickness=0.25)
         "lead_in_length": 0.1,
         "lead_out_length": 0.1,
     }
+    # Load inputs.csv for kerf_thickness and skeleton_thickness
+    inputs_data = load_inputs_csv()
+    config["kerf_thickness"] = inputs_data.get("kerf_thickness", {"value": 0.05, "unit": "in"})["value"]
+    config["skeleton_thickness"] = inputs_data.get("skeleton_thickness", {"value": 0.1, "unit": "in"})["value"]
+    return config
+
+def parse_dxf(file_path, config_file=None, material="A36 Steel", thickness=0.25, workers=None):
+    """Parse DXF to extract cutting geometry for plasma torch cost estimation.
+
+    workers: processes measuring the model space (parallel_parse); None measures serially. Pass workers only
+    from single-threaded callers (batch scripts): inside a threaded server the pool is refused.
+    Returns a parse_result.ParseResult (read-only Mapping of the metrics; the preview JSON is built on demand).
+    """
+    config = parser_config()
     contour_count = 0
 
     # Validate material and thickness before parsing
@@ -149,23 +192,12 @@ def parse_dxf(file_path, config_file=None, material="A36 Steel", thickness=0.25)
     if not thickness or thickness not in allowed_thicknesses:
         raise ValueError(f"Invalid or missing thickness: {thickness}. Allowed: {allowed_thicknesses}")
 
-    # Load inputs.csv for kerf_thickness and skeleton_thickness
-    inputs_data = load_inputs_csv()
-    config["kerf_thickness"] = inputs_data.get("kerf_thickness", {"value": 0.05, "unit": "in"})["value"]
-    config["skeleton_thickness"] = inputs_data.get("skeleton_thickness", {"value": 0.1, "unit": "in"})["value"]
-
     total_length = 0
     net_area_sqin = 0
     gross_min_x, gross_min_y = float('inf'), float('inf')
     gross_max_x, gross_max_y = float('-inf'), float('-inf')
-    entity_count = {"LINE": 0, "ARC": 0, "CIRCLE": 0, "LWPOLYLINE": 0, "POLYLINE": 0,
-                    "INSERT": 0, "SPLINE": 0, "ELLIPSE": 0, "HATCH": 0, "3DFACE": 0, "POLYFACE": 0, "OTHER": 0}
-    outer_boundaries = []
+    entity_count = dict.fromkeys(entity_handlers.COUNTED_TYPES, 0)  # the context's counts once measuring starts
     inner_cutouts = []
-    lines = []
-    arcs = []
-    preview = []
-    processed_entities = set()
 
     try:
         start_time = time.time()
@@ -182,386 +214,126 @@ def parse_dxf(file_path, config_file=None, material="A36 Steel", thickness=0.25)
         elif units == 2:
             unit_scale = config["unit_scale_ft_to_in"]
         logging.info(f"Detected units: {units}, applying scale factor: {unit_scale}")
+        # Preview chord error scales with the part (header extents when the CAD system wrote them)
+        chord_error_in = curve_geometry.chord_tolerance(
+            curve_geometry.header_extent(doc.header.get('$EXTMIN'), doc.header.get('$EXTMAX'), unit_scale))
 
         layers_found = set(e.dxf.layer for e in msp if hasattr(e.dxf, 'layer'))
         logging.info(f"Layers in DXF: {layers_found}")
 
-        # --- Begin: Special logic for layer 0/1 ---
-        # Scan for any cutting geometry on layer 0
-        has_cut_on_layer0 = False
-        for e in msp:
-            if hasattr(e.dxf, 'layer') and e.dxf.layer.strip().lower() == '0':
-                entity_type = e.dxftype().upper()
-                if entity_type in ('LINE', 'ARC', 'CIRCLE', 'POLYLINE', 'LWPOLYLINE', 'SPLINE', 'ELLIPSE', 'HATCH', '3DFACE', 'POLYFACE'):
-                    has_cut_on_layer0 = True
-                    break
-        # If true, treat all lines on layer 1 as reference
-        treat_layer1_as_reference = has_cut_on_layer0
-        # --- End: Special logic for layer 0/1 ---
-
-        def apply_transformation(x, y, insert=(0, 0), xscale=1.0, yscale=1.0, rotation=0):
-            x = x * xscale + insert[0]
-            y = y * yscale + insert[1]
-            if rotation:
-                rad = math.radians(rotation)
-                x_new = x * math.cos(rad) - y * math.sin(rad)
-                y_new = x * math.sin(rad) + y * math.cos(rad)
-                x, y = x_new, y_new
-            return x * unit_scale, y * unit_scale
-
-        def process_entity(entity, insert=(0, 0), xscale=1.0, yscale=1.0, rotation=0, depth=0):
-            nonlocal total_length, gross_min_x, gross_max_x, gross_min_y, gross_max_y, net_area_sqin, preview
-            if time.time() - start_time > config["timeout_seconds"]:
-                logging.error(f"Timeout exceeded ({config['timeout_seconds']}s) processing {file_path}")
-                raise TimeoutError("Parsing timeout")
-
-            entity_id = id(entity)
-            if entity_id in processed_entities or depth > config["max_recursion_depth"]:
-                logging.warning(f"Skipping entity {entity.dxftype()} due to depth {depth} or duplicate")
-                return
-            processed_entities.add(entity_id)
-
-            entity_type = entity.dxftype()
-            layer = entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'Unknown'
-            try:
-                dxf_attrs = {k: getattr(entity.dxf, k, None) for k in dir(entity.dxf) if not k.startswith('_') and not callable(getattr(entity.dxf, k, None))}
-            except Exception as e:
-                dxf_attrs = f"<error reading dxf attrs: {e}>"
-            logging.debug(f"ENTITY DEBUG: type={entity_type}, layer={layer}, dxf_attrs={dxf_attrs}")
-            layer_clean = layer.lower().strip()
-            cut_layers_clean = [l.lower().strip() for l in config["cut_layers"]]
-            reference_layers_clean = [l.lower().strip() for l in config.get("reference_layers", [])]
-            construction_layers = ["construction", "reference", "center", "centerline"]
-            construction_layers_clean = [l.lower().strip() for l in construction_layers]
-
-            if treat_layer1_as_reference and layer_clean == '1':
-                is_reference_entity = True
-                is_cut_entity = False
-            else:
-                is_reference_entity = layer_clean in reference_layers_clean or layer_clean in construction_layers_clean
-                is_cut_entity = layer_clean in cut_layers_clean and not is_reference_entity
-            logging.debug(f"Entity {entity_type} original layer: '{layer}' cleaned: '{layer_clean}' | is_cut_entity: {is_cut_entity} | is_reference_entity: {is_reference_entity}")
+        # Cut / reference role of every layer: the name lists first, geometry statistics for the rest (incl.
+        # the layer 0/1 convention)
+        construction_layers = ["construction", "reference", "center", "centerline"]
+        cut_layer_names = [l.lower().strip() for l in config["cut_layers"]]
+        reference_layer_names = [l.lower().strip() for l in config.get("reference_layers", []) + construction_layers]
+        layer_roles = layer_profiles.classify_layers(doc, cut_layer_names, reference_layer_names)
+        unlisted_cut = sorted(l for l, role in layer_roles.items() if role == layer_profiles.CUT and l not in cut_layer_names)
+        logging.info(f"Layer roles: {layer_roles}"
+                     + (f"; cutting unlisted layers by geometry: {unlisted_cut}" if unlisted_cut else ""))
 
-            if is_reference_entity or not is_cut_entity:
-                logging.info(f"Skipping entity {entity_type} on non-cut/construction/reference layer '{layer}' (not counted as cut geometry)")
-                return
+        # Placement of each entity as a 3x3 affine matrix: model space is the unit scale, and each INSERT level
+        # composes its own matrix onto its parent's, so nested blocks keep every transform. The per-type
+        # handlers (entity_handlers) add the cut geometry they measure to the shared context.
+        ctx = entity_handlers.ParseContext(doc, file_path, config, layer_roles, cut_layer_names, reference_layer_names,
+                                           block_transforms.scale_matrix(unit_scale), chord_error_in, start_time)
 
-            try:
-                if entity_type == "LINE":
-                    start_x, start_y = apply_transformation(entity.dxf.start[0], entity.dxf.start[1], insert, xscale, yscale, rotation)
-                    end_x, end_y = apply_transformation(entity.dxf.end[0], entity.dxf.end[1], insert, xscale, yscale, rotation)
-                    length = math.hypot(end_x - start_x, end_y - start_y)
-                    if is_cut_entity:
-                        lines.append((start_x, start_y, end_x, end_y, length))
-                        total_length += length
-                        preview.append({"type": "line", "start": [start_x, start_y], "end": [end_x, end_y]})
-                    gross_min_x = min(gross_min_x, start_x, end_x)
-                    gross_max_x = max(gross_max_x, start_x, end_x)
-                    gross_min_y = min(gross_min_y, start_y, end_y)
-                    gross_max_y = max(gross_max_y, start_y, end_y)
-                    entity_count["LINE"] += 1
-                    logging.info(f"LINE on layer {layer}: Length={length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                elif entity_type == "ARC":
-                    center_x, center_y = apply_transformation(entity.dxf.center[0], entity.dxf.center[1], insert, xscale, yscale, rotation)
-                    radius = entity.dxf.radius * (xscale + yscale) / 2 * unit_scale
-                    start_angle = entity.dxf.start_angle
-                    end_angle = entity.dxf.end_angle
-                    if end_angle < start_angle:
-                        end_angle += 360
-                    length = 2 * math.pi * radius * (abs(end_angle - start_angle) / 360)
-                    if is_cut_entity:
-                        arcs.append((center_x, center_y, radius, start_angle, end_angle, length))
-                        total_length += length
-                        preview.append({"type": "arc", "center": [center_x, center_y], "radius": radius,
-                                        "start_angle": start_angle, "end_angle": end_angle})
-                    gross_min_x = min(gross_min_x, center_x - radius)
-                    gross_max_x = max(gross_max_x, center_x + radius)
-                    gross_min_y = min(gross_min_y, center_y - radius)
-                    gross_max_y = max(gross_max_y, center_y + radius)
-                    entity_count["ARC"] += 1
-                    logging.info(f"ARC on layer {layer}: Length={length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                elif entity_type == "CIRCLE":
-                    center_x, center_y = apply_transformation(entity.dxf.center[0], entity.dxf.center[1], insert, xscale, yscale, rotation)
-                    radius = entity.dxf.radius * (xscale + yscale) / 2 * unit_scale
-                    length = 2 * math.pi * radius
-                    if is_cut_entity:
-                        total_length += length
-                        outer_boundaries.append({
-                            'center': (center_x, center_y), 'radius': radius, 'area': math.pi * radius ** 2,
-                            'min_x': center_x - radius, 'max_x': center_x + radius,
-                            'min_y': center_y - radius, 'max_y': center_y + radius,
-                            'perimeter': length
-                        })
-                        preview.append({"type": "circle", "center": [center_x, center_y], "radius": radius})
-                    gross_min_x = min(gross_min_x, center_x - radius)
-                    gross_max_x = max(gross_max_x, center_x + radius)
-                    gross_min_y = min(gross_min_y, center_y - radius)
-                    gross_max_y = max(gross_max_y, center_y + radius)
-                    entity_count["CIRCLE"] += 1
-                    logging.info(f"CIRCLE on layer {layer}: Length={length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                elif entity_type == "LWPOLYLINE":
-                    points = []
-                    for pt in entity:
-                        x, y = apply_transformation(pt[0], pt[1], insert, xscale, yscale, rotation)
-                        points.append((x, y))
-                    if len(points) > 1:
-                        length = sum(math.hypot(points[i][0] - points[i - 1][0], points[i][1] - points[i - 1][1]) for i in range(1, len(points)))
-                        if entity.closed:
-                            length += math.hypot(points[0][0] - points[-1][0], points[0][1] - points[-1][1])
-                        if is_cut_entity:
-                            preview_points = points + [points[0]] if entity.closed else points
-                            total_length += length
-                            preview.append({"type": "lwpolyline", "points": preview_points})
-                        gross_min_x = min(gross_min_x, *(p[0] for p in points))
-                        gross_max_x = max(gross_max_x, *(p[0] for p in points))
-                        gross_min_y = min(gross_min_y, *(p[1] for p in points))
-                        gross_max_y = max(gross_max_y, *(p[1] for p in points))
-                        entity_count["LWPOLYLINE"] += 1
-                        logging.info(f"LWPOLYLINE on layer {layer}: Length={length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                elif entity_type == "POLYLINE":
-                    points = []
-                    poly_length = 0
-                    try:
-                        if hasattr(entity, 'is_polyface_mesh') and entity.is_polyface_mesh:
-                            for sub_entity in entity.virtual_entities():
-                                process_entity(sub_entity, insert, xscale, yscale, rotation, depth + 1)
-                        else:
-                            vertices = []
-                            for v in entity.vertices:
-                                if hasattr(v.dxf, 'location'):
-                                    loc = v.dxf.location
-                                    vertices.append((loc[0], loc[1]))
-                                elif hasattr(v.dxf, 'x') and hasattr(v.dxf, 'y'):
-                                    vertices.append((v.dxf.x, v.dxf.y))
-                                else:
-                                    logging.warning(f"POLYLINE on layer {layer}: Invalid vertex format")
-                                    continue
-                            points = [apply_transformation(p[0], p[1], insert, xscale, yscale, rotation) for p in vertices]
-                            if len(points) > 1:
-                                for i in range(len(points) - 1):
-                                    p1 = points[i]
-                                    p2 = points[i + 1]
-                                    seg_len = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-                                    poly_length += seg_len
-                                if hasattr(entity, 'is_closed') and entity.is_closed and len(points) > 2:
-                                    p1 = points[-1]
-                                    p2 = points[0]
-                                    seg_len = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-                                    poly_length += seg_len
-                            if is_cut_entity:
-                                total_length += poly_length
-                                preview.append({"type": "polyline", "points": points})
-                    except Exception as e:
-                        logging.warning(f"POLYLINE on layer {layer}: Error processing: {e}")
-                    entity_count["POLYLINE"] += 1
-                    logging.info(f"POLYLINE on layer {layer}: Length={poly_length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                elif entity_type == "SPLINE":
-                    try:
-                        spline_attrs = {
-                            'degree': getattr(entity.dxf, 'degree', None),
-                            'control_points': len(getattr(entity, 'control_points', [])),
-                            'knots': len(getattr(entity, 'knots', [])) if hasattr(entity, 'knots') else 0,
-                            'weights': len(getattr(entity, 'weights', [])) if hasattr(entity, 'weights') else 0,
-                            'is_rational': getattr(entity, 'is_rational', None),
-                            'layer': layer,
-                            'is_cut_entity': is_cut_entity
-                        }
-                        logging.info(f"[SPLINE ATTRS] {spline_attrs}")
-                    except Exception as logex:
-                        logging.warning(f"[SPLINE ATTRS] Could not log SPLINE attributes: {logex}")
-                    if not is_cut_entity:
-                        logging.warning(f"SPLINE entity on non-cut layer '{layer}' detected. Preview and count will still be included for diagnostics.")
-                    try:
-                        spline_points = []
-                        try:
-                            flattened = entity.flattening(TOLERANCE)
-                            spline_points = [apply_transformation(p[0], p[1], insert, xscale, yscale, rotation) for p in flattened]
-                            if len(spline_points) > 500:
-                                logging.warning("SPLINE has >500 points, simplification skipped due to ezdxf 1.4.2 limitation")
-                        except Exception as e:
-                            logging.warning(f"SPLINE on layer {layer}: Flattening failed: {e}")
-                            raise ValueError("Failed to flatten spline")
-                        if not spline_points:
-                            logging.error(f"SPLINE failed in {file_path}: knots={len(entity.knots) if hasattr(entity, 'knots') else 'N/A'}, control_points={len(entity.control_points) if hasattr(entity, 'control_points') else 'N/A'}, degree={getattr(entity.dxf, 'degree', 'N/A')}")
-                            preview.append({"type": "error", "message": f"SPLINE processing failed: insufficient points"})
-                            return
-                        spline_length = 0
-                        if spline_points and len(spline_points) >= 2:
-                            for i in range(len(spline_points) - 1):
-                                p1 = spline_points[i]
-                                p2 = spline_points[i + 1]
-                                seg_len = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-                                spline_length += seg_len
-                            if is_cut_entity:
-                                total_length += spline_length
-                            preview.append({
-                                "type": "polyline",
-                                "points": spline_points,
-                                "source": "spline-approx"
-                            })
-                            logging.debug(f"SPLINE preview geometry extracted as polyline: {len(spline_points)} points")
-                        else:
-                            raise ValueError("Flattened spline has <2 points")
-                        spline_data = {
-                            "type": "spline",
-                            "degree": getattr(entity.dxf, 'degree', None),
-                            "control_points": [apply_transformation(p[0], p[1], insert, xscale, yscale, rotation) for p in getattr(entity, 'control_points', [])],
-                            "knots": list(getattr(entity, 'knots', [])),
-                            "weights": list(getattr(entity, 'weights', [])),
-                            "is_rational": getattr(entity, 'is_rational', False)
-                        }
-                        preview.append(spline_data)
-                        for x, y in spline_points:
-                            gross_min_x = min(gross_min_x, x)
-                            gross_max_x = max(gross_max_x, x)
-                            gross_min_y = min(gross_min_y, y)
-                            gross_max_y = max(gross_max_y, y)
-                    except Exception as e:
-                        logging.warning(f"SPLINE on layer {layer}: Error flattening or measuring spline: {e}")
-                        try:
-                            ctrl_points = [apply_transformation(p[0], p[1], insert, xscale, yscale, rotation) for p in getattr(entity, 'control_points', [])]
-                            if ctrl_points and len(ctrl_points) >= 2:
-                                spline_length = 0
-                                for i in range(len(ctrl_points) - 1):
-                                    p1 = ctrl_points[i]
-                                    p2 = ctrl_points[i + 1]
-                                    seg_len = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-                                    spline_length += seg_len
-                                if is_cut_entity:
-                                    total_length += spline_length
-                                preview.append({
-                                    "type": "polyline",
-                                    "points": ctrl_points,
-                                    "source": "spline-control-fallback"
-                                })
-                                for x, y in ctrl_points:
-                                    gross_min_x = min(gross_min_x, x)
-                                    gross_max_x = max(gross_max_x, x)
-                                    gross_min_y = min(gross_min_y, y)
-                                    gross_max_y = max(gross_max_y, y)
-                            else:
-                                raise ValueError("Control points fallback has <2 points")
-                        except Exception as ee:
-                            logging.error(f"SPLINE fallback failed on layer {layer}: {ee}")
-                            preview.append({
-                                "type": "error",
-                                "message": f"SPLINE processing failed on layer {layer}: {ee}"
-                            })
-                    finally:
-                        entity_count["SPLINE"] += 1
-                    logging.info(f"SPLINE on layer {layer}: Length={spline_length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                elif entity_type == "ELLIPSE":
-                    try:
-                        center_x, center_y = apply_transformation(entity.dxf.center[0], entity.dxf.center[1], insert, xscale, yscale, rotation)
-                        major_axis = entity.dxf.major_axis
-                        ratio = entity.dxf.radius_ratio
-                        start_param = entity.dxf.start_param
-                        end_param = entity.dxf.end_param
-                        num_points = 64
-                        ellipse_points = []
-                        for i in range(num_points + 1):
-                            t = start_param + (end_param - start_param) * i / num_points
-                            x = center_x + major_axis[0] * math.cos(t) * xscale
-                            y = center_y + major_axis[1] * math.sin(t) * yscale * ratio
-                            x, y = apply_transformation(x, y, insert, xscale, yscale, rotation)
-                            ellipse_points.append((x, y))
-                        ellipse_length = sum(math.hypot(ellipse_points[i + 1][0] - ellipse_points[i][0], ellipse_points[i + 1][1] - ellipse_points[i][1])
-                                            for i in range(num_points))
-                        if is_cut_entity:
-                            total_length += ellipse_length
-                            preview.append({"type": "ellipse", "points": ellipse_points})
-                        entity_count["ELLIPSE"] += 1
-                        logging.info(f"ELLIPSE on layer {layer}: Length={ellipse_length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                    except Exception as e:
-                        logging.warning(f"ELLIPSE on layer {layer}: Error measuring ellipse: {e}")
-                elif entity_type == "HATCH":
-                    length = 0.0
-                    hatch_points = []
-                    for path in entity.paths:
-                        for edge in path.edges:
-                            if edge.TYPE == "LineEdge":
-                                start_x, start_y = apply_transformation(edge.start[0], edge.start[1], insert, xscale, yscale, rotation)
-                                end_x, end_y = apply_transformation(edge.end[0], edge.end[1], insert, xscale, yscale, rotation)
-                                seg_len = math.hypot(end_x - start_x, end_y - start_y)
-                                if is_cut_entity:
-                                    length += seg_len
-                                    lines.append((start_x, start_y, end_x, end_y, seg_len))
-                                    hatch_points.append((start_x, start_y))
-                                    hatch_points.append((end_x, end_y))
-                            elif edge.TYPE == "ArcEdge":
-                                center_x, center_y = apply_transformation(edge.center[0], edge.center[1], insert, xscale, yscale, rotation)
-                                radius = edge.radius * (xscale + yscale) / 2 * unit_scale
-                                start_angle = edge.start_angle
-                                end_angle = edge.end_angle
-                                if end_angle < start_angle:
-                                    end_angle += 360
-                                seg_len = 2 * math.pi * radius * (abs(end_angle - start_angle) / 360)
-                                if is_cut_entity:
-                                    length += seg_len
-                                    arcs.append((center_x, center_y, radius, start_angle, end_angle, seg_len))
-                                    hatch_points.append((center_x, center_y))
-                    if is_cut_entity and hatch_points:
-                        total_length += length
-                        preview.append({"type": "hatch", "points": hatch_points})
-                    for x, y in hatch_points:
-                        gross_min_x = min(gross_min_x, x)
-                        gross_max_x = max(gross_max_x, x)
-                        gross_min_y = min(gross_min_y, y)
-                        gross_max_y = max(gross_max_y, y)
-                    entity_count["HATCH"] += 1
-                    logging.info(f"HATCH on layer {layer}: Length={length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                elif entity_type == "3DFACE":
-                    points = []
-                    for p in entity.dxf.get_points():
-                        points.append(apply_transformation(p[0], p[1], insert, xscale, yscale, rotation))
-                    length = 0
-                    for i in range(len(points)):
-                        p1 = points[i]
-                        p2 = points[(i + 1) % len(points)]
-                        seg_len = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-                        if is_cut_entity:
-                            length += seg_len
-                            lines.append((p1[0], p1[1], p2[0], p2[1], seg_len))
-                    if is_cut_entity:
-                        total_length += length
-                        preview.append({"type": "3dface", "points": points})
-                    for x, y in points:
-                        gross_min_x = min(gross_min_x, x)
-                        gross_max_x = max(gross_max_x, x)
-                        gross_min_y = min(gross_min_y, y)
-                        gross_max_y = max(gross_max_y, y)
-                    entity_count["3DFACE"] += 1
-                    logging.info(f"3DFACE on layer {layer}: Length={length:.2f} in{' (cut)' if is_cut_entity else ''}")
-                elif entity_type == "POLYFACE":
-                    for sub_entity in entity.virtual_entities():
-                        process_entity(sub_entity, insert, xscale, yscale, rotation, depth + 1)
-                    entity_count["POLYFACE"] += 1
-                    logging.info(f"POLYFACE on layer {layer}: Processed sub-entities")
-                elif entity_type == "INSERT":
-                    block = doc.blocks[entity.dxf.name]
-                    insert_point = (entity.dxf.insert[0], entity.dxf.insert[1])
-                    xscale = entity.dxf.xscale if hasattr(entity.dxf, 'xscale') else 1.0
-                    yscale = entity.dxf.yscale if hasattr(entity.dxf, 'yscale') else 1.0
-                    rotation = entity.dxf.rotation if hasattr(entity.dxf, 'rotation') else 0
-                    for block_entity in block:
-                        process_entity(block_entity, insert_point, xscale, yscale, rotation, depth + 1)
-                    entity_count["INSERT"] += 1
-                    logging.info(f"INSERT on layer {layer}: Processed block {entity.dxf.name}")
-                else:
-                    entity_count["OTHER"] += 1
-                    logging.info(f"Skipping entity {entity_type} on layer {layer}")
-            except Exception as e:
-                logging.error(f"Error processing {entity_type} on layer {layer}: {e}")
+        # Drawing sheets (border, title block, several projected views): measure only the primary view
+        sheet = sheet_views.isolate_view(msp, [l for l, role in layer_roles.items() if role == layer_profiles.CUT], unit_scale)
+        skip_handles = sheet["skip"] if sheet else set()
+        if sheet:
+            logging.info(f"Drawing sheet {file_path}: {sheet['frames']} frame(s), {sheet['views']} view(s); "
+                         f"measuring the primary view at {sheet['primary_bounds']}, skipping {len(skip_handles)} entities")
 
-        entity_processed = 0
+        selected = []
         for entity in msp.query('*'):
-            if entity_processed >= config["max_entities"]:
+            if skip_handles and entity.dxf.handle in skip_handles:
+                continue
+            if len(selected) >= config["max_entities"]:
                 logging.warning(f"Max entities ({config['max_entities']}) reached for {file_path}, stopping")
                 break
-            process_entity(entity)
-            entity_processed += 1
-            if entity_processed % 100 == 0:
-                logging.info(f"Processed {entity_processed} entities in {file_path}")
+            selected.append(entity)
+
+        # When workers are asked for, the model space is measured in contiguous chunks by forked workers that
+        # inherit the loaded document; their partial geometry is reduced into the context in model-space order
+        worker_total = parallel_parse.worker_count(len(selected), workers)
+        try:
+            if worker_total > 1:
+                def measure_chunk(lo, hi):
+                    ctx.measure(selected[lo:hi])
+                    curve_points, curve_offsets = parallel_parse.ragged_array(ctx.curves)
+                    face_points, face_offsets = parallel_parse.ragged_array(ctx.mesh_faces)
+                    return {"total_length": ctx.total_length, "entity_count": ctx.entity_count, "bounds": ctx.bounds,
+                            "preview": ctx.preview, "outer_boundaries": ctx.outer_boundaries, "timings": ctx.timings,
+                            "lines": np.asarray(ctx.lines, dtype=float).reshape(-1, 5),
+                            "arcs": np.asarray(ctx.arcs, dtype=float).reshape(-1, 6),
+                            "curve_points": curve_points, "curve_offsets": curve_offsets,
+                            "curve_lengths": np.asarray(ctx.curve_lengths, dtype=float),
+                            "face_points": face_points, "face_offsets": face_offsets}
+
+                for chunk in parallel_parse.measure_chunks(measure_chunk, len(selected), worker_total):
+                    ctx.total_length += chunk["total_length"]
+                    for key, count in chunk["entity_count"].items():
+                        ctx.entity_count[key] = ctx.entity_count.get(key, 0) + count
+                    for key, (calls, seconds) in chunk["timings"].items():
+                        timing = ctx.timings.setdefault(key, [0, 0.0])
+                        timing[0] += calls
+                        timing[1] += seconds
+                    ctx.include(*chunk["bounds"])
+                    ctx.preview.extend(chunk["preview"])
+                    ctx.outer_boundaries.extend(chunk["outer_boundaries"])
+                    ctx.lines.extend(map(tuple, chunk["lines"].tolist()))
+                    ctx.arcs.extend(map(tuple, chunk["arcs"].tolist()))
+                    ctx.curves.extend(parallel_parse.split_ragged(chunk["curve_points"], chunk["curve_offsets"]))
+                    ctx.curve_lengths.extend(chunk["curve_lengths"].tolist())
+                    ctx.mesh_faces.extend(parallel_parse.split_ragged(chunk["face_points"], chunk["face_offsets"]))
+                logging.info(f"Processed {len(selected)} entities in {file_path} with {worker_total} workers")
+            else:
+                ctx.measure(selected)
+        finally:
+            ctx.record_timings()
+            total_length, entity_count, preview = ctx.total_length, ctx.entity_count, ctx.preview
+            lines, arcs, curves, mesh_faces = ctx.lines, ctx.arcs, ctx.curves, ctx.mesh_faces
+            curve_lengths = ctx.curve_lengths
+            outer_boundaries = ctx.outer_boundaries
+            gross_min_x, gross_max_x, gross_min_y, gross_max_y = ctx.bounds
+
+        # Meshes are cut along their flat silhouette (outer and hole boundaries), not along every face edge
+        if mesh_faces:
+            rings = mesh_silhouette.silhouette(mesh_faces)
+            for ring in rings:
+                points = ring.tolist()
+                ring_lines = segment_dedup.polyline_segments(points)
+                lines.extend(ring_lines)
+                total_length += sum(segment[4] for segment in ring_lines)
+                preview.append({"type": "polyline", "points": points, "source": "mesh-silhouette"})
+            logging.info(f"Mesh silhouette for {file_path}: {len(mesh_faces)} faces -> {len(rings)} boundary rings")
+
+        # Stacked duplicates and collinear overlaps are cut once: take the repeats out of the priced length
+        dedup = segment_dedup.dedupe(lines, arcs)
+        duplicate_length = dedup["removed_length"]
+        if duplicate_length > 0:
+            total_length -= duplicate_length
+            logging.info(f"Removed {duplicate_length:.2f} in of duplicate/overlapping cut path from {file_path}: {dedup}")
+
+        # Closed contours, and the edges that parts nested edge-to-edge share (cut once by common-line cutting)
+        edges = contours.edge_coordinates(lines, arcs, curves)
+        faces, face_depth = contours.build_faces(lines, arcs, curves, edges=edges)
+        contour_count = len(faces)
+        common_line_length, common_line_pairs = contours.common_lines(faces, face_depth)
+        if common_line_length > 0:
+            logging.info(f"Common line: {common_line_length:.2f} in shared by {common_line_pairs} contour pairs in {file_path}")
+
+        # Separately cut parts (a contour with its holes; islands in holes are parts of their own)
+        parts = split_into_parts(faces, face_depth, lines, arcs, curves, preview, edges=edges,
+                                 curve_lengths=curve_lengths)
+        if len(parts) > 1:
+            logging.info(f"Split {file_path} into {len(parts)} parts")
+
+        # Tightest rectangle around the whole cut path at any orientation (a part drawn at 45 degrees fills
+        # only half of its axis-aligned box); costing takes the smaller of the two gross areas
+        oriented = oriented_gross(np.concatenate(edges) if edges else (), arcs)
+        # Same plate, same digest: moved, rotated or re-ordered re-exports of a drawing match on this
+        fingerprint = part_fingerprint.combine([part["fingerprint"] for part in parts])
 
         if not preview:
             logging.error(f"No preview geometry generated for {file_path}. Entity counts: {entity_count}")
@@ -584,17 +356,13 @@ def parse_dxf(file_path, config_file=None, material="A36 Steel", thickness=0.25)
         logging.info(f"Summary for {file_path}:")
         logging.info(f"  Total Cut Length: {total_length:.2f} in")
         logging.info(f"  Gross Area: {(gross_max_x - gross_min_x) * (gross_max_y - gross_min_y):.2f} sqin")
+        logging.info(f"  Oriented Gross Area: {oriented['oriented_area_sqin']:.2f} sqin at {oriented['oriented_angle_deg']:.1f} deg")
         logging.info(f"  Net Area: {net_area_sqin:.2f} sqin")
         logging.info(f"  Entity Counts: {entity_count}")
 
         if not preview:
             preview = [{"type": "warning", "message": f"No cutting geometry extracted from {os.path.basename(file_path)}. Check layers: {layers_found}"}]
 
-        try:
-            logging.info(f"DXF PREVIEW GENERATED: {json.dumps(preview)[:500]}")
-        except Exception as e:
-            logging.warning(f"Failed to log preview: {e}")
-
         if gross_min_x == float('inf') or gross_max_x == float('-inf'):
             gross_min_x = gross_max_x = 0
         if gross_min_y == float('inf') or gross_max_y == float('-inf'):
@@ -615,56 +383,54 @@ def parse_dxf(file_path, config_file=None, material="A36 Steel", thickness=0.25)
                                 f"({gross_min_x}, {gross_min_y}) - ({gross_max_x}, {gross_max_y})")
         if abs(gross_max_x - gross_min_x) > 1e6 or abs(gross_max_y - gross_min_y) > 1e6:
             logging.error(f"Invalid bounds for {file_path}: gross_x=({gross_min_x},{gross_max_x}), gross_y=({gross_min_y},{gross_max_y})")
-            return {
-                "total_length": 0,
-                "net_area_sqin": 0,
-                "gross_min_x": 0,
-                "gross_min_y": 0,
-                "gross_max_x": 0,
-                "gross_max_y": 0,
-                "gross_area_sqin": 0,
-                "entity_count": entity_count,
-                "preview": [{"type": "error", "message": f"Invalid bounds in {os.path.basename(file_path)}"}],
-                "contour_count": 0
-            }
-        return {
-            "total_length": total_length,
-            "net_area_sqin": net_area_sqin,
-            "gross_min_x": gross_min_x,
-            "gross_min_y": gross_min_y,
-            "gross_max_x": gross_max_x,
-            "gross_max_y": gross_max_y,
-            "gross_area_sqin": (gross_max_x - gross_min_x) * (gross_max_y - gross_min_y),
-            "entity_count": entity_count,
-            "preview": preview,
-            "contour_count": contour_count
-        }
+            return parse_result.ParseResult(
+                entity_count=entity_count,
+                preview=[{"type": "error", "message": f"Invalid bounds in {os.path.basename(file_path)}"}]
+            )
+        result = parse_result.ParseResult(
+            total_length=total_length,
+            duplicate_length=duplicate_length,
+            common_line_length=common_line_length,
+            net_area_sqin=net_area_sqin,
+            gross_min_x=gross_min_x,
+            gross_min_y=gross_min_y,
+            gross_max_x=gross_max_x,
+            gross_max_y=gross_max_y,
+            gross_area_sqin=(gross_max_x - gross_min_x) * (gross_max_y - gross_min_y),
+            **oriented,
+            entity_count=entity_count,
+            preview=preview,
+            contour_count=contour_count,
+            part_count=len(parts),
+            parts=parts,
+            fingerprint=fingerprint
+        )
+        # Only the logged head is serialized here; the full preview JSON waits for a consumer to ask
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            try:
+                logging.info(f"DXF PREVIEW GENERATED: {result.preview_head()}")
+            except Exception as e:
+                logging.warning(f"Failed to log preview: {e}")
+        return result
 
     except TimeoutError:
         logging.error(f"Parsing timeout for {file_path}")
-        return {
-            "total_length": total_length,
-            "net_area_sqin": net_area_sqin,
-            "gross_min_x": gross_min_x if gross_min_x != float('inf') else 0,
-            "gross_min_y": gross_min_y if gross_min_y != float('inf') else 0,
-            "gross_max_x": gross_max_x if gross_max_x != float('-inf') else 0,
-            "gross_max_y": gross_max_y if gross_max_y != float('-inf') else 0,
-            "gross_area_sqin": (gross_max_x - gross_min_x) * (gross_max_y - gross_min_y),
-            "entity_count": entity_count,
-            "preview": [{"type": "error", "message": f"Timeout parsing {os.path.basename(file_path)}"}],
-            "contour_count": contour_count
-        }
+        return parse_result.ParseResult(
+            total_length=total_length,
+            net_area_sqin=net_area_sqin,
+            gross_min_x=gross_min_x if gross_min_x != float('inf') else 0,
+            gross_min_y=gross_min_y if gross_min_y != float('inf') else 0,
+            gross_max_x=gross_max_x if gross_max_x != float('-inf') else 0,
+            gross_max_y=gross_max_y if gross_max_y != float('-inf') else 0,
+            gross_area_sqin=(gross_max_x - gross_min_x) * (gross_max_y - gross_min_y),
+            entity_count=entity_count,
+            preview=[{"type": "error", "message": f"Timeout parsing {os.path.basename(file_path)}"}],
+            contour_count=contour_count
+        )
     except Exception as e:
         logging.error(f"Failed to parse {file_path}: {e}")
-        return {
-            "total_length": 0,
-            "net_area_sqin": 0,
-            "gross_min_x": 0,
-            "gross_min_y": 0,
-            "gross_max_x": 0,
-            "gross_max_y": 0,
-            "gross_area_sqin": 0,
-            "entity_count": entity_count,
-            "preview": [{"type": "error", "message": f"Failed to parse {os.path.basename(file_path)}: {e}"}],
-            "contour_count": contour_count
-        }
\ No newline at end of file
+        return parse_result.ParseResult(
+            entity_count=entity_count,
+            preview=[{"type": "error", "message": f"Failed to parse {os.path.basename(file_path)}: {e}"}],
+            contour_count=contour_count
+        )
@@ -0,0 +1,245 @@
+# dxf_preflight.py
+# Cheap pre-flight triage for DXF uploads, run before dxf_parser.parse_dxf.
+# sniff_dxf() streams the raw group-code/value pairs of an ASCII DXF once, without building an ezdxf document,
+# and collects $INSUNITS, $EXTMIN/$EXTMAX, the layer table, per-type entity counts for model space, paper
+# space and block definitions. A file over max_bytes is not opened at all, and the walk stops as soon as model
+# space passes max_entities, since either one is a reject whatever follows. triage() turns that into a route:
+#   reject  - cannot produce a quote (not a DXF, 3D-only model, paper-space-only drawing, far too large)
+#   heavy   - will parse, but is big enough that it should not be doubled up (e.g. by shadow parsing)
+#   fast    - everything else
+# Binary DXF is not sniffed and always routes to heavy so the full parser decides.
+
+import os
+import logging
+
+try:
+    from . import entity_handlers
+except ImportError:  # imported as a top-level module by the scripts/ tools
+    import entity_handlers
+
+# Entity types dxf_parser.parse_dxf turns into cut geometry (INSERT counts when its blocks have them): every
+# type with a handler, plus the types measured through their virtual entities
+VIRTUAL_CUT_TYPES = {"MLINE"}
+CUT_ENTITY_TYPES = (set(entity_handlers.HANDLERS) - {"INSERT"}) | VIRTUAL_CUT_TYPES
+SOLID_ENTITY_TYPES = {"3DSOLID", "BODY", "REGION", "SURFACE", "EXTRUDEDSURFACE", "LOFTEDSURFACE",
+                      "REVOLVEDSURFACE", "SWEPTSURFACE", "PLANESURFACE", "MESH", "POLYMESH"}
+# Sub-entities that belong to the preceding entity rather than standing on their own
+SUB_ENTITY_TYPES = {"VERTEX", "SEQEND", "ATTRIB"}
+BINARY_SENTINEL = b"AutoCAD Binary DXF"
+
+ROUTE_REJECT = "reject"
+ROUTE_HEAVY = "heavy"
+ROUTE_FAST = "fast"
+
+DEFAULT_LIMITS = {
+    "max_bytes": 50 * 1024 * 1024,      # reject: readfile alone would run into the parse timeout
+    "max_entities": 500000,
+    "heavy_bytes": 2 * 1024 * 1024,     # heavy: a few seconds of readfile
+    "heavy_entities": 20000,
+}
+
+
+def _empty_sniff(file_path, size_bytes):
+    return {
+        "file": os.path.basename(file_path),
+        "size_bytes": size_bytes,
+        "binary": False,
+        "is_dxf": False,
+        "acadver": None,
+        "insunits": None,
+        "extmin": None,
+        "extmax": None,
+        "layers": [],
+        "modelspace_counts": {},
+        "paperspace_counts": {},
+        "block_counts": {},
+        "complete": True,
+    }
+
+
+def _header_point(values):
+    try:
+        return [float(values[code]) for code in ("10", "20", "30") if code in values]
+    except ValueError:
+        return None
+
+
+def _pairs(f):
+    """(code, value) pairs of an ASCII DXF, stripped, read one line at a time."""
+    for code in f:
+        value = f.readline()
+        if not value:
+            return
+        yield code.decode('utf-8', errors='replace').strip(), value.decode('utf-8', errors='replace').strip()
+
+
+def sniff_dxf(file_path, limits=None):
+    """Read header variables, the layer table and per-type entity counts from an ASCII DXF.
+
+    A file over limits["max_bytes"] comes back unread, and counting stops once model space passes
+    limits["max_entities"]; "complete" is False in both cases.
+    """
+    limits = dict(DEFAULT_LIMITS, **(limits or {}))
+    size_bytes = os.path.getsize(file_path)
+    result = _empty_sniff(file_path, size_bytes)
+    if size_bytes > limits["max_bytes"]:
+        result["complete"] = False
+        return result
+    with open(file_path, 'rb') as f:
+        if f.read(len(BINARY_SENTINEL)) == BINARY_SENTINEL:
+            result["binary"] = True
+            result["is_dxf"] = True
+            return result
+        f.seek(0)
+        _walk(_pairs(f), result, limits["max_entities"])
+    return result
+
+
+def _walk(pairs, result, max_entities):
+    """Fill a sniff result from the (code, value) pairs, stopping once model space passes max_entities."""
+    section = None
+    expect_section_name = False
+    header_var, header_values = None, {}
+    table = None
+    in_layer_entry = False
+    block_name = None
+    entity_type, entity_paperspace, entity_flags = None, False, 0
+    layers = []
+
+    def commit_entity():
+        if entity_type is None:
+            return
+        etype = entity_type
+        if etype == "POLYLINE":
+            if entity_flags & 64:
+                etype = "POLYFACE"
+            elif entity_flags & 16:
+                etype = "POLYMESH"
+        if section == "ENTITIES":
+            counts = result["paperspace_counts"] if entity_paperspace else result["modelspace_counts"]
+        elif block_name and block_name.upper().startswith("*PAPER_SPACE"):
+            counts = result["paperspace_counts"]
+        elif block_name and block_name.upper().startswith("*MODEL_SPACE"):
+            counts = result["modelspace_counts"]
+        else:
+            counts = result["block_counts"]
+        counts[etype] = counts.get(etype, 0) + 1
+
+    def commit_header_var():
+        if header_var == "$INSUNITS" and "70" in header_values:
+            try:
+                result["insunits"] = int(header_values["70"])
+            except ValueError:
+                pass
+        elif header_var == "$ACADVER" and "1" in header_values:
+            result["acadver"] = header_values["1"]
+        elif header_var in ("$EXTMIN", "$EXTMAX"):
+            result[header_var[1:].lower()] = _header_point(header_values)
+
+    model = result["modelspace_counts"]
+    for code, value in pairs:
+        if code == "0":
+            if value == "SECTION":
+                expect_section_name = True
+                result["is_dxf"] = True
+                continue
+            if value == "ENDSEC":
+                commit_entity()
+                if section == "HEADER":
+                    commit_header_var()
+                section, entity_type, block_name = None, None, None
+                continue
+            if section in ("ENTITIES", "BLOCKS"):
+                if value in SUB_ENTITY_TYPES:
+                    continue
+                commit_entity()
+                entity_type, entity_paperspace, entity_flags = None, False, 0
+                if sum(model.values()) > max_entities:
+                    result["complete"] = False
+                    break
+                if value == "BLOCK":
+                    block_name = None
+                elif value == "ENDBLK":
+                    block_name = None
+                else:
+                    entity_type = value
+            elif section == "TABLES":
+                if value == "TABLE":
+                    table = None
+                in_layer_entry = table == "LAYER" and value == "LAYER"
+            continue
+        if expect_section_name and code == "2":
+            section = value
+            expect_section_name = False
+            continue
+        if section == "HEADER":
+            if code == "9":
+                commit_header_var()
+                header_var, header_values = value, {}
+            else:
+                header_values[code] = value
+        elif section == "TABLES":
+            if code == "2":
+                if table is None:
+                    table = value
+                elif in_layer_entry:
+                    layers.append(value)
+                    in_layer_entry = False
+        elif section in ("ENTITIES", "BLOCKS"):
+            if entity_type is None:
+                if section == "BLOCKS" and code == "2" and block_name is None:
+                    block_name = value
+            elif code == "67":
+                entity_paperspace = value == "1"
+            elif code == "70" and entity_type == "POLYLINE":
+                try:
+                    entity_flags = int(value)
+                except ValueError:
+                    pass
+    else:
+        commit_entity()
+    result["layers"] = layers
+
+
+def triage(sniff, limits=None):
+    """Return (route, reasons) for a sniff_dxf() result (taken with the same limits)."""
+    limits = dict(DEFAULT_LIMITS, **(limits or {}))
+    if sniff["size_bytes"] > limits["max_bytes"]:
+        return ROUTE_REJECT, [f"File is {sniff['size_bytes'] // (1024 * 1024)} MB; the limit is "
+                              f"{limits['max_bytes'] // (1024 * 1024)} MB"]
+    if sniff["binary"]:
+        return ROUTE_HEAVY, ["Binary DXF; entity counts not sniffed"]
+    if not sniff["is_dxf"]:
+        return ROUTE_REJECT, ["Not a DXF file (no SECTION markers found)"]
+
+    model, paper, blocks = sniff["modelspace_counts"], sniff["paperspace_counts"], sniff["block_counts"]
+    model_total = sum(model.values())
+    if model_total > limits["max_entities"]:
+        return ROUTE_REJECT, [f"{model_total} model space entities; the limit is {limits['max_entities']}"]
+
+    model_cut = sum(n for etype, n in model.items() if etype in CUT_ENTITY_TYPES)
+    block_cut = sum(n for etype, n in blocks.items() if etype in CUT_ENTITY_TYPES) if model.get("INSERT") else 0
+    if model_cut + block_cut == 0:
+        if any(etype in SOLID_ENTITY_TYPES for etype in list(model) + list(blocks)):
+            return ROUTE_REJECT, ["Drawing contains only 3D solids or meshes; export a flat 2D profile"]
+        if any(etype in CUT_ENTITY_TYPES or etype == "INSERT" for etype in paper):
+            return ROUTE_REJECT, ["Geometry is only in paper space; move the profile to model space"]
+        return ROUTE_REJECT, ["No cuttable geometry in model space"]
+
+    reasons = []
+    if sniff["size_bytes"] > limits["heavy_bytes"]:
+        reasons.append(f"{sniff['size_bytes'] // 1024} KB file")
+    if model_total + block_cut > limits["heavy_entities"]:
+        reasons.append(f"{model_total + block_cut} entities including block contents")
+    return (ROUTE_HEAVY, reasons) if reasons else (ROUTE_FAST, [])
+
+
+def preflight(file_path, limits=None):
+    """sniff_dxf + triage. Returns the sniff dict with "route" and "reasons" added; never raises."""
+    try:
+        sniff = sniff_dxf(file_path, limits)
+    except Exception as e:
+        logging.error(f"Pre-flight sniff failed for {file_path}: {e}")
+        return {"file": os.path.basename(file_path), "route": ROUTE_HEAVY, "reasons": [f"Sniff failed: {e}"]}
+    sniff["route"], sniff["reasons"] = triage(sniff, limits)
+    return sniff
@@ -0,0 +1,532 @@
+# entity_handlers.py
+# Per-entity-type measurement for dxf_parser: a registry of handlers sharing one ParseContext.
+# parse_dxf used to measure entities in one long if/elif chain inside a closure, so a type it did not list
+# fell into "OTHER" unmeasured, and no single branch could be timed or replaced on its own. Now:
+#   - HANDLERS maps a DXF type to handler(ctx, entity, matrix, depth, layer); register() adds or swaps one
+#     (e.g. for a vectorized version), and ParseContext.process() dispatches by one dict lookup
+#   - a type without a handler is expanded through its virtual_entities() (MLINE, ...) and the pieces are
+#     measured by their own handlers; annotation types are never expanded
+#   - ParseContext.timings keeps calls and seconds per entity type's handler (inclusive of nested entities),
+#     merged into process-wide counters read by handler_stats() (scripts/benchmark_dxf_parser.py --handlers)
+# Handlers only see entities on cut layers; the context holds the parse state they add to.
+
+import math
+import time
+import logging
+import threading
+
+try:
+    from . import curve_geometry, block_transforms, segment_dedup, layer_profiles
+except ImportError:  # imported as a top-level module by the scripts/ tools
+    import curve_geometry
+    import block_transforms
+    import segment_dedup
+    import layer_profiles
+
+HANDLERS = {}
+COUNTED_TYPES = ["LINE", "ARC", "CIRCLE", "LWPOLYLINE", "POLYLINE", "INSERT", "SPLINE", "ELLIPSE", "HATCH", "3DFACE",
+                 "POLYFACE", "SOLID", "TRACE", "OTHER"]
+# Never expanded through virtual_entities(): their pieces are arrows, text, frames and point markers, not torch path
+NOT_EXPANDED = set(layer_profiles.ANNOTATION_TYPES) | {"ATTRIB", "ACAD_TABLE", "VIEWPORT", "IMAGE", "WIPEOUT", "POINT"}
+
+_stats = {}  # entity type -> [calls, seconds], over every parse in this process
+_stats_lock = threading.Lock()
+
+
+def register(*kinds):
+    """Decorator registering a handler for the given DXF types (replacing any handler they had)."""
+    def decorate(handler):
+        for kind in kinds:
+            HANDLERS[kind] = handler
+        return handler
+    return decorate
+
+
+class ParseContext:
+    """Parse state the handlers share: layer roles and limits in, cut geometry, bounds and counts out."""
+
+    def __init__(self, doc, file_path, config, layer_roles, cut_layer_names, reference_layer_names,
+                 root_matrix, chord_error_in, start_time):
+        self.doc = doc
+        self.file_path = file_path
+        self.config = config
+        self.layer_roles = layer_roles
+        self.cut_layer_names = cut_layer_names
+        self.reference_layer_names = reference_layer_names
+        self.root_matrix = root_matrix
+        self.chord_error_in = chord_error_in
+        self.start_time = start_time
+        self.total_length = 0
+        self.gross_min_x, self.gross_min_y = float('inf'), float('inf')
+        self.gross_max_x, self.gross_max_y = float('-inf'), float('-inf')
+        self.entity_count = dict.fromkeys(COUNTED_TYPES, 0)  # expanded types without a handler are added
+        self.outer_boundaries = []
+        self.lines = []
+        self.arcs = []
+        self.curves = []  # flattened SPLINE / ELLIPSE cut paths, for contour assembly
+        self.curve_lengths = []  # the length each of those paths added to total_length (exact for curves)
+        self.mesh_faces = []  # XY corners of cut 3DFACEs (POLYFACE faces included), measured by their silhouette
+        self.preview = []
+        self.expanding_blocks = set()  # block names on the current INSERT path, to stop self-referencing blocks
+        self.timings = {}  # entity type -> [calls, seconds] in its handler
+
+    @property
+    def bounds(self):
+        return self.gross_min_x, self.gross_max_x, self.gross_min_y, self.gross_max_y
+
+    @bounds.setter
+    def bounds(self, value):
+        self.gross_min_x, self.gross_max_x, self.gross_min_y, self.gross_max_y = value
+
+    def include(self, min_x, max_x, min_y, max_y):
+        """Grow the gross bounds to cover a box."""
+        self.gross_min_x = min(self.gross_min_x, min_x)
+        self.gross_max_x = max(self.gross_max_x, max_x)
+        self.gross_min_y = min(self.gross_min_y, min_y)
+        self.gross_max_y = max(self.gross_max_y, max_y)
+
+    def include_points(self, points):
+        if len(points):
+            xs, ys = zip(*((p[0], p[1]) for p in points))
+            self.include(min(xs), max(xs), min(ys), max(ys))
+
+    def is_cut(self, layer):
+        layer_clean = layer.lower().strip()
+        role = self.layer_roles.get(layer_clean)
+        if role is None:  # a layer only a virtual entity carries: names decide
+            role = layer_profiles.layer_role(layer_clean, None, self.cut_layer_names, self.reference_layer_names)
+        return role == layer_profiles.CUT
+
+    def process(self, entity, matrix=None, depth=0):
+        """Measure one entity (and what it expands to) if it lies on a cut layer."""
+        if time.time() - self.start_time > self.config["timeout_seconds"]:
+            logging.error(f"Timeout exceeded ({self.config['timeout_seconds']}s) processing {self.file_path}")
+            raise TimeoutError("Parsing timeout")
+        if depth > self.config["max_recursion_depth"]:
+            logging.warning(f"Skipping entity {entity.dxftype()} due to depth {depth}")
+            return
+        matrix = self.root_matrix if matrix is None else matrix
+        entity_type = entity.dxftype()
+        layer = entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'Unknown'
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            try:
+                dxf_attrs = {k: getattr(entity.dxf, k, None) for k in dir(entity.dxf)
+                             if not k.startswith('_') and not callable(getattr(entity.dxf, k, None))}
+            except Exception as e:
+                dxf_attrs = f"<error reading dxf attrs: {e}>"
+            logging.debug(f"ENTITY DEBUG: type={entity_type}, layer={layer}, dxf_attrs={dxf_attrs}")
+        if not self.is_cut(layer):
+            logging.info(f"Skipping entity {entity_type} on non-cut/construction/reference layer '{layer}' (not counted as cut geometry)")
+            return
+
+        handler = HANDLERS.get(entity_type, expand_virtual)
+        started = time.perf_counter()
+        try:
+            handler(self, entity, matrix, depth, layer)
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logging.error(f"Error processing {entity_type} on layer {layer}: {e}")
+        finally:
+            timing = self.timings.setdefault(entity_type, [0, 0.0])
+            timing[0] += 1
+            timing[1] += time.perf_counter() - started
+
+    def measure(self, entities):
+        for entity_processed, entity in enumerate(entities, 1):
+            self.process(entity)
+            if entity_processed % 100 == 0:
+                logging.info(f"Processed {entity_processed} entities in {self.file_path}")
+
+    def record_timings(self):
+        """Add this parse's handler timings to the process-wide counters."""
+        with _stats_lock:
+            for kind, (calls, seconds) in self.timings.items():
+                total = _stats.setdefault(kind, [0, 0.0])
+                total[0] += calls
+                total[1] += seconds
+
+
+def handler_stats():
+    """{entity type: {"calls", "seconds"}} over every parse since the last clear_handler_stats()."""
+    with _stats_lock:
+        return {kind: {"calls": calls, "seconds": seconds} for kind, (calls, seconds) in _stats.items()}
+
+
+def clear_handler_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+@register("LINE")
+def measure_line(ctx, entity, matrix, depth, layer):
+    start_x, start_y = block_transforms.transform_point(matrix, entity.dxf.start[0], entity.dxf.start[1])
+    end_x, end_y = block_transforms.transform_point(matrix, entity.dxf.end[0], entity.dxf.end[1])
+    length = math.hypot(end_x - start_x, end_y - start_y)
+    ctx.lines.append((start_x, start_y, end_x, end_y, length))
+    ctx.total_length += length
+    ctx.preview.append({"type": "line", "start": [start_x, start_y], "end": [end_x, end_y]})
+    ctx.include(min(start_x, end_x), max(start_x, end_x), min(start_y, end_y), max(start_y, end_y))
+    ctx.entity_count["LINE"] += 1
+    logging.info(f"LINE on layer {layer}: Length={length:.2f} in (cut)")
+
+
+@register("ARC")
+def measure_arc(ctx, entity, matrix, depth, layer):
+    xscale, yscale = block_transforms.axis_scales(matrix)
+    center_x, center_y = block_transforms.transform_point(matrix, entity.dxf.center[0], entity.dxf.center[1])
+    radius = entity.dxf.radius * (xscale + yscale) / 2
+    start_angle = entity.dxf.start_angle
+    end_angle = entity.dxf.end_angle
+    if end_angle < start_angle:
+        end_angle += 360
+    length = 2 * math.pi * radius * (abs(end_angle - start_angle) / 360)
+    start_angle, end_angle = block_transforms.transform_angles(matrix, start_angle, end_angle)
+    ctx.arcs.append((center_x, center_y, radius, start_angle, end_angle, length))
+    ctx.total_length += length
+    ctx.preview.append({"type": "arc", "center": [center_x, center_y], "radius": radius,
+                        "start_angle": start_angle, "end_angle": end_angle})
+    ctx.include(center_x - radius, center_x + radius, center_y - radius, center_y + radius)
+    ctx.entity_count["ARC"] += 1
+    logging.info(f"ARC on layer {layer}: Length={length:.2f} in (cut)")
+
+
+@register("CIRCLE")
+def measure_circle(ctx, entity, matrix, depth, layer):
+    xscale, yscale = block_transforms.axis_scales(matrix)
+    center_x, center_y = block_transforms.transform_point(matrix, entity.dxf.center[0], entity.dxf.center[1])
+    radius = entity.dxf.radius * (xscale + yscale) / 2
+    length = 2 * math.pi * radius
+    ctx.total_length += length
+    ctx.outer_boundaries.append({
+        'center': (center_x, center_y), 'radius': radius, 'area': math.pi * radius ** 2,
+        'min_x': center_x - radius, 'max_x': center_x + radius,
+        'min_y': center_y - radius, 'max_y': center_y + radius,
+        'perimeter': length
+    })
+    ctx.preview.append({"type": "circle", "center": [center_x, center_y], "radius": radius})
+    ctx.arcs.append((center_x, center_y, radius, 0.0, 360.0, length))
+    ctx.include(center_x - radius, center_x + radius, center_y - radius, center_y + radius)
+    ctx.entity_count["CIRCLE"] += 1
+    logging.info(f"CIRCLE on layer {layer}: Length={length:.2f} in (cut)")
+
+
+def _polyline_length(points, closed=False):
+    """Length of a placed point path, e.g. a flattened curve."""
+    length = sum(math.hypot(points[i][0] - points[i - 1][0], points[i][1] - points[i - 1][1]) for i in range(1, len(points)))
+    if closed and len(points) > 2:
+        length += math.hypot(points[0][0] - points[-1][0], points[0][1] - points[-1][1])
+    return length
+
+
+def _add_polyline_path(ctx, points, closed, bulges, matrix):
+    """Straight spans and bulged arcs of a placed polyline join the cut path for dedup and contours.
+
+    Returns the path's length, with each bulged span measured along its arc.
+    """
+    segments = segment_dedup.polyline_segments(points, closed, bulges)
+    arcs = segment_dedup.polyline_arcs(points, closed, bulges, block_transforms.mirrors(matrix))
+    ctx.lines.extend(segments)
+    ctx.arcs.extend(arcs)
+    return sum(segment[4] for segment in segments) + sum(arc[5] for arc in arcs)
+
+
+@register("LWPOLYLINE")
+def measure_lwpolyline(ctx, entity, matrix, depth, layer):
+    points = block_transforms.transform_points(matrix, entity.get_points('xy'))
+    if len(points) > 1:
+        length = _add_polyline_path(ctx, points, entity.closed, [b for _, _, b in entity.get_points('xyb')], matrix)
+        ctx.total_length += length
+        ctx.preview.append({"type": "lwpolyline", "points": points + [points[0]] if entity.closed else points})
+        ctx.include_points(points)
+        ctx.entity_count["LWPOLYLINE"] += 1
+        logging.info(f"LWPOLYLINE on layer {layer}: Length={length:.2f} in (cut)")
+
+
+@register("POLYLINE")
+def measure_polyline(ctx, entity, matrix, depth, layer):
+    poly_length = 0
+    try:
+        if getattr(entity, 'is_polyface_mesh', False):
+            for sub_entity in entity.virtual_entities():
+                ctx.process(sub_entity, matrix, depth + 1)
+        else:
+            vertices = []
+            bulges = []
+            for v in entity.vertices:
+                if hasattr(v.dxf, 'location'):
+                    loc = v.dxf.location
+                    vertices.append((loc[0], loc[1]))
+                elif hasattr(v.dxf, 'x') and hasattr(v.dxf, 'y'):
+                    vertices.append((v.dxf.x, v.dxf.y))
+                else:
+                    logging.warning(f"POLYLINE on layer {layer}: Invalid vertex format")
+                    continue
+                bulges.append(v.dxf.get('bulge', 0))
+            points = block_transforms.transform_points(matrix, vertices)
+            closed = getattr(entity, 'is_closed', False)
+            if len(points) > 1:
+                poly_length = _add_polyline_path(ctx, points, closed, bulges, matrix)
+            ctx.total_length += poly_length
+            ctx.preview.append({"type": "polyline", "points": points})
+    except Exception as e:
+        logging.warning(f"POLYLINE on layer {layer}: Error processing: {e}")
+    ctx.entity_count["POLYLINE"] += 1
+    logging.info(f"POLYLINE on layer {layer}: Length={poly_length:.2f} in (cut)")
+
+
+@register("SPLINE")
+def measure_spline(ctx, entity, matrix, depth, layer):
+    xscale, yscale = block_transforms.axis_scales(matrix)
+    spline_length = 0
+    try:
+        spline_attrs = {
+            'degree': getattr(entity.dxf, 'degree', None),
+            'control_points': len(getattr(entity, 'control_points', [])),
+            'knots': len(getattr(entity, 'knots', [])) if hasattr(entity, 'knots') else 0,
+            'weights': len(getattr(entity, 'weights', [])) if hasattr(entity, 'weights') else 0,
+            'is_rational': getattr(entity, 'is_rational', None),
+            'layer': layer,
+            'is_cut_entity': True
+        }
+        logging.info(f"[SPLINE ATTRS] {spline_attrs}")
+    except Exception as logex:
+        logging.warning(f"[SPLINE ATTRS] Could not log SPLINE attributes: {logex}")
+    try:
+        spline_points = []
+        try:
+            # Memoized across INSERTs, files and requests by the spline's defining data
+            flattened, spline_arc_length = curve_geometry.flatten_spline(
+                entity, curve_geometry.drawing_tolerance(ctx.chord_error_in, 1.0, xscale, yscale), xscale, yscale)
+            spline_points = block_transforms.transform_points(matrix, flattened)
+            if len(spline_points) > 500:
+                logging.warning("SPLINE has >500 points, simplification skipped due to ezdxf 1.4.2 limitation")
+        except Exception as e:
+            logging.warning(f"SPLINE on layer {layer}: Flattening failed: {e}")
+            raise ValueError("Failed to flatten spline")
+        if not spline_points:
+            logging.error(f"SPLINE failed in {ctx.file_path}: knots={len(entity.knots) if hasattr(entity, 'knots') else 'N/A'}, control_points={len(entity.control_points) if hasattr(entity, 'control_points') else 'N/A'}, degree={getattr(entity.dxf, 'degree', 'N/A')}")
+            ctx.preview.append({"type": "error", "message": f"SPLINE processing failed: insufficient points"})
+            return
+        if len(spline_points) < 2:
+            raise ValueError("Flattened spline has <2 points")
+        if spline_arc_length is not None:
+            # Exact length by quadrature; the preview polyline's chords fall short of it
+            spline_length = spline_arc_length
+        else:
+            logging.warning(f"SPLINE on layer {layer}: quadrature failed, using chord length")
+            spline_length = _polyline_length(spline_points)
+        ctx.total_length += spline_length
+        ctx.curves.append(spline_points)
+        ctx.curve_lengths.append(spline_length)
+        ctx.preview.append({"type": "polyline", "points": spline_points, "source": "spline-approx"})
+        logging.debug(f"SPLINE preview geometry extracted as polyline: {len(spline_points)} points")
+        ctx.preview.append({
+            "type": "spline",
+            "degree": getattr(entity.dxf, 'degree', None),
+            "control_points": block_transforms.transform_points(matrix, getattr(entity, 'control_points', [])),
+            "knots": list(getattr(entity, 'knots', [])),
+            "weights": list(getattr(entity, 'weights', [])),
+            "is_rational": getattr(entity, 'is_rational', False)
+        })
+        ctx.include_points(spline_points)
+    except Exception as e:
+        logging.warning(f"SPLINE on layer {layer}: Error flattening or measuring spline: {e}")
+        try:
+            ctrl_points = block_transforms.transform_points(matrix, getattr(entity, 'control_points', []))
+            if not ctrl_points or len(ctrl_points) < 2:
+                raise ValueError("Control points fallback has <2 points")
+            spline_length = _polyline_length(ctrl_points)
+            ctx.total_length += spline_length
+            ctx.preview.append({"type": "polyline", "points": ctrl_points, "source": "spline-control-fallback"})
+            ctx.include_points(ctrl_points)
+        except Exception as ee:
+            logging.error(f"SPLINE fallback failed on layer {layer}: {ee}")
+            ctx.preview.append({"type": "error", "message": f"SPLINE processing failed on layer {layer}: {ee}"})
+    finally:
+        ctx.entity_count["SPLINE"] += 1
+    logging.info(f"SPLINE on layer {layer}: Length={spline_length:.2f} in (cut)")
+
+
+@register("ELLIPSE")
+def measure_ellipse(ctx, entity, matrix, depth, layer):
+    xscale, yscale = block_transforms.axis_scales(matrix)
+    try:
+        start_param = entity.dxf.start_param
+        end_param = entity.dxf.end_param
+        if end_param <= start_param:
+            end_param += 2 * math.pi
+        # Preview points in WCS (major and minor axes, any rotation), then the INSERT transform
+        flattened = entity.flattening(curve_geometry.drawing_tolerance(ctx.chord_error_in, 1.0, xscale, yscale))
+        ellipse_points = block_transforms.transform_points(matrix, flattened)
+        ellipse_length = curve_geometry.scaled_ellipse_arc_length(
+            entity.dxf.major_axis, entity.minor_axis, start_param, end_param, xscale, yscale)
+        ctx.total_length += ellipse_length
+        ctx.preview.append({"type": "ellipse", "points": ellipse_points})
+        ctx.curves.append(ellipse_points)
+        ctx.curve_lengths.append(ellipse_length)
+        ctx.include_points(ellipse_points)
+        ctx.entity_count["ELLIPSE"] += 1
+        logging.info(f"ELLIPSE on layer {layer}: Length={ellipse_length:.2f} in (cut)")
+    except Exception as e:
+        logging.warning(f"ELLIPSE on layer {layer}: Error measuring ellipse: {e}")
+
+
+@register("HATCH")
+def measure_hatch(ctx, entity, matrix, depth, layer):
+    """Boundary paths of a cut-layer hatch: line, arc, ellipse and spline edges, and polyline paths."""
+    xscale, yscale = block_transforms.axis_scales(matrix)
+    tolerance = curve_geometry.drawing_tolerance(ctx.chord_error_in, 1.0, xscale, yscale)
+    length = 0.0
+    hatch_points = []
+    for path in entity.paths:
+        if not hasattr(path, 'edges'):  # polyline path: vertices with bulges
+            vertices = [(x, y) for x, y, _ in path.vertices]
+            points = block_transforms.transform_points(matrix, vertices)
+            if len(points) > 1:
+                length += _add_polyline_path(ctx, points, path.is_closed, [b for _, _, b in path.vertices], matrix)
+                hatch_points.extend(tuple(p) for p in points)
+            continue
+        for edge in path.edges:
+            if edge.EDGE_TYPE == "LineEdge":
+                start_x, start_y = block_transforms.transform_point(matrix, edge.start[0], edge.start[1])
+                end_x, end_y = block_transforms.transform_point(matrix, edge.end[0], edge.end[1])
+                seg_len = math.hypot(end_x - start_x, end_y - start_y)
+                length += seg_len
+                ctx.lines.append((start_x, start_y, end_x, end_y, seg_len))
+                hatch_points.append((start_x, start_y))
+                hatch_points.append((end_x, end_y))
+            elif edge.EDGE_TYPE == "ArcEdge":
+                center_x, center_y = block_transforms.transform_point(matrix, edge.center[0], edge.center[1])
+                radius = edge.radius * (xscale + yscale) / 2
+                start_angle = edge.start_angle
+                end_angle = edge.end_angle
+                if end_angle < start_angle:
+                    end_angle += 360
+                seg_len = 2 * math.pi * radius * (abs(end_angle - start_angle) / 360)
+                start_angle, end_angle = block_transforms.transform_angles(matrix, start_angle, end_angle)
+                length += seg_len
+                ctx.arcs.append((center_x, center_y, radius, start_angle, end_angle, seg_len))
+                hatch_points.append((center_x, center_y))
+            elif edge.EDGE_TYPE in ("EllipseEdge", "SplineEdge"):
+                tool = edge.construction_tool()
+                points = block_transforms.transform_points(matrix, list(tool.flattening(tolerance)))
+                if len(points) < 2:
+                    continue
+                if edge.EDGE_TYPE == "EllipseEdge":
+                    end_param = tool.end_param if tool.end_param > tool.start_param else tool.end_param + 2 * math.pi
+                    seg_len = curve_geometry.scaled_ellipse_arc_length(
+                        tool.major_axis, tool.minor_axis, tool.start_param, end_param, xscale, yscale)
+                else:
+                    seg_len = _polyline_length(points)
+                length += seg_len
+                ctx.curves.append(points)
+                ctx.curve_lengths.append(seg_len)
+                hatch_points.extend(tuple(p) for p in points)
+    if hatch_points:
+        ctx.total_length += length
+        ctx.preview.append({"type": "hatch", "points": hatch_points})
+    ctx.include_points(hatch_points)
+    ctx.entity_count["HATCH"] += 1
+    logging.info(f"HATCH on layer {layer}: Length={length:.2f} in (cut)")
+
+
+@register("SOLID", "TRACE")
+def measure_solid(ctx, entity, matrix, depth, layer):
+    """Filled SOLID / TRACE quads (or triangles) are cut along their outline."""
+    points = []
+    for point in block_transforms.transform_points(matrix, entity.wcs_vertices()):
+        if not points or point != points[-1]:
+            points.append(point)
+    if len(points) > 1 and points[-1] == points[0]:
+        points.pop()
+    if len(points) < 3:
+        return
+    segments = segment_dedup.polyline_segments(points, True)
+    length = sum(segment[4] for segment in segments)
+    ctx.lines.extend(segments)
+    ctx.total_length += length
+    ctx.preview.append({"type": "polyline", "points": points + [points[0]]})
+    ctx.include_points(points)
+    ctx.entity_count[entity.dxftype()] += 1
+    logging.info(f"{entity.dxftype()} on layer {layer}: Length={length:.2f} in (cut)")
+
+
+@register("3DFACE")
+def measure_3dface(ctx, entity, matrix, depth, layer):
+    # Measured as part of the mesh silhouette once every face is known, not edge by edge
+    points = block_transforms.transform_points(matrix, entity.wcs_vertices())
+    ctx.mesh_faces.append(points)
+    ctx.include_points(points)
+    ctx.entity_count["3DFACE"] += 1
+    logging.info(f"3DFACE on layer {layer}: queued for the mesh silhouette (cut)")
+
+
+@register("POLYFACE")
+def measure_polyface(ctx, entity, matrix, depth, layer):
+    for sub_entity in entity.virtual_entities():
+        ctx.process(sub_entity, matrix, depth + 1)
+    ctx.entity_count["POLYFACE"] += 1
+    logging.info(f"POLYFACE on layer {layer}: Processed sub-entities")
+
+
+@register("INSERT")
+def measure_insert(ctx, entity, matrix, depth, layer):
+    if entity.dxf.name in ctx.expanding_blocks:
+        logging.warning(f"INSERT on layer {layer}: block {entity.dxf.name} inserts itself, skipping")
+        return
+    block = ctx.doc.blocks[entity.dxf.name]
+    block_matrix = matrix @ block_transforms.insert_matrix(entity, block.base_point)
+    # MINSERT grid: measure the first cell, then broadcast its geometry to the other cells
+    offsets = block_transforms.minsert_offsets(entity, matrix)
+    marks = (len(ctx.preview), len(ctx.lines), len(ctx.arcs), len(ctx.outer_boundaries), ctx.total_length,
+             dict(ctx.entity_count), len(ctx.curves), len(ctx.mesh_faces))
+    outer_bounds = ctx.bounds
+    if len(offsets):
+        ctx.bounds = (float('inf'), float('-inf'), float('inf'), float('-inf'))
+    ctx.expanding_blocks.add(entity.dxf.name)
+    try:
+        for block_entity in block:
+            ctx.process(block_entity, block_matrix, depth + 1)
+    finally:
+        ctx.expanding_blocks.discard(entity.dxf.name)
+        if len(offsets):
+            cell_min_x, cell_max_x, cell_min_y, cell_max_y = block_transforms.offset_bounds(ctx.bounds, offsets)
+            ctx.bounds = outer_bounds
+            ctx.include(cell_min_x, cell_max_x, cell_min_y, cell_max_y)
+    if len(offsets):
+        (preview_copies, line_copies, arc_copies, boundary_copies, curve_copies,
+         face_copies) = block_transforms.replicate_instances(
+            offsets, ctx.preview[marks[0]:], ctx.lines[marks[1]:], ctx.arcs[marks[2]:],
+            ctx.outer_boundaries[marks[3]:], ctx.curves[marks[6]:], ctx.mesh_faces[marks[7]:])
+        ctx.preview.extend(preview_copies)
+        ctx.lines.extend(line_copies)
+        ctx.arcs.extend(arc_copies)
+        ctx.outer_boundaries.extend(boundary_copies)
+        ctx.curves.extend(curve_copies)
+        ctx.curve_lengths.extend(ctx.curve_lengths[marks[6]:] * len(offsets))
+        ctx.mesh_faces.extend(face_copies)
+        ctx.total_length += (ctx.total_length - marks[4]) * len(offsets)
+        for key, count in marks[5].items():
+            ctx.entity_count[key] += (ctx.entity_count[key] - count) * len(offsets)
+        for key in set(ctx.entity_count) - set(marks[5]):  # types first met inside the block
+            ctx.entity_count[key] *= len(offsets) + 1
+        logging.info(f"MINSERT on layer {layer}: {len(offsets) + 1} cells of block {entity.dxf.name}")
+    ctx.entity_count["INSERT"] += 1
+    logging.info(f"INSERT on layer {layer}: Processed block {entity.dxf.name}")
+
+
+def expand_virtual(ctx, entity, matrix, depth, layer):
+    """Fallback for types without a handler: measure the pieces virtual_entities() breaks them into."""
+    entity_type = entity.dxftype()
+    if entity_type in NOT_EXPANDED or entity_type in ctx.config.get("ignored_entities", ()) or \
+            not hasattr(entity, 'virtual_entities'):
+        ctx.entity_count["OTHER"] += 1
+        logging.info(f"Skipping entity {entity_type} on layer {layer}")
+        return
+    pieces = 0
+    for piece in entity.virtual_entities():
+        ctx.process(piece, matrix, depth + 1)
+        pieces += 1
+    ctx.entity_count[entity_type] = ctx.entity_count.get(entity_type, 0) + 1
+    logging.info(f"{entity_type} on layer {layer}: measured {pieces} virtual entities")
@@ -0,0 +1,136 @@
+# layer_profiles.py
+# Cut / reference classification of DXF layers for dxf_parser.
+# Layer names alone miss most customers' conventions: a layer the name lists do not know was dropped
+# without a word, even when it held the part outline. classify_layers() keeps the name lists as the first
+# word and scores every other layer by cheap geometric statistics over model space and the blocks it
+# inserts:
+#   - closed-loop ratio: closed entities (circles, closed polylines / splines, full ellipses) plus open
+#     pieces whose two endpoints both meet another piece, over all geometry on the layer
+#   - linetype: dashed, center and phantom lines (anything but CONTINUOUS) are drawing aids, never cuts
+#   - annotation: text, dimensions and leaders outnumbering the geometry mark a notes / dimension layer
+# A layer the lists call "cut" is still demoted when every entity on it is drawn in a broken linetype.
+#
+# Roles are decided afresh for every file. Deciding them from the statistics costs next to nothing; the
+# statistics walk is the work, and it cannot be skipped: two files from the same source with the same layer
+# table but different geometry (a part on layer 1 only, say) need different roles.
+
+CUT, REFERENCE = "cut", "reference"
+
+MIN_CLOSED_RATIO = 0.75       # unknown layers are cut when at least this share of their geometry is closed
+MAX_DASHED_RATIO = 0.5        # ... drawn mostly in a continuous linetype
+ENDPOINT_DIGITS = 3           # endpoint snapping for the loop test, in drawing units
+
+GEOMETRY_TYPES = {"LINE", "ARC", "CIRCLE", "LWPOLYLINE", "POLYLINE", "SPLINE", "ELLIPSE", "HATCH", "3DFACE"}
+ANNOTATION_TYPES = {"TEXT", "MTEXT", "DIMENSION", "ARC_DIMENSION", "LARGE_RADIAL_DIMENSION", "LEADER",
+                    "MULTILEADER", "TOLERANCE", "ATTDEF"}
+CONTINUOUS_LINETYPES = {"", "CONTINUOUS", "BYBLOCK"}
+
+
+def clean_name(layer):
+    return layer.lower().strip()
+
+
+def _endpoints(entity):
+    """(start, end) of an open piece of geometry, None for closed ones; raises for unsupported types."""
+    kind = entity.dxftype()
+    if kind == "LINE":
+        return entity.dxf.start, entity.dxf.end
+    if kind == "ARC":
+        return entity.start_point, entity.end_point
+    if kind == "LWPOLYLINE":
+        points = entity.get_points('xy')
+        return None if entity.closed else (points[0], points[-1])
+    if kind == "POLYLINE":
+        points = [v.dxf.location for v in entity.vertices]
+        return None if entity.is_closed else (points[0], points[-1])
+    if kind == "SPLINE":
+        if entity.closed:
+            return None
+        points = entity.fit_points if entity.fit_point_count() else entity.control_points
+        return points[0], points[-1]
+    if kind == "ELLIPSE":
+        if abs(entity.dxf.end_param - entity.dxf.start_param) >= 6.283185:
+            return None
+        return entity.start_point, entity.end_point
+    return None  # CIRCLE, HATCH and 3DFACE are closed
+
+
+def _entities(doc):
+    """Model-space entities plus the entities of every block it inserts (each block once)."""
+    msp = doc.modelspace()
+    pending, seen = [msp], set()
+    while pending:
+        layout = pending.pop()
+        for entity in layout:
+            yield entity
+            if entity.dxftype() == "INSERT" and entity.dxf.name not in seen:
+                seen.add(entity.dxf.name)
+                block = doc.blocks.get(entity.dxf.name)
+                if block is not None:
+                    pending.append(block)
+
+
+def layer_statistics(doc):
+    """Per-layer counts: {layer: {"geometry", "closed", "dashed", "annotation"}} (layer names cleaned)."""
+    linetypes = {clean_name(layer.dxf.name): layer.dxf.get('linetype', 'CONTINUOUS').upper() for layer in doc.layers}
+    stats, ends = {}, {}
+    for entity in _entities(doc):
+        kind = entity.dxftype()
+        if kind not in GEOMETRY_TYPES and kind not in ANNOTATION_TYPES:
+            continue
+        layer = clean_name(entity.dxf.get('layer', '0'))
+        row = stats.setdefault(layer, {"geometry": 0, "closed": 0, "dashed": 0, "annotation": 0})
+        if kind in ANNOTATION_TYPES:
+            row["annotation"] += 1
+            continue
+        row["geometry"] += 1
+        linetype = entity.dxf.get('linetype', 'BYLAYER').upper()
+        if linetype == "BYLAYER":
+            linetype = linetypes.get(layer, "CONTINUOUS")
+        if linetype not in CONTINUOUS_LINETYPES:
+            row["dashed"] += 1
+        try:
+            endpoints = _endpoints(entity)
+        except Exception:
+            continue
+        if endpoints is None:
+            row["closed"] += 1
+        else:
+            ends.setdefault(layer, []).append(tuple((round(p[0], ENDPOINT_DIGITS), round(p[1], ENDPOINT_DIGITS))
+                                                    for p in endpoints))
+    # Open pieces chained into loops: both endpoints shared with another piece (or each other)
+    for layer, pieces in ends.items():
+        degree = {}
+        for a, b in pieces:
+            degree[a] = degree.get(a, 0) + 1
+            degree[b] = degree.get(b, 0) + 1
+        stats[layer]["closed"] += sum(1 for a, b in pieces if (a == b) or (degree[a] >= 2 and degree[b] >= 2))
+    return stats
+
+
+def layer_role(layer, row, cut_layers, reference_layers, layer0_cut=False):
+    """CUT or REFERENCE for one cleaned layer name given its statistics row (None when it has no geometry)."""
+    if layer in reference_layers:
+        return REFERENCE
+    if layer == '1' and layer0_cut:
+        return REFERENCE  # sources that cut on layer 0 keep construction on layer 1
+    if row is None or not row["geometry"]:
+        return CUT if layer in cut_layers else REFERENCE
+    if row["dashed"] == row["geometry"]:
+        return REFERENCE
+    if layer in cut_layers:
+        return CUT
+    looks_cut = (row["closed"] >= MIN_CLOSED_RATIO * row["geometry"] and
+                 row["dashed"] <= MAX_DASHED_RATIO * row["geometry"] and row["annotation"] <= row["geometry"])
+    return CUT if looks_cut else REFERENCE
+
+
+def classify_layers(doc, cut_layers, reference_layers):
+    """Role of every layer in the drawing: {cleaned layer name: CUT | REFERENCE}."""
+    stats = layer_statistics(doc)
+    layer0_cut = any(clean_name(e.dxf.layer) == '0' and e.dxftype() in GEOMETRY_TYPES
+                     for e in doc.modelspace() if e.dxf.hasattr('layer'))
+    cut = {clean_name(l) for l in cut_layers}
+    reference = {clean_name(l) for l in reference_layers}
+    layers = set(stats) | {clean_name(layer.dxf.name) for layer in doc.layers}
+    return {layer: layer_role(layer, stats.get(layer), cut, reference, layer0_cut) for layer in layers}
@@ -0,0 +1,57 @@
+# mesh_silhouette.py
+# Flat silhouette of the 3DFACE / POLYFACE meshes dxf_parser measures.
+# Plates exported from 3D modellers arrive as meshes: every face of the part is split into triangles, and
+# every triangle edge used to be measured as cut path, which multiplied the cut length and the preview.
+# silhouette() projects the faces to XY and merges them, keeping only the outer and hole boundaries the
+# torch follows:
+#   1. faces become polygons in one shapely call; faces seen edge-on (no projected area) are dropped
+#   2. an STRtree query over the faces finds the overlapping and touching pairs, and their connected
+#      components (scipy.sparse.csgraph) split the mesh into independent patches (separate parts)
+#   3. each patch is merged by one batched unary_union on a MESH_TOLERANCE_IN grid, which also closes the
+#      floating-point slivers between neighbouring triangles
+
+import numpy as np
+import shapely
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+MESH_TOLERANCE_IN = 0.001  # union grid; ring pieces smaller than this square are slivers
+
+
+def face_polygons(faces):
+    """XY polygons of mesh faces given as point lists (3DFACE corners); faces without area are dropped."""
+    faces = [np.asarray(face, dtype=float).reshape(-1, 2) for face in faces if len(face) >= 3]
+    if not faces:
+        return np.empty(0, dtype=object)
+    coords = np.concatenate(faces)
+    indices = np.repeat(np.arange(len(faces)), [len(face) for face in faces])
+    polygons = shapely.polygons(shapely.linearrings(coords, indices=indices))
+    invalid = ~shapely.is_valid(polygons)
+    if invalid.any():  # bow-tie quads
+        polygons[invalid] = shapely.make_valid(polygons[invalid])
+    return polygons[shapely.area(polygons) > MESH_TOLERANCE_IN * MESH_TOLERANCE_IN]
+
+
+def silhouette(faces, tolerance=MESH_TOLERANCE_IN):
+    """Outer and hole boundaries of the union of the faces' XY projections.
+
+    Returns a list of closed rings, each an (n, 2) array whose last point repeats the first.
+    """
+    polygons = face_polygons(faces)
+    if not len(polygons):
+        return []
+    i, j = shapely.STRtree(polygons).query(polygons, predicate='intersects')
+    graph = coo_matrix((np.ones(len(i), dtype=bool), (i, j)), shape=(len(polygons), len(polygons)))
+    patch_count, labels = connected_components(graph, directed=False)
+    order = np.argsort(labels, kind='stable')
+    cuts = np.searchsorted(labels[order], np.arange(patch_count + 1))
+    rings = []
+    for lo, hi in zip(cuts[:-1].tolist(), cuts[1:].tolist()):
+        merged = shapely.unary_union(polygons[order[lo:hi]], grid_size=tolerance)
+        for part in shapely.get_parts(merged):
+            if not isinstance(part, shapely.Polygon) or part.area <= tolerance * tolerance:
+                continue
+            for ring in [part.exterior, *part.interiors]:
+                if shapely.Polygon(ring).area > tolerance * tolerance:
+                    rings.append(np.asarray(ring.coords)[:, :2])
+    return rings
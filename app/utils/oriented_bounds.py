@@ -0,0 +1,89 @@
+# oriented_bounds.py
+# Minimum-area oriented bounding rectangle of the cut geometry.
+# gross_area_sqin is the axis-aligned box of the drawing, so a part drawn at 45 degrees is priced at up to twice
+# the plate it really uses. min_area_rectangle() finds the tightest rectangle at any orientation: the convex
+# hull of the points (shapely / GEOS, O(n log n)) and then rotating calipers over the hull. The best rectangle
+# has one side flush with a hull edge, so every edge is tried once; the hull vertices that bound the rectangle
+# on the other three sides are found by a binary search over the hull's (monotonic) edge-normal angles
+# instead of a projection of every vertex, which keeps the caliper stage O(h log h) for h hull vertices.
+
+import math
+import numpy as np
+import shapely
+
+
+def convex_hull(points):
+    """Convex hull vertices of an (n, 2) point array, counter-clockwise and without the closing repeat.
+
+    A point or a segment comes back as one or two vertices.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if not len(points):
+        return np.empty((0, 2))
+    hull = shapely.convex_hull(shapely.multipoints(points))
+    if isinstance(hull, shapely.Polygon):
+        coords = np.asarray(hull.exterior.coords)[:-1]
+        x, y = coords[:, 0], coords[:, 1]
+        if np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y) < 0:  # shoelace sign: clockwise
+            coords = coords[::-1]
+        return coords
+    return np.asarray(shapely.get_coordinates(hull)).reshape(-1, 2)[:2]
+
+
+def _rectangle(origin, u, along, across):
+    """Corners of the rectangle spanning `along` on direction u and `across` on its left normal."""
+    w = np.array([-u[1], u[0]])
+    return [(origin + u * a + w * b).tolist() for a, b in
+            ((along[0], across[0]), (along[1], across[0]), (along[1], across[1]), (along[0], across[1]))]
+
+
+def min_area_rectangle(points, margin=0.0):
+    """Smallest-area rectangle around the points, at any orientation.
+
+    Returns a dict with area, width (the side along angle_deg), height, angle_deg in [0, 90) and the four
+    corners, or None for no points. Collinear points give a zero-area rectangle along their segment.
+    margin grows every side outward, e.g. by the sagitta of flattened arcs so the box holds the true curve.
+    """
+    hull = convex_hull(points)
+    if not len(hull):
+        return None
+    if len(hull) < 3:
+        span = hull[-1] - hull[0]
+        length = float(np.hypot(*span))
+        u = span / length if length > 0 else np.array([1.0, 0.0])
+        return _oriented(hull[0], u, (0.0, length), (0.0, 0.0), margin)
+
+    edges = np.roll(hull, -1, axis=0) - hull
+    lengths = np.hypot(edges[:, 0], edges[:, 1])
+    u = edges / lengths[:, None]
+    inward = np.column_stack([-u[:, 1], u[:, 0]])  # the left normal points into a counter-clockwise hull
+    theta = np.unwrap(np.arctan2(edges[:, 1], edges[:, 0]))
+    normals = theta - math.pi / 2  # outward normal angle of each edge, increasing around the hull
+
+    def support(angle):
+        # Vertex i is extreme for every direction between the outward normals of edges i - 1 and i
+        wrapped = normals[0] + np.mod(angle - normals[0], 2 * math.pi)
+        return np.searchsorted(normals, wrapped) % len(hull)
+
+    ahead, behind, across = support(theta), support(theta + math.pi), support(theta + math.pi / 2)
+    along = np.einsum('ij,ij->i', hull[ahead] - hull[behind], u)
+    height = np.einsum('ij,ij->i', hull[across] - hull, inward)
+    k = int(np.argmin(along * height))
+    start = float(np.dot(hull[behind[k]] - hull[k], u[k]))
+    return _oriented(hull[k], u[k], (start, start + float(along[k])), (0.0, float(height[k])), margin)
+
+
+def _oriented(origin, u, along, across, margin):
+    along, across = (along[0] - margin, along[1] + margin), (across[0] - margin, across[1] + margin)
+    width, height = along[1] - along[0], across[1] - across[0]
+    angle = round(math.degrees(math.atan2(u[1], u[0])), 9) % 180.0  # rounded so an axis-aligned box reads 0
+    if angle >= 90.0:  # the same rectangle seen from its other side
+        angle -= 90.0
+        width, height = height, width
+    return {
+        "area": width * height,
+        "width": width,
+        "height": height,
+        "angle_deg": angle,
+        "corners": _rectangle(np.asarray(origin, dtype=float), np.asarray(u, dtype=float), along, across),
+    }
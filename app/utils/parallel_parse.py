@@ -0,0 +1,133 @@
+# parallel_parse.py
+# Chunked parallel measurement of one DXF's model space for dxf_parser.
+# A large drawing used to be measured entity by entity on one core. measure_chunks() splits the selected
+# entities into contiguous chunks and measures them in a pool of forked workers:
+#   - the workers are forked after the document is loaded, so they inherit it (and the measuring closure)
+#     instead of re-reading the file or pickling entities
+#   - each worker returns its partial geometry as numpy arrays in shared memory blocks; only the small
+#     remainder of its result (counts, bounds, preview items) is pickled back
+#   - chunks come back in model-space order, so the caller's reduce sees the same sequence a serial pass does
+# The pool is opt-in (parse_dxf(workers=N), e.g. from batch scripts); by default a parse is serial. A process
+# that runs other threads (a web server's request threads, the shadow-parser executor, logging handlers)
+# is never forked: a lock another thread holds at fork time stays held in the child, which can then hang.
+# Such processes, and platforms without the fork start method, measure serially.
+
+import logging
+import threading
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+MIN_CHUNK_ENTITIES = 250  # never split finer than this many entities per worker
+
+_job = None  # chunk measuring callable for the pool being forked (inherited by its workers)
+_fork_lock = threading.Lock()
+
+
+def fork_available():
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def fork_safe():
+    """True when this process can fork workers: fork exists and no other thread is running."""
+    return fork_available() and threading.active_count() == 1
+
+
+def worker_count(entity_count, workers=None):
+    """Workers for measuring entity_count entities: workers=None (the default) measures serially."""
+    if workers is None:
+        return 1
+    workers = max(1, min(int(workers), entity_count // MIN_CHUNK_ENTITIES or 1))
+    if workers > 1 and not fork_safe():
+        logging.warning(f"{workers} parse workers requested, but this process cannot fork safely "
+                        f"({threading.active_count()} threads running); measuring serially")
+        return 1
+    return workers
+
+
+def chunk_bounds(total, chunks):
+    """(start, stop) of `chunks` contiguous, near-equal slices of range(total)."""
+    edges = np.linspace(0, total, chunks + 1).astype(int).tolist()
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def ragged_array(point_lists):
+    """Variable-length point lists as one (n, 2) float array plus the start offset of every list."""
+    lengths = [len(points) for points in point_lists]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    if not offsets[-1]:
+        return np.empty((0, 2)), offsets
+    return np.asarray([point[:2] for points in point_lists for point in points], dtype=float), offsets
+
+
+def split_ragged(points, offsets):
+    """Inverse of ragged_array(): a list of point lists."""
+    points = points.tolist()
+    return [points[lo:hi] for lo, hi in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def to_shared(array):
+    """Copy an array into a new shared memory block; returns a picklable handle for from_shared()."""
+    array = np.ascontiguousarray(array)
+    block = SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    handle = (block.name, array.shape, array.dtype.str)
+    block.close()
+    return handle
+
+
+def from_shared(handle):
+    """Copy an array out of the block a worker filled, then free the block."""
+    name, shape, dtype = handle
+    block = SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _run_chunk(bounds):
+    """Worker side: measure one chunk; array values of the result travel back through shared memory.
+
+    Errors are returned rather than raised, so every chunk finishes and the parent frees every block.
+    """
+    try:
+        result = _job(*bounds)
+    except Exception as e:
+        return e, {}
+    shared = {key: to_shared(value) for key, value in result.items() if isinstance(value, np.ndarray)}
+    return {key: value for key, value in result.items() if key not in shared}, shared
+
+
+def measure_chunks(job, total, workers):
+    """Results of job(start, stop) over `workers` contiguous chunks of range(total), in order.
+
+    job runs in forked workers and returns a dict; numpy array values are returned through shared memory,
+    everything else is pickled. Exceptions raised by job (e.g. TimeoutError) are re-raised here. Callers
+    size the pool with worker_count(), which keeps it out of processes that are not fork_safe().
+    """
+    global _job
+    bounds = chunk_bounds(total, workers)
+    resource_tracker.ensure_running()  # one tracker shared with the workers, so the parent's unlink sticks
+    with _fork_lock:
+        _job = job
+        try:
+            pool = multiprocessing.get_context("fork").Pool(len(bounds))
+        finally:
+            _job = None
+    with pool:
+        chunks = pool.map(_run_chunk, bounds, chunksize=1)
+    results = []
+    for plain, shared in chunks:
+        arrays = {key: from_shared(handle) for key, handle in shared.items()}
+        if not isinstance(plain, Exception):
+            plain.update(arrays)
+        results.append(plain)
+    error = next((result for result in results if isinstance(result, Exception)), None)
+    if error is not None:
+        raise error
+    logging.info(f"Measured {total} entities in {len(bounds)} parallel chunks")
+    return results
@@ -0,0 +1,192 @@
+# parse_quarantine.py
+# Quarantine store for slow, timed-out and failed DXF parses.
+# Uploads are saved to UPLOAD_FOLDER under their filename, so the next upload with the same name overwrites
+# the file that caused a slow or failed parse. capture_parse() copies the bytes into a content-addressed
+# store right after the parse, next to a JSON record with the reason, timing, parse arguments, the parser's
+# effective settings (dxf_parser.parser_config()) and the parser build that produced them. scripts/replay_parse_quarantine.py re-runs the store against any parser build,
+# and the store directory can be handed straight to scripts/benchmark_dxf_parser.py as a corpus.
+#
+# Layout (one pair per distinct file content):
+#   <PARSE_QUARANTINE_FOLDER>/<sha256>.dxf
+#   <PARSE_QUARANTINE_FOLDER>/<sha256>.json
+#
+# Only parser trouble is captured: slow parses, timeouts and parses that raised. An upload that simply has
+# nothing to cut ("No cuttable geometry", a SPLINE that fell back to its control points) is the customer's
+# drawing, not a parser failure, and is not kept. The store holds customer files, so it is off unless a
+# folder is configured, and bounded: past max_files entries or max_bytes of DXF, the oldest entries go first.
+#
+# Configured through app.config (from the environment in create_app):
+#   PARSE_QUARANTINE_FOLDER     store directory; empty (the default) disables capture
+#   PARSE_QUARANTINE_MAX_FILES  distinct files kept
+#   PARSE_QUARANTINE_MAX_BYTES  DXF bytes kept
+#   SLOW_PARSE_SECONDS          parses at or above this latency are captured as "slow"
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import logging
+import platform
+from datetime import datetime
+
+REASON_SLOW = "slow"
+REASON_TIMEOUT = "timeout"
+REASON_ERROR = "error"
+MAX_CAPTURES_PER_ENTRY = 20  # timing samples kept per distinct file
+DEFAULT_MAX_FILES = 200
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Preview error messages parse_dxf writes when the parse itself failed (rather than the drawing being empty)
+PARSER_FAILURE_PREFIXES = {"Timeout parsing": REASON_TIMEOUT, "Failed to parse": REASON_ERROR,
+                           "Invalid bounds": REASON_ERROR}
+
+_parser_build = None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parser_build():
+    """Identify the parser that produced a capture: dxf_parser.py source hash plus library versions."""
+    global _parser_build
+    if _parser_build is None:
+        source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dxf_parser.py')
+        try:
+            source_sha = file_sha256(source)[:12]
+        except OSError:
+            source_sha = None
+        try:
+            import ezdxf
+            ezdxf_version = ezdxf.__version__
+        except ImportError:
+            ezdxf_version = None
+        _parser_build = {"dxf_parser_sha256": source_sha, "ezdxf": ezdxf_version,
+                         "python": platform.python_version(), "platform": sys.platform}
+    return _parser_build
+
+
+def classify_parse(parse_result, parse_seconds, slow_seconds, error=None):
+    """Return the capture reason for a parse, or None when it was fast and the parser did not fail.
+
+    Error previews about the drawing itself (nothing to cut, a curve that fell back) are not captured.
+    """
+    if error is not None:
+        return REASON_ERROR
+    preview = (parse_result or {}).get('preview', [])
+    for item in preview:
+        if isinstance(item, dict) and item.get('type') == 'error':
+            message = str(item.get('message', ''))
+            for prefix, reason in PARSER_FAILURE_PREFIXES.items():
+                if message.startswith(prefix):
+                    return reason
+    if slow_seconds and parse_seconds >= slow_seconds:
+        return REASON_SLOW
+    return None
+
+
+def capture_parse(file_path, quarantine_folder, reason, parse_seconds, part_number=None, parse_kwargs=None,
+                  error=None, parser_config=None, max_files=DEFAULT_MAX_FILES, max_bytes=DEFAULT_MAX_BYTES):
+    """Copy file_path into the store and append this capture to its record. Never raises.
+
+    parser_config: the parser's effective settings (dxf_parser.parser_config()), kept with the capture.
+    A new file evicts the oldest entries beyond max_files / max_bytes. Returns the record dict, or None
+    when capture is disabled or failed.
+    """
+    if not quarantine_folder or not reason:
+        return None
+    try:
+        os.makedirs(quarantine_folder, exist_ok=True)
+        sha = file_sha256(file_path)
+        dxf_path = os.path.join(quarantine_folder, f"{sha}.dxf")
+        record_path = os.path.join(quarantine_folder, f"{sha}.json")
+        is_new = not os.path.exists(dxf_path)
+        if is_new:
+            shutil.copyfile(file_path, dxf_path)
+        record = load_record(record_path) or {
+            "sha256": sha,
+            "size_bytes": os.path.getsize(dxf_path),
+            "first_seen": datetime.utcnow().isoformat(timespec='seconds'),
+            "part_numbers": [],
+            "captures": [],
+        }
+        name = part_number or os.path.basename(file_path)
+        if name not in record["part_numbers"]:
+            record["part_numbers"].append(name)
+        record["captures"].append({
+            "captured_at": datetime.utcnow().isoformat(timespec='seconds'),
+            "reason": reason,
+            "parse_ms": round(parse_seconds * 1000, 3),
+            "parse_kwargs": parse_kwargs or {},
+            "parser_config": parser_config or {},
+            "error": str(error) if error is not None else None,
+            "parser_build": parser_build(),
+        })
+        record["captures"] = record["captures"][-MAX_CAPTURES_PER_ENTRY:]
+        record["worst_parse_ms"] = max(c["parse_ms"] for c in record["captures"])
+        record["last_reason"] = reason
+        tmp_path = record_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp_path, record_path)
+        if is_new:
+            evict(quarantine_folder, max_files, max_bytes, keep=sha)
+        logging.warning(f"Quarantined {reason} parse of {name} ({record['captures'][-1]['parse_ms']} ms) as {sha[:12]}")
+        return record
+    except Exception as e:
+        logging.error(f"Failed to quarantine {file_path}: {e}")
+        return None
+
+
+def evict(quarantine_folder, max_files=DEFAULT_MAX_FILES, max_bytes=DEFAULT_MAX_BYTES, keep=None):
+    """Remove the oldest entries (first captured first) until the store is within both limits.
+
+    The entry whose sha256 is `keep` is never removed. Returns the sha256 of every removed entry.
+    """
+    entries = sorted(list_entries(quarantine_folder), key=lambda r: os.stat(r["dxf_path"]).st_mtime_ns)
+    total_bytes = sum(r.get("size_bytes", 0) for r in entries)
+    removed = []
+    for record in entries:
+        if len(entries) - len(removed) <= max_files and total_bytes <= max_bytes:
+            break
+        if record["sha256"] == keep:
+            continue
+        for path in (record["dxf_path"], record["dxf_path"][:-len('.dxf')] + '.json'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total_bytes -= record.get("size_bytes", 0)
+        removed.append(record["sha256"])
+    if removed:
+        logging.info(f"Evicted {len(removed)} quarantined parses from {quarantine_folder}")
+    return removed
+
+
+def load_record(record_path):
+    try:
+        with open(record_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_entries(quarantine_folder):
+    """Records in the store, worst capture first. Each record gets a "dxf_path" key."""
+    entries = []
+    if not os.path.isdir(quarantine_folder):
+        return entries
+    for fname in os.listdir(quarantine_folder):
+        if not fname.endswith('.json'):
+            continue
+        record = load_record(os.path.join(quarantine_folder, fname))
+        dxf_path = os.path.join(quarantine_folder, fname[:-len('.json')] + '.dxf')
+        if record and os.path.exists(dxf_path):
+            record["dxf_path"] = dxf_path
+            entries.append(record)
+    entries.sort(key=lambda r: r.get("worst_parse_ms", 0), reverse=True)
+    return entries
@@ -0,0 +1,112 @@
+# parse_result.py
+# Typed, slotted result of dxf_parser.parse_dxf.
+# parse_dxf used to return a plain dict whose preview every consumer re-serialized (the parser itself
+# json.dumps'ed the whole preview just to log its first 500 characters). ParseResult keeps the metrics as
+# typed attributes and the preview as the parser built it; the JSON text is produced the first time a
+# consumer asks for it (preview_json) and then reused, so callers that read only length and area never
+# pay for serialization. It stays a read-only Mapping, so result["total_length"] and
+# result.get("preview", []) keep working for existing callers.
+
+import json
+from collections.abc import Mapping
+
+FIELDS = ("total_length", "duplicate_length", "common_line_length", "net_area_sqin", "gross_min_x", "gross_min_y",
+          "gross_max_x", "gross_max_y", "gross_area_sqin", "oriented_area_sqin", "oriented_width", "oriented_height",
+          "oriented_angle_deg", "entity_count", "preview", "contour_count", "part_count", "parts", "fingerprint")
+PREVIEW_LOG_CHARS = 500
+
+
+class ParseResult(Mapping):
+    """Metrics, entity counts, preview and per-part breakdown of one parsed DXF."""
+
+    __slots__ = FIELDS + ("_preview_json",)
+
+    total_length: float
+    duplicate_length: float
+    common_line_length: float
+    net_area_sqin: float
+    gross_min_x: float
+    gross_min_y: float
+    gross_max_x: float
+    gross_max_y: float
+    gross_area_sqin: float
+    oriented_area_sqin: float   # minimum-area rectangle at any orientation, see oriented_bounds
+    oriented_width: float       # its side along oriented_angle_deg
+    oriented_height: float
+    oriented_angle_deg: float   # in [0, 90), counter-clockwise from +X
+    entity_count: dict  # DXF type -> entities measured
+    preview: list       # preview items (dicts), in drawing order
+    contour_count: int
+    part_count: int
+    parts: list         # per-part metric dicts, see dxf_parser.split_into_parts
+    fingerprint: str    # position- and rotation-independent digest of the parts, see part_fingerprint
+
+    def __init__(self, total_length=0.0, duplicate_length=0.0, common_line_length=0.0, net_area_sqin=0.0,
+                 gross_min_x=0.0, gross_min_y=0.0, gross_max_x=0.0, gross_max_y=0.0, gross_area_sqin=0.0,
+                 oriented_area_sqin=0.0, oriented_width=0.0, oriented_height=0.0, oriented_angle_deg=0.0,
+                 entity_count=None, preview=None, contour_count=0, part_count=0, parts=None,
+                 fingerprint=""):
+        self.total_length = total_length
+        self.duplicate_length = duplicate_length
+        self.common_line_length = common_line_length
+        self.net_area_sqin = net_area_sqin
+        self.gross_min_x = gross_min_x
+        self.gross_min_y = gross_min_y
+        self.gross_max_x = gross_max_x
+        self.gross_max_y = gross_max_y
+        self.gross_area_sqin = gross_area_sqin
+        self.oriented_area_sqin = oriented_area_sqin
+        self.oriented_width = oriented_width
+        self.oriented_height = oriented_height
+        self.oriented_angle_deg = oriented_angle_deg
+        self.entity_count = entity_count if entity_count is not None else {}
+        self.preview = preview if preview is not None else []
+        self.contour_count = contour_count
+        self.part_count = part_count
+        self.parts = parts if parts is not None else []
+        self.fingerprint = fingerprint
+        self._preview_json = None
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def preview_json(self):
+        """The preview as JSON text, serialized on first use."""
+        if self._preview_json is None:
+            self._preview_json = json.dumps(self.preview)
+        return self._preview_json
+
+    def preview_head(self, limit=PREVIEW_LOG_CHARS):
+        """About the first `limit` characters of the preview JSON, serializing only the items needed."""
+        if self._preview_json is not None:
+            return self._preview_json[:limit]
+        pieces, size = [], 1  # "[" and then ", "-separated items, as json.dumps writes them
+        for item in self.preview:
+            if size >= limit:
+                break
+            pieces.append(json.dumps(item))
+            size += len(pieces[-1]) + (2 if len(pieces) > 1 else 0)
+        return ("[" + ", ".join(pieces) + ("]" if len(pieces) == len(self.preview) else ""))[:limit]
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in FIELDS}
+
+    def __repr__(self):
+        return (f"ParseResult(total_length={self.total_length!r}, net_area_sqin={self.net_area_sqin!r}, "
+                f"gross_area_sqin={self.gross_area_sqin!r}, part_count={self.part_count!r}, "
+                f"preview_items={len(self.preview)})")
+
+
+def dump_preview(result):
+    """Preview JSON of a ParseResult (serialized once) or of a plain part / legacy dict."""
+    if isinstance(result, ParseResult):
+        return result.preview_json()
+    return json.dumps(result.get('preview', []))
@@ -0,0 +1,105 @@
+# part_fingerprint.py
+# Geometric fingerprint of a cut part, stable across re-exports.
+# A byte hash of the upload changes when the customer moves the part to a new origin, rotates it or saves
+# the entities in another order, although the plate that gets cut is the same. fingerprint() describes the
+# part by its contours instead. The material face's shell and holes are measured about the part's area
+# centroid, and each contour is reduced to a signature of quantities that do not change when the part moves
+# or turns: its area, its principal radii of gyration, how far its centroid sits from the part centroid and
+# from the shell. When the part has a clear major axis, the contour's offsets along the principal axes are
+# added too. The values are rounded to FINGERPRINT_QUANTUM_IN and the sorted signatures are hashed, so the
+# digest depends neither on where the part sits nor on the order it was drawn in.
+#
+# Area moments are used rather than vertices: a contour's vertices depend on how it was drawn, flattened and
+# snapped, while its moments barely move. Offsets along the principal axes are taken as magnitudes, because
+# an axis has no preferred direction; a nearly round part has no stable axes at all and is described
+# without them. Mirror images get the same fingerprint (a flat plate flipped over is the same cut part).
+#
+# Moves, quarter turns and re-ordered entities give the same digest exactly (contours.build_faces anchors
+# its snapping grid on the geometry for this). A rotation by any other angle re-flattens curves and re-snaps
+# vertices, which can push a value across a rounding step: that costs a cache miss, never a false match.
+
+import hashlib
+import math
+import numpy as np
+import shapely
+
+FINGERPRINT_QUANTUM_IN = 1 / 64  # signature values are rounded to this; drawn inch dimensions land mid-step
+AXIS_ANISOTROPY = 0.05           # relative gap between principal moments below which the axes are not used
+
+
+def ring_moments(coords):
+    """(area, cx, cy, sxx, syy, sxy) of the region a closed ring encloses.
+
+    sxx, syy, sxy are the second moments of area about the region's own centroid (integrals of x^2, y^2
+    and xy). The area is positive whichever way the ring runs.
+    """
+    coords = np.asarray(coords, dtype=float)
+    x0, y0, x1, y1 = coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1]
+    cross = x0 * y1 - x1 * y0
+    area = cross.sum() / 2
+    if area == 0:
+        return 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+    cx = ((x0 + x1) * cross).sum() / (6 * area)
+    cy = ((y0 + y1) * cross).sum() / (6 * area)
+    sxx = ((x0 * x0 + x0 * x1 + x1 * x1) * cross).sum() / 12 - area * cx * cx
+    syy = ((y0 * y0 + y0 * y1 + y1 * y1) * cross).sum() / 12 - area * cy * cy
+    sxy = ((x0 * y1 + 2 * x0 * y0 + 2 * x1 * y1 + x1 * y0) * cross).sum() / 24 - area * cx * cy
+    sign = 1.0 if area > 0 else -1.0
+    return float(abs(area)), float(cx), float(cy), float(sign * sxx), float(sign * syy), float(sign * sxy)
+
+
+def principal_moments(sxx, syy, sxy):
+    """Largest and smallest second moment over all directions (the eigenvalues of the inertia tensor)."""
+    mean, half = (sxx + syy) / 2, math.hypot((sxx - syy) / 2, sxy)
+    return mean + half, mean - half
+
+
+def contour_signatures(polygon, quantum=FINGERPRINT_QUANTUM_IN):
+    """Sorted, quantized signatures of a material face's contours, each led by its kind (0 shell, 1 hole)."""
+    rings = [np.asarray(polygon.exterior.coords)] + [np.asarray(ring.coords) for ring in polygon.interiors]
+    offset = rings[0].mean(axis=0)  # keeps the moment sums well conditioned far from the origin
+    rings = [ring - offset for ring in rings]
+    moments = np.array([ring_moments(ring) for ring in rings])
+    area, cx, cy, sxx, syy, sxy = moments.T
+    signs = np.array([1.0] + [-1.0] * (len(rings) - 1))  # the shell, minus its holes
+    total = (signs * area).sum()
+    if total <= 0:
+        return []
+    dx = cx - (signs * area * cx).sum() / total
+    dy = cy - (signs * area * cy).sum() / total
+    tensor = np.array([[(signs * (sxx + area * dx * dx)).sum(), (signs * (sxy + area * dx * dy)).sum()],
+                       [(signs * (sxy + area * dx * dy)).sum(), (signs * (syy + area * dy * dy)).sum()]])
+    spread, vectors = np.linalg.eigh(tensor)
+    axes = vectors if spread[1] - spread[0] > AXIS_ANISOTROPY * (spread[1] + spread[0]) else None
+    clearance = shapely.distance(shapely.linearrings(rings[0]), shapely.points(np.column_stack([cx, cy])))
+
+    signatures = []
+    for k in range(len(rings)):
+        if area[k] <= 0:
+            continue
+        major, minor = principal_moments(sxx[k], syy[k], sxy[k])
+        values = [math.sqrt(area[k]), math.sqrt(max(major, 0.0) / area[k]), math.sqrt(max(minor, 0.0) / area[k]),
+                  math.hypot(dx[k], dy[k]), float(clearance[k])]
+        if axes is not None:
+            values += np.abs(np.array([dx[k], dy[k]]) @ axes).tolist()
+        signatures.append((min(k, 1),) + tuple(int(round(v / quantum)) for v in values))
+    return sorted(signatures)
+
+
+def fingerprint(polygon, quantum=FINGERPRINT_QUANTUM_IN):
+    """Fingerprint of one part from its material face (shell and holes) as a 32-character hex digest.
+
+    Copies of the part moved, rotated or drawn in another entity order get the same digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(contour_signatures(polygon, quantum)).encode())
+    return digest.hexdigest()
+
+
+def combine(fingerprints):
+    """Fingerprint of a drawing from its parts' fingerprints, independent of where each part sits ("" for none)."""
+    if not fingerprints:
+        return ""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(sorted(fingerprints)).encode())
+    return digest.hexdigest()
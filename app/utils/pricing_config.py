@@ -0,0 +1,309 @@
+# pricing_config.py
+# Shared, change-aware registry for the pricing configuration files (inputs.csv, material_densities.csv,
+# material_process.csv).
+# Each file is parsed once into immutable objects and re-parsed only when its mtime or size changes (one
+# os.stat per lookup), so /calculate and parse_dxf no longer re-read and re-log the CSVs on every request.
+# Every loaded object carries a version stamp (a short content hash); config_version() combines all of them
+# so downstream caches can key on it and drop entries when pricing inputs change.
+#
+# The objects keep the shapes the existing callers read: PricingInputs is a read-only mapping of
+# parameter -> InputParameter, and InputParameter / MaterialDensity also answer ["value"] / ["material"]
+# style lookups.
+#
+# material_catalog() joins material_densities.csv with material_process.csv (material, thickness,
+# cut_speed in/min, pierce_time sec, cleanup_time sec) into a MaterialCatalog indexed by material, so
+# costing gets density and per-thickness process values with dict lookups instead of list scans.
+
+import os
+import csv
+import hashlib
+import logging
+import bisect
+import threading
+from types import MappingProxyType
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+INPUTS_PATH = os.path.join(PROJECT_ROOT, 'inputs.csv')
+PROCESS_PATH = os.path.join(PROJECT_ROOT, 'material_process.csv')
+DENSITY_SEARCH_PATHS = [
+    os.path.join(PROJECT_ROOT, "material_densities.csv"),
+    os.path.join(PROJECT_ROOT, "app", "material_densities.csv"),
+    os.path.join(PROJECT_ROOT, "app", "utils", "material_densities.csv"),
+]
+
+
+class _ItemAccess:
+    """Lets frozen dataclasses answer the dict-style lookups existing callers use (param["value"])."""
+
+    def __getitem__(self, key):
+        if key not in self.keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.keys() else default
+
+    def keys(self):
+        return [f.name for f in fields(self)]
+
+
+@dataclass(frozen=True)
+class InputParameter(_ItemAccess):
+    value: float
+    unit: str
+
+
+@dataclass(frozen=True)
+class MaterialDensity(_ItemAccess):
+    material: str
+    density: float  # lb/in^3
+
+
+class PricingInputs(Mapping):
+    """Read-only parameter -> InputParameter mapping loaded from inputs.csv."""
+
+    def __init__(self, parameters, path=None, version=None):
+        self._parameters = MappingProxyType(dict(parameters))
+        self.path = path
+        self.version = version
+
+    def __getitem__(self, key):
+        return self._parameters[key]
+
+    def __iter__(self):
+        return iter(self._parameters)
+
+    def __len__(self):
+        return len(self._parameters)
+
+    def value(self, key, default=0.0):
+        param = self._parameters.get(key)
+        return param.value if param is not None else default
+
+    def __repr__(self):
+        return f"PricingInputs(version={self.version!r}, parameters={dict(self._parameters)!r})"
+
+
+@dataclass(frozen=True)
+class MaterialProcess(_ItemAccess):
+    material: str
+    thickness: float      # in
+    cut_speed: float      # in/min
+    pierce_time: float    # sec per pierce
+    cleanup_time: float   # sec per part
+
+
+class MaterialDensities(tuple):
+    """Immutable sequence of MaterialDensity rows with the version of the file they came from.
+
+    by_material indexes the rows' densities for O(1) lookups (later duplicates win, as in the CSV scan).
+    """
+
+    def __new__(cls, rows, path=None, version=None):
+        obj = super().__new__(cls, rows)
+        obj.path = path
+        obj.version = version
+        obj.by_material = MappingProxyType({row.material: row.density for row in rows})
+        return obj
+
+
+class MaterialProcesses(tuple):
+    """Immutable sequence of MaterialProcess rows from material_process.csv."""
+
+    def __new__(cls, rows, path=None, version=None):
+        obj = super().__new__(cls, rows)
+        obj.path = path
+        obj.version = version
+        return obj
+
+
+class MaterialCatalog:
+    """Density and per-thickness process values per material, indexed once per config version.
+
+    process() returns the row for the exact thickness, else the nearest thicker row for that material
+    (the same "up to this thickness" bucketing inputs.csv uses), else None so callers can fall back.
+    """
+
+    def __init__(self, densities=None, processes=None):
+        self.densities = MappingProxyType(dict(getattr(densities, 'by_material', {})))
+        by_material = {}
+        for row in processes or ():
+            by_material.setdefault(row.material, {})[row.thickness] = row
+        self._processes = by_material
+        self._thicknesses = {material: sorted(rows) for material, rows in by_material.items()}
+        self.version = f"{getattr(densities, 'version', 'missing')}:{getattr(processes, 'version', 'missing')}"
+
+    def density(self, material):
+        try:
+            return self.densities[material]
+        except KeyError:
+            raise ValueError(f"Material {material} not found in material_densities.csv")
+
+    def process(self, material, thickness):
+        rows = self._processes.get(material)
+        if not rows or thickness is None:
+            return None
+        row = rows.get(thickness)
+        if row is not None:
+            return row
+        thicknesses = self._thicknesses[material]
+        i = bisect.bisect_left(thicknesses, thickness)
+        return rows[thicknesses[i]] if i < len(thicknesses) else None
+
+    def materials(self):
+        return sorted(set(self.densities) | set(self._processes))
+
+
+def _content_version(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def parse_inputs(text, path=None, version=None):
+    """Parse inputs.csv text: parameter,value,unit per line; '#' starts a comment; later duplicates win."""
+    parameters = {}
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        parts = [x.strip() for x in line.split(',')]
+        if len(parts) < 3:
+            logging.warning(f"Skipping invalid line in inputs.csv: {line}")
+            continue
+        key, value, unit = parts[:3]
+        if key == "parameter":
+            continue
+        try:
+            parameters[key] = InputParameter(float(value), unit)
+        except ValueError:
+            logging.warning(f"Invalid value for {key} in inputs.csv: {value}")
+            parameters[key] = InputParameter(0.0, unit)
+    return PricingInputs(parameters, path=path, version=version)
+
+
+def parse_material_densities(text, path=None, version=None):
+    """Parse material_densities.csv text. Returns None when the required columns or rows are missing."""
+    reader = csv.DictReader(text.splitlines())
+    if not reader.fieldnames or not {"material", "density"}.issubset(reader.fieldnames):
+        logging.error(f"material_densities.csv at {path} is missing required columns ['material','density']")
+        return None
+    rows = []
+    for row in reader:
+        try:
+            rows.append(MaterialDensity(row["material"].strip(), float(row["density"])))
+        except (TypeError, ValueError):
+            logging.warning(f"Skipping invalid row in material_densities.csv: {row}")
+    if not rows:
+        logging.error(f"material_densities.csv at {path} is empty!")
+        return None
+    return MaterialDensities(rows, path=path, version=version)
+
+
+def parse_material_processes(text, path=None, version=None):
+    """Parse material_process.csv text. Returns None when the required columns are missing."""
+    required = {"material", "thickness", "cut_speed", "pierce_time", "cleanup_time"}
+    reader = csv.DictReader(text.splitlines())
+    if not reader.fieldnames or not required.issubset(reader.fieldnames):
+        logging.error(f"material_process.csv at {path} is missing required columns {sorted(required)}")
+        return None
+    rows = []
+    for row in reader:
+        try:
+            rows.append(MaterialProcess(row["material"].strip(), float(row["thickness"]), float(row["cut_speed"]),
+                                        float(row["pierce_time"]), float(row["cleanup_time"])))
+        except (TypeError, ValueError):
+            logging.warning(f"Skipping invalid row in material_process.csv: {row}")
+    return MaterialProcesses(rows, path=path, version=version)
+
+
+class ConfigRegistry:
+    """Caches parsed config files by path and re-parses a file only when its (mtime, size) changes."""
+
+    def __init__(self):
+        self._entries = {}  # path -> (stat signature, parsed object)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._catalog = None
+
+    def _load(self, path, parser):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size, self._generation)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                parsed = parser(data.decode('utf-8'), path=path, version=_content_version(data))
+            except Exception as e:
+                logging.error(f"Failed to load {path}: {e}")
+                parsed = None
+            self._entries[path] = (signature, parsed)
+            logging.info(f"Loaded {os.path.basename(path)} from {path} (version {getattr(parsed, 'version', None)})")
+            return parsed
+
+    def inputs(self, path=INPUTS_PATH):
+        """PricingInputs for inputs.csv; an empty PricingInputs when the file is missing or unreadable."""
+        parsed = self._load(path, parse_inputs)
+        if parsed is None:
+            logging.warning(f"Could not load inputs.csv from {path}. Using safe defaults.")
+            return PricingInputs({}, path=path, version="missing")
+        return parsed
+
+    def material_densities(self, file_path=None):
+        """MaterialDensities from file_path or the first existing default location, or None."""
+        search_paths = ([file_path] if file_path else []) + DENSITY_SEARCH_PATHS
+        for path in search_paths:
+            if os.path.exists(path):
+                return self._load(path, parse_material_densities)
+        logging.warning(f"material_densities.csv not found in any expected location: {search_paths}")
+        return None
+
+    def material_processes(self, path=PROCESS_PATH):
+        """MaterialProcesses from material_process.csv, or None when it is missing."""
+        return self._load(path, parse_material_processes)
+
+    def material_catalog(self):
+        """MaterialCatalog over the current density and process files, rebuilt only when either changes."""
+        densities, processes = self.material_densities(), self.material_processes()
+        catalog = self._catalog
+        if catalog is None or catalog[0] is not densities or catalog[1] is not processes:
+            catalog = (densities, processes, MaterialCatalog(densities, processes))
+            self._catalog = catalog
+        return catalog[2]
+
+    def version(self):
+        """Combined version stamp of inputs.csv, material_densities.csv and material_process.csv."""
+        return f"{self.inputs().version}:{self.material_catalog().version}"
+
+    def invalidate(self):
+        """Force every file to be re-parsed on its next lookup (e.g. after an in-place edit within mtime granularity)."""
+        with self._lock:
+            self._generation += 1
+
+
+registry = ConfigRegistry()
+
+
+def get_inputs():
+    return registry.inputs()
+
+
+def get_material_densities(file_path=None):
+    return registry.material_densities(file_path)
+
+
+def get_material_catalog():
+    return registry.material_catalog()
+
+
+def config_version():
+    return registry.version()
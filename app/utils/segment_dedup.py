@@ -0,0 +1,174 @@
+# segment_dedup.py
+# Duplicate and overlapping cut-path elimination for dxf_parser.
+# CAD exports often stack identical lines, draw an outline twice (e.g. a polyline plus a HATCH boundary on
+# top of it), or break one edge into overlapping pieces. The torch cuts each stretch of path once, so the
+# overlap is removed from total_length before it reaches costing:
+#   1. exact duplicates: a spatial hash on the segment's endpoints snapped to DEDUP_TOLERANCE_IN (endpoint
+#      order normalized), so A->B and B->A collide
+#   2. collinear overlaps: the remaining segments are grouped by their carrier line (direction angle and
+#      offset from the origin, both snapped) and a sweep over each group's intervals, sorted along the line,
+#      keeps only the union
+# Arcs and circles get the same treatment on (center, radius) groups with a circular sweep over their angle
+# intervals. Everything is hashing plus one sort, so tens of thousands of segments stay near-linear.
+
+import math
+import numpy as np
+
+DEDUP_TOLERANCE_IN = 0.001  # endpoints / offsets closer than this are the same cut
+ANGLE_BINS = 2_000_000      # direction angle resolution over [0, pi): ~1.6e-6 rad
+
+
+def _snap(values, tolerance):
+    return np.round(np.asarray(values, dtype=float) / tolerance).astype(np.int64)
+
+
+def _union_length(starts, ends):
+    """Total length covered by the intervals [starts[i], ends[i]] (any order)."""
+    order = np.argsort(starts, kind='stable')
+    covered, run_start, run_end = 0.0, None, None
+    for s, e in zip(starts[order].tolist(), ends[order].tolist()):
+        if run_end is None or s > run_end:
+            if run_end is not None:
+                covered += run_end - run_start
+            run_start, run_end = s, e
+        elif e > run_end:
+            run_end = e
+    if run_end is not None:
+        covered += run_end - run_start
+    return covered
+
+
+def _grouped_union(keys, starts, ends):
+    """Sum over groups (rows of keys) of the union length of each group's intervals."""
+    if not len(keys):
+        return 0.0
+    order = np.lexsort(keys.T[::-1])
+    keys, starts, ends = keys[order], starts[order], ends[order]
+    breaks = np.flatnonzero(np.any(keys[1:] != keys[:-1], axis=1)) + 1
+    bounds = np.concatenate([[0], breaks, [len(keys)]])
+    total = 0.0
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        if hi - lo == 1:
+            total += float(ends[lo] - starts[lo])
+        else:
+            total += _union_length(starts[lo:hi], ends[lo:hi])
+    return total
+
+
+def dedupe_lines(lines, tolerance=DEDUP_TOLERANCE_IN):
+    """Duplicate and overlapping length among straight segments (sx, sy, ex, ey, ...).
+
+    Returns (removed_length, duplicate_count, overlap_length) where removed_length includes both exact
+    duplicates and collinear overlaps.
+    """
+    if not lines:
+        return 0.0, 0, 0.0
+    seg = np.asarray([line[:4] for line in lines], dtype=float).reshape(-1, 4)
+    lengths = np.hypot(seg[:, 2] - seg[:, 0], seg[:, 3] - seg[:, 1])
+    seg, lengths = seg[lengths > tolerance], lengths[lengths > tolerance]
+    if not len(seg):
+        return 0.0, 0, 0.0
+
+    # 1. Spatial hash on snapped, order-normalized endpoints
+    a, b = _snap(seg[:, :2], tolerance), _snap(seg[:, 2:], tolerance)
+    swap = (a[:, 0] > b[:, 0]) | ((a[:, 0] == b[:, 0]) & (a[:, 1] > b[:, 1]))
+    a[swap], b[swap] = b[swap], a[swap].copy()
+    _, first = np.unique(np.hstack([a, b]), axis=0, return_index=True)
+    duplicate_count = len(seg) - len(first)
+    duplicate_length = float(lengths.sum() - lengths[first].sum()) if duplicate_count else 0.0
+    seg, lengths = seg[first], lengths[first]
+
+    # 2. Carrier line (direction bin, snapped offset) and a sweep over the projections onto it
+    theta = np.mod(np.arctan2(seg[:, 3] - seg[:, 1], seg[:, 2] - seg[:, 0]), math.pi)
+    theta_bin = np.mod(np.round(theta / math.pi * ANGLE_BINS).astype(np.int64), ANGLE_BINS)
+    theta = theta_bin * (math.pi / ANGLE_BINS)
+    ux, uy = np.cos(theta), np.sin(theta)
+    offset_bin = _snap(-uy * seg[:, 0] + ux * seg[:, 1], tolerance)
+    t0, t1 = ux * seg[:, 0] + uy * seg[:, 1], ux * seg[:, 2] + uy * seg[:, 3]
+    covered = _grouped_union(np.column_stack([theta_bin, offset_bin]), np.minimum(t0, t1), np.maximum(t0, t1))
+    overlap_length = max(float(np.abs(t1 - t0).sum()) - covered, 0.0)
+    return duplicate_length + overlap_length, duplicate_count, overlap_length
+
+
+def dedupe_arcs(arcs, tolerance=DEDUP_TOLERANCE_IN):
+    """Duplicate and overlapping length among arcs (cx, cy, radius, start_deg, end_deg, ...).
+
+    A full circle is an arc spanning 360 degrees. Returns the removed length.
+    """
+    if not arcs:
+        return 0.0
+    arr = np.asarray([arc[:5] for arc in arcs], dtype=float).reshape(-1, 5)
+    arr = arr[arr[:, 2] > tolerance]
+    if not len(arr):
+        return 0.0
+    span = np.clip(arr[:, 4] - arr[:, 3], 0.0, 360.0)
+    start = np.mod(arr[:, 3], 360.0)
+    keys = _snap(arr[:, :3], tolerance)
+    # Split intervals that wrap past 360 so the sweep stays linear
+    wraps = start + span > 360.0
+    keys = np.vstack([keys, keys[wraps]])
+    starts = np.concatenate([start, np.zeros(int(wraps.sum()))])
+    ends = np.concatenate([np.minimum(start + span, 360.0), start[wraps] + span[wraps] - 360.0])
+    radius = np.concatenate([arr[:, 2], arr[wraps, 2]])
+    # Scale degrees to arc length per group so one union pass measures inches
+    scale = radius * math.pi / 180.0
+    covered = _grouped_union(keys, starts * scale, ends * scale)
+    return max(float((span * arr[:, 2] * math.pi / 180.0).sum()) - covered, 0.0)
+
+
+def dedupe(lines, arcs, tolerance=DEDUP_TOLERANCE_IN):
+    """Summary of the cut length that is drawn more than once.
+
+    Returns {"removed_length", "duplicate_segments", "overlap_length", "arc_removed_length"} with lengths in
+    the units of the inputs (inches in dxf_parser).
+    """
+    line_removed, duplicate_segments, overlap_length = dedupe_lines(lines, tolerance)
+    arc_removed = dedupe_arcs(arcs, tolerance)
+    return {
+        "removed_length": line_removed + arc_removed,
+        "duplicate_segments": duplicate_segments,
+        "overlap_length": overlap_length,
+        "arc_removed_length": arc_removed,
+    }
+
+
+def polyline_segments(points, closed=False, bulges=None):
+    """Straight (sx, sy, ex, ey, length) segments of a placed polyline; bulged (arc) segments are left out."""
+    path = list(points) + ([points[0]] if closed and len(points) > 2 else [])
+    segments = []
+    for i in range(len(path) - 1):
+        if bulges is not None and bulges[i % len(bulges)]:
+            continue
+        (sx, sy), (ex, ey) = path[i][:2], path[i + 1][:2]
+        segments.append((sx, sy, ex, ey, math.hypot(ex - sx, ey - sy)))
+    return segments
+
+
+def polyline_arcs(points, closed=False, bulges=None, mirrored=False):
+    """Bulged segments of a placed polyline as (cx, cy, radius, start_deg, end_deg, length) arcs.
+
+    Counter-clockwise from start to end, as dedupe_arcs() expects; length is the exact arc length.
+    mirrored: the placing matrix reflects, which turns each bulge the other way.
+    """
+    if bulges is None:
+        return []
+    path = list(points) + ([points[0]] if closed and len(points) > 2 else [])
+    arcs = []
+    for i in range(len(path) - 1):
+        bulge = -bulges[i % len(bulges)] if mirrored else bulges[i % len(bulges)]
+        (sx, sy), (ex, ey) = path[i][:2], path[i + 1][:2]
+        chord = math.hypot(ex - sx, ey - sy)
+        if not bulge or chord == 0:
+            continue
+        # The center sits on the chord's left normal for a positive (counter-clockwise) bulge
+        offset = (1 - bulge * bulge) / (4 * bulge)
+        cx, cy = (sx + ex) / 2 - (ey - sy) * offset, (sy + ey) / 2 + (ex - sx) * offset
+        included = 4 * math.atan(abs(bulge))
+        radius = chord / (2 * math.sin(included / 2))
+        start = math.degrees(math.atan2(sy - cy, sx - cx))
+        end = math.degrees(math.atan2(ey - cy, ex - cx))
+        if bulge < 0:
+            start, end = end, start
+        end = start + (end - start) % 360.0
+        arcs.append((cx, cy, radius, start, end, radius * included))
+    return arcs
@@ -0,0 +1,187 @@
+# shadow_parser.py
+# Shadow-mode comparison of a candidate parser engine against dxf_parser.parse_dxf on live uploads.
+# The primary parse keeps serving the response; for a sampled fraction of uploads the candidate engine
+# re-parses a private copy of the file on a background thread, and the metric differences and latencies
+# are written to a MongoDB collection (parser_shadow). scripts/shadow_parser_report.py summarizes them.
+#
+# Configured through app.config (from the environment in create_app):
+#   SHADOW_PARSER       "package.module:function" with parse_dxf's signature; empty disables shadowing
+#   SHADOW_SAMPLE_RATE  fraction of uploads to shadow, 0.0 - 1.0
+
+import os
+import time
+import random
+import shutil
+import logging
+import tempfile
+import importlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+COMPARED_METRICS = ["total_length", "net_area_sqin", "gross_area_sqin", "gross_min_x", "gross_min_y",
+                    "gross_max_x", "gross_max_y"]
+MAX_PENDING = 4  # shadow jobs queued or running; extra samples are dropped rather than queued
+# Worst per-upload relative metric difference, bucketed for the report
+DIVERGENCE_BUCKETS = [("exact", 0.0), ("<=1e-6", 1e-6), ("<=1e-3", 1e-3), ("<=1e-2", 1e-2), ("<=1e-1", 1e-1)]
+OVERFLOW_BUCKET = ">1e-1"
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(MAX_PENDING)
+_engines = {}
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow-parser')
+        return _executor
+
+
+def load_engine(spec):
+    """Resolve "module:function" to a callable, caching the import."""
+    if spec not in _engines:
+        module_name, _, func_name = spec.partition(':')
+        if not module_name or not func_name:
+            raise ValueError(f"SHADOW_PARSER must look like 'package.module:function', got {spec!r}")
+        _engines[spec] = getattr(importlib.import_module(module_name), func_name)
+    return _engines[spec]
+
+
+def relative_difference(primary, candidate):
+    primary, candidate = float(primary or 0), float(candidate or 0)
+    if primary == candidate:
+        return 0.0
+    scale = max(abs(primary), abs(candidate))
+    return abs(primary - candidate) / scale if scale else 0.0
+
+
+def compare_results(primary, candidate):
+    """Per-metric differences between two parse results plus the worst relative difference."""
+    diffs = {}
+    for key in COMPARED_METRICS:
+        p, c = primary.get(key, 0), candidate.get(key, 0)
+        diffs[key] = {"primary": p, "candidate": c, "rel_diff": relative_difference(p, c)}
+    p_counts, c_counts = primary.get("entity_count", {}) or {}, candidate.get("entity_count", {}) or {}
+    count_diffs = {etype: {"primary": p_counts.get(etype, 0), "candidate": c_counts.get(etype, 0)}
+                   for etype in set(p_counts) | set(c_counts) if p_counts.get(etype, 0) != c_counts.get(etype, 0)}
+    return {
+        "metrics": diffs,
+        "entity_count_diffs": count_diffs,
+        "max_rel_diff": max((d["rel_diff"] for d in diffs.values()), default=0.0),
+    }
+
+
+def should_shadow(sample_rate, rng=random.random):
+    return sample_rate > 0 and rng() < sample_rate
+
+
+def _run_shadow(engine_spec, shadow_path, primary, primary_seconds, part_number, collection, parse_kwargs):
+    record = {
+        "created_at": datetime.utcnow(),
+        "part_number": part_number,
+        "engine": engine_spec,
+        "primary_ms": round(primary_seconds * 1000, 3),
+    }
+    try:
+        engine = load_engine(engine_spec)
+        start = time.perf_counter()
+        candidate = engine(shadow_path, **parse_kwargs)
+        candidate_seconds = time.perf_counter() - start
+        record["candidate_ms"] = round(candidate_seconds * 1000, 3)
+        record["speedup"] = round(primary_seconds / candidate_seconds, 3) if candidate_seconds > 0 else None
+        record.update(compare_results(primary, dict(candidate)))
+    except Exception as e:
+        logging.error(f"Shadow parser {engine_spec} failed on {part_number}: {e}", exc_info=True)
+        record["candidate_error"] = str(e)
+    try:
+        collection.insert_one(record)
+    except Exception as e:
+        logging.error(f"Failed to record shadow parse for {part_number}: {e}")
+    return record
+
+
+def submit_shadow_parse(file_path, primary, primary_seconds, collection, engine_spec, sample_rate,
+                        part_number=None, **parse_kwargs):
+    """Maybe queue a candidate-engine parse of file_path; never raises into the request.
+
+    The file is copied first because uploads are saved under their (secure) filename and the next upload
+    with the same name would overwrite it before the background job reads it. Returns the Future, or None
+    when the upload was not sampled or the shadow queue is full.
+    """
+    if not engine_spec or not should_shadow(sample_rate):
+        return None
+    if not _pending.acquire(blocking=False):
+        logging.info(f"Shadow parser queue full; skipping {part_number or file_path}")
+        return None
+    try:
+        fd, shadow_path = tempfile.mkstemp(suffix='.dxf', prefix='shadow_')
+        os.close(fd)
+        shutil.copyfile(file_path, shadow_path)
+    except Exception as e:
+        _pending.release()
+        logging.error(f"Could not copy {file_path} for shadow parsing: {e}")
+        return None
+
+    def job():
+        try:
+            return _run_shadow(engine_spec, shadow_path, primary, primary_seconds,
+                               part_number or os.path.basename(file_path), collection, parse_kwargs)
+        finally:
+            _pending.release()
+            try:
+                os.remove(shadow_path)
+            except OSError:
+                pass
+
+    try:
+        return _get_executor().submit(job)
+    except Exception as e:
+        _pending.release()
+        logging.error(f"Could not submit shadow parse for {file_path}: {e}")
+        return None
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_shadow_records(records):
+    """Speedup and divergence distribution over parser_shadow records."""
+    records = list(records)
+    completed = [r for r in records if "candidate_error" not in r and r.get("candidate_ms") is not None]
+    speedups = [r["speedup"] for r in completed if r.get("speedup")]
+    divergences = [r.get("max_rel_diff", 0.0) for r in completed]
+
+    buckets = {label: 0 for label, _ in DIVERGENCE_BUCKETS}
+    buckets[OVERFLOW_BUCKET] = 0
+    for divergence in divergences:
+        label = next((label for label, bound in DIVERGENCE_BUCKETS if divergence <= bound), OVERFLOW_BUCKET)
+        buckets[label] += 1
+
+    per_metric = {}
+    for key in COMPARED_METRICS:
+        values = [r["metrics"][key]["rel_diff"] for r in completed if key in r.get("metrics", {})]
+        if values:
+            per_metric[key] = {"p50": _percentile(values, 50), "p95": _percentile(values, 95), "max": max(values)}
+
+    return {
+        "records": len(records),
+        "completed": len(completed),
+        "candidate_errors": len(records) - len(completed),
+        "speedup_p50": _percentile(speedups, 50),
+        "speedup_p95": _percentile(speedups, 95),
+        "primary_ms_p50": _percentile([r["primary_ms"] for r in completed], 50),
+        "candidate_ms_p50": _percentile([r["candidate_ms"] for r in completed], 50),
+        "divergence_buckets": buckets,
+        "per_metric_rel_diff": per_metric,
+        "entity_count_mismatches": sum(1 for r in completed if r.get("entity_count_diffs")),
+    }
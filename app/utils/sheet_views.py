@@ -0,0 +1,254 @@
+# sheet_views.py
+# Drawing-sheet view isolation for dxf_parser.
+# Drawing exports (Inventor IDW sheets, AutoCAD layouts saved to model space) put a border, a title block and
+# often several projected views of the same part on cut-eligible layers such as "0", which multiplies the
+# cut length and the bounding box. isolate_view() decides which model-space entities belong to the part
+# before anything is measured:
+#   1. frames: axis-aligned rectangles (closed 4-corner polylines, four LINEs meeting corner to corner, or a
+#      border block INSERT) that enclose nearly all other geometry and annotation (TEXT, MTEXT, DIMENSION)
+#   2. views: the bounding boxes of the geometry (annotation left out) inside the innermost frame are
+#      rasterized onto a coarse grid density map, dilated by one cell, and its connected components are the
+#      views and the title block
+#   3. primary view: clusters against the frame holding annotation or a frame-shaped box are title blocks; of
+#      the rest, a view carrying bend lines is the flat pattern, otherwise the view with the largest
+#      cut-geometry extent wins
+# A sheet must also look like one (a border block carrying annotation, or a standard sheet size with a
+# title block against the frame), and a cut-layer rectangle around a single view is never a border, so a
+# rectangular plate with holes and an engraved label is measured whole. Files without annotation or a
+# frame-shaped rectangle are rejected by cheap checks before any bounding box is computed.
+
+import math
+from collections import defaultdict
+import numpy as np
+from scipy import ndimage
+from ezdxf import bbox
+
+GRID_CELLS = 128                 # density map resolution along the frame's longer side
+FRAME_ENCLOSE_FRACTION = 0.95    # share of the other geometry a frame must enclose
+FRAME_MIN_SIDE_FRACTION = 0.25   # frame sides are among the longest lines in the drawing
+SHEET_SIZE_MIN_FRACTION = 0.85   # a border inside the sheet margins still matches the sheet size
+MAX_FRAME_ROWS = 32              # horizontal lines per x-span tried as rectangle top/bottom pairs
+
+ANNOTATION_TYPES = {"TEXT", "MTEXT", "DIMENSION", "ARC_DIMENSION", "LARGE_RADIAL_DIMENSION", "LEADER",
+                    "MULTILEADER", "TOLERANCE", "ATTRIB", "ATTDEF"}
+GEOMETRY_TYPES = {"LINE", "ARC", "CIRCLE", "LWPOLYLINE", "POLYLINE", "SPLINE", "ELLIPSE", "HATCH", "3DFACE",
+                  "SOLID", "INSERT"}
+
+# Sheet sizes in inches (long side, short side): ANSI A-E, ARCH A-E, ISO A4-A0
+SHEET_SIZES_IN = [(11.0, 8.5), (17.0, 11.0), (22.0, 17.0), (34.0, 22.0), (44.0, 34.0),
+                  (12.0, 9.0), (18.0, 12.0), (24.0, 18.0), (36.0, 24.0), (48.0, 36.0),
+                  (11.69, 8.27), (16.54, 11.69), (23.39, 16.54), (33.11, 23.39), (46.81, 33.11)]
+
+
+def is_sheet_size(width_in, height_in):
+    """True when a width x height rectangle (inches) is a standard sheet or the border drawn inside one."""
+    long_side, short_side = max(width_in, height_in), min(width_in, height_in)
+    return any(SHEET_SIZE_MIN_FRACTION * w <= long_side <= 1.01 * w and SHEET_SIZE_MIN_FRACTION * h <= short_side <= 1.01 * h
+               for w, h in SHEET_SIZES_IN)
+
+
+def _key(value):
+    return round(float(value), 6)
+
+
+def _polyline_rectangle(entity):
+    """(min_x, min_y, max_x, max_y) of a closed polyline drawn as an axis-aligned rectangle, else None."""
+    try:
+        if entity.dxftype() == "LWPOLYLINE":
+            points = [(_key(x), _key(y)) for x, y in entity.get_points('xy')]
+            closed = entity.closed
+        else:
+            points = [(_key(v.dxf.location[0]), _key(v.dxf.location[1])) for v in entity.vertices]
+            closed = entity.is_closed
+    except Exception:
+        return None
+    if len(points) == 5 and points[0] == points[-1]:
+        points, closed = points[:4], True
+    if not closed or len(points) != 4 or len(set(points)) != 4:
+        return None
+    xs, ys = sorted({p[0] for p in points}), sorted({p[1] for p in points})
+    if len(xs) != 2 or len(ys) != 2:
+        return None
+    # Consecutive corners must share an x or a y (no bow-tie)
+    if any(a[0] != b[0] and a[1] != b[1] for a, b in zip(points, points[1:] + points[:1])):
+        return None
+    return xs[0], ys[0], xs[1], ys[1]
+
+
+def _line_rectangles(lines):
+    """Axis-aligned rectangles formed by four LINEs meeting corner to corner.
+
+    lines are (entity, sx, sy, ex, ey); only lines at least FRAME_MIN_SIDE_FRACTION as long as the longest
+    line in their direction are tried. Returns [((min_x, min_y, max_x, max_y), [entities])].
+    """
+    horizontal, vertical = [], []
+    for entity, sx, sy, ex, ey in lines:
+        if _key(sy) == _key(ey) and _key(sx) != _key(ex):
+            horizontal.append((entity, _key(min(sx, ex)), _key(max(sx, ex)), _key(sy)))
+        elif _key(sx) == _key(ex) and _key(sy) != _key(ey):
+            vertical.append((entity, _key(sx), _key(min(sy, ey)), _key(max(sy, ey))))
+    if len(horizontal) < 2 or len(vertical) < 2:
+        return []
+    min_width = FRAME_MIN_SIDE_FRACTION * max(x1 - x0 for _, x0, x1, _ in horizontal)
+    min_height = FRAME_MIN_SIDE_FRACTION * max(y1 - y0 for _, _, y0, y1 in vertical)
+    rows = defaultdict(list)
+    for entity, x0, x1, y in horizontal:
+        if x1 - x0 >= min_width:
+            rows[(x0, x1)].append((y, entity))
+    sides = {(x, y0, y1): entity for entity, x, y0, y1 in vertical if y1 - y0 >= min_height}
+    rectangles = []
+    for (x0, x1), ys in rows.items():
+        ys = sorted(ys, key=lambda row: row[0])[:MAX_FRAME_ROWS]
+        for i, (y0, bottom) in enumerate(ys):
+            for y1, top in ys[i + 1:]:
+                left, right = sides.get((x0, y0, y1)), sides.get((x1, y0, y1))
+                if left is not None and right is not None:
+                    rectangles.append(((x0, y0, x1, y1), [bottom, top, left, right]))
+    return rectangles
+
+
+def _has_annotation_block(insert):
+    """INSERT of a title block or border block: attributes, or text in the block definition."""
+    if insert.attribs:
+        return True
+    block = insert.doc.blocks.get(insert.dxf.name) if insert.doc else None
+    return block is not None and any(e.dxftype() in ANNOTATION_TYPES for e in block)
+
+
+def frame_candidates(entities):
+    """Rectangles that could be a sheet border: [((min_x, min_y, max_x, max_y), [entities])].
+
+    Block INSERTs carrying annotation are candidates with their bounding box as the rectangle.
+    """
+    candidates, lines = [], []
+    for entity in entities:
+        kind = entity.dxftype()
+        if kind == "LINE":
+            lines.append((entity, entity.dxf.start[0], entity.dxf.start[1], entity.dxf.end[0], entity.dxf.end[1]))
+        elif kind in ("LWPOLYLINE", "POLYLINE"):
+            rect = _polyline_rectangle(entity)
+            if rect is not None:
+                candidates.append((rect, [entity]))
+        elif kind == "INSERT" and _has_annotation_block(entity):
+            extents = bbox.extents([entity], fast=True)
+            if extents.has_data:
+                candidates.append(((extents.extmin.x, extents.extmin.y, extents.extmax.x, extents.extmax.y), [entity]))
+    return candidates + _line_rectangles(lines)
+
+
+def _inside(rect, x, y):
+    return rect[0] <= x <= rect[2] and rect[1] <= y <= rect[3]
+
+
+def _label_views(boxes, rect):
+    """Connected components of the grid density map of boxes (n, 4) inside rect; one label per box (0 = none)."""
+    width, height = rect[2] - rect[0], rect[3] - rect[1]
+    cell = max(width, height) / GRID_CELLS
+    nx, ny = max(int(math.ceil(width / cell)), 1), max(int(math.ceil(height / cell)), 1)
+    lo = np.floor((boxes[:, :2] - rect[:2]) / cell).astype(int)
+    hi = np.floor((boxes[:, 2:] - rect[:2]) / cell).astype(int)
+    ix0, ix1 = np.clip(lo[:, 0], 0, nx - 1), np.clip(hi[:, 0], 0, nx - 1)
+    iy0, iy1 = np.clip(lo[:, 1], 0, ny - 1), np.clip(hi[:, 1], 0, ny - 1)
+    # Box coverage counts via a 2D difference array: four corner updates per box, then two prefix sums
+    density = np.zeros((ny + 1, nx + 1), dtype=np.int64)
+    np.add.at(density, (iy0, ix0), 1)
+    np.add.at(density, (iy0, ix1 + 1), -1)
+    np.add.at(density, (iy1 + 1, ix0), -1)
+    np.add.at(density, (iy1 + 1, ix1 + 1), 1)
+    density = density.cumsum(axis=0).cumsum(axis=1)[:ny, :nx]
+    labels, count = ndimage.label(ndimage.binary_dilation(density > 0))
+    centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+    cx = np.clip(np.floor((centers[:, 0] - rect[0]) / cell).astype(int), 0, nx - 1)
+    cy = np.clip(np.floor((centers[:, 1] - rect[1]) / cell).astype(int), 0, ny - 1)
+    return labels[cy, cx], count, cell
+
+
+def isolate_view(msp, cut_layers, unit_scale=1.0):
+    """Model-space entities outside the primary view of a drawing sheet.
+
+    Returns None when msp does not look like a drawing sheet, else {"skip": set of entity handles,
+    "frames": frame count, "views": view count (title blocks excluded), "primary_bounds": (min_x, min_y,
+    max_x, max_y) in drawing units}.
+    """
+    entities = [e for e in msp if e.dxftype() in GEOMETRY_TYPES or e.dxftype() in ANNOTATION_TYPES]
+    if not any(e.dxftype() in ANNOTATION_TYPES or (e.dxftype() == "INSERT" and e.attribs) for e in entities):
+        return None
+    candidates = frame_candidates(entities)
+    if not candidates:
+        return None
+
+    boxes = np.full((len(entities), 4), np.nan)
+    for i, extents in enumerate(bbox.multi_flat(entities, fast=True)):
+        if extents.has_data:
+            boxes[i] = (extents.extmin.x, extents.extmin.y, extents.extmax.x, extents.extmax.y)
+    has_box = ~np.isnan(boxes[:, 0])
+    centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+    candidate_members = {id(e) for _, members in candidates for e in members}
+    annotation = np.array([e.dxftype() in ANNOTATION_TYPES for e in entities])
+    geometry = has_box & ~annotation & np.array([id(e) not in candidate_members for e in entities])
+    if not geometry.any():
+        return None
+
+    frames = []
+    for rect, members in candidates:
+        inside = (centers[:, 0] >= rect[0]) & (centers[:, 0] <= rect[2]) & (centers[:, 1] >= rect[1]) & (centers[:, 1] <= rect[3])
+        if (inside & geometry).sum() >= FRAME_ENCLOSE_FRACTION * geometry.sum() and (inside & annotation & has_box).any():
+            frames.append((rect, members))
+    if not frames:
+        return None
+    rect, frame_members = min(frames, key=lambda frame: (frame[0][2] - frame[0][0]) * (frame[0][3] - frame[0][1]))
+    frame_ids = {id(e) for _, members in frames for e in members}
+    rect = np.asarray(rect, dtype=float)
+
+    # Geometry that is not a frame (a frame-shaped rectangle inside one, e.g. a title block box, stays);
+    # annotation is never measured and a long label or dimension would bridge two views
+    members = np.flatnonzero(has_box & ~annotation & np.array([id(e) not in frame_ids for e in entities]))
+    labels, _, cell = _label_views(boxes[members], rect)
+    cut = {layer.lower().strip() for layer in cut_layers}
+    views = {}
+    for i, label in zip(members.tolist(), labels.tolist()):
+        if label and _inside(rect, *centers[i]):
+            views.setdefault(label, []).append(i)
+
+    notes = centers[annotation & has_box]
+    primary, best = None, None
+    view_count = 0
+    for label, view in views.items():
+        extent = boxes[view]
+        lo, hi = extent[:, :2].min(axis=0), extent[:, 2:].max(axis=0)
+        # Title blocks and revision tables sit against the frame and hold text or boxes of their own; a hole
+        # drilled near a plate's edge does not
+        against_frame = (lo[0] - rect[0] <= cell or lo[1] - rect[1] <= cell or rect[2] - hi[0] <= cell or
+                         rect[3] - hi[1] <= cell)
+        boxed = any(id(entities[i]) in candidate_members for i in view)
+        noted = bool(np.all((notes >= lo - cell) & (notes <= hi + cell), axis=1).any())
+        if against_frame and (boxed or noted):
+            continue
+        view_count += 1
+        layers = [entities[i].dxf.layer.lower().strip() for i in view]
+        cut_view = [i for i, layer in zip(view, layers) if layer in cut]
+        if not cut_view:
+            continue
+        cut_lo, cut_hi = boxes[cut_view, :2].min(axis=0), boxes[cut_view, 2:].max(axis=0)
+        score = (any('bend' in layer for layer in layers), float(np.prod(cut_hi - cut_lo)))
+        if best is None or score > best:
+            primary, best = label, score
+
+    # A border block with attributes or text is a sheet on its own; a plain rectangle must be sheet-sized
+    # and have a title block against it. A frame drawn on a cut layer around a single view is the outline of
+    # a plate at a sheet size, not a border
+    border_block = any(e.dxftype() == "INSERT" for _, members in frames for e in members)
+    sheet_size = is_sheet_size((rect[2] - rect[0]) * abs(unit_scale), (rect[3] - rect[1]) * abs(unit_scale))
+    title_block = view_count < len(views)
+    cut_outline = all(e.dxftype() != "INSERT" and e.dxf.layer.lower().strip() in cut for e in frame_members)
+    if primary is None or not (border_block or (sheet_size and title_block)) or (cut_outline and view_count < 2):
+        return None
+    keep = set(views[primary])
+    skip = {entities[i].dxf.handle for i in range(len(entities)) if i not in keep}
+    view_boxes = boxes[views[primary]]
+    return {
+        "skip": skip,
+        "frames": len(frames),
+        "views": view_count,
+        "primary_bounds": tuple(view_boxes[:, :2].min(axis=0).tolist() + view_boxes[:, 2:].max(axis=0).tolist()),
+    }
@@ -0,0 +1,531 @@
+# benchmark_dxf_parser.py
+# Repeatable performance benchmark for dxf_parser.parse_dxf over a DXF corpus (default: tests/test_files).
+# Reports median/p95 wall time, peak traced memory and entities/sec per file, stores results as JSON and
+# compares them against a saved baseline with configurable regression thresholds.
+#
+# Usage:
+#   python scripts/benchmark_dxf_parser.py --output bench.json
+#   python scripts/benchmark_dxf_parser.py --save-baseline scripts/benchmark_baseline.json
+#   python scripts/benchmark_dxf_parser.py --baseline scripts/benchmark_baseline.json --time-threshold 0.25
+#   python scripts/benchmark_dxf_parser.py --scaling perforated --sizes 100 200 400 800 --plot scaling.png
+#   python scripts/benchmark_dxf_parser.py --memory --output memory.json
+#   python scripts/benchmark_dxf_parser.py huge.dxf --workers 4
+#   python scripts/benchmark_dxf_parser.py --handlers
+# Exit code is 1 when any file regresses past the thresholds (or a scaling series is super-linear), so the
+# script can gate CI.
+
+import gc
+import os
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+from datetime import datetime
+from collections.abc import Mapping
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_CORPUS = os.path.join(PROJECT_ROOT, 'tests', 'test_files')
+# Import the parser module directly (as tests/test_dxf_parse_batch.py does) so the benchmark does not
+# pull in app/__init__.py, which connects to MongoDB and Firebase at import time. Appended rather than
+# prepended: app/utils/email.py would otherwise shadow the standard library email package.
+sys.path.append(os.path.join(PROJECT_ROOT, 'app', 'utils'))
+import dxf_parser
+import dxf_preflight
+import curve_geometry
+import entity_handlers
+import parse_result
+sys.path.insert(0, SCRIPT_DIR)
+import generate_synthetic_dxf
+
+DEFAULT_REPEATS = 5
+DEFAULT_WARMUP = 1
+DEFAULT_TIME_THRESHOLD = 0.20    # fail if median time grows by more than 20%
+DEFAULT_MEMORY_THRESHOLD = 0.20  # fail if peak memory grows by more than 20%
+DEFAULT_MIN_TIME_MS = 2.0        # ignore time regressions on files faster than this (timer noise)
+DEFAULT_SCALING_SIZES = [100, 200, 400, 800]  # within parse_dxf's max_entities, so every point is fitted
+DEFAULT_SLOPE_THRESHOLD = 1.15   # log-log slope of time vs. entity count above this is super-linear
+DEFAULT_TOP_SITES = 10
+MEMORY_PHASES = ["readfile", "parse", "preview_json", "mongo_encode"]
+
+
+def discover_dxf_files(paths):
+    """Expand files and directories into a sorted list of .dxf paths."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for fname in sorted(os.listdir(path)):
+                if fname.lower().endswith('.dxf'):
+                    found.append(os.path.join(path, fname))
+        elif os.path.isfile(path) and path.lower().endswith('.dxf'):
+            found.append(path)
+        else:
+            logging.warning(f"Skipping non-DXF path: {path}")
+    return found
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (pct in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def benchmark_file(file_path, repeats=DEFAULT_REPEATS, warmup=DEFAULT_WARMUP, material="A36 Steel", thickness=0.25,
+                   cold_caches=False, workers=None):
+    """Time parse_dxf on one file and measure its peak traced memory.
+
+    Timed runs are done without tracemalloc (which slows allocation-heavy code several times over);
+    peak memory comes from one extra traced run. cold_caches empties the process-wide SPLINE cache
+    before every timed run so the timings show a first-seen upload rather than a repeat.
+    workers is passed to parse_dxf (None or 1: serial measurement).
+    """
+    for _ in range(warmup):
+        dxf_parser.parse_dxf(file_path, material=material, thickness=thickness, workers=workers)
+
+    times = []
+    result = None
+    for _ in range(max(1, repeats)):
+        if cold_caches:
+            curve_geometry.clear_spline_cache()
+        start = time.perf_counter()
+        result = dxf_parser.parse_dxf(file_path, material=material, thickness=thickness, workers=workers)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        dxf_parser.parse_dxf(file_path, material=material, thickness=thickness, workers=workers)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    entity_count = result.get('entity_count', {}) if isinstance(result, Mapping) else {}
+    entities = sum(v for v in entity_count.values() if isinstance(v, (int, float)))
+    median_s = statistics.median(times)
+    return {
+        "file": os.path.basename(file_path),
+        "size_bytes": os.path.getsize(file_path),
+        "repeats": len(times),
+        "times_ms": [round(t * 1000, 3) for t in times],
+        "median_ms": round(median_s * 1000, 3),
+        "p95_ms": round(percentile(times, 95) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "peak_memory_kb": round(peak_bytes / 1024, 1),
+        "entities": entities,
+        "entities_per_sec": round(entities / median_s, 1) if median_s > 0 else 0.0,
+        "total_length": result.get('total_length', 0) if isinstance(result, Mapping) else 0,
+    }
+
+
+def run_benchmark(files, repeats=DEFAULT_REPEATS, warmup=DEFAULT_WARMUP, material="A36 Steel", thickness=0.25,
+                  cold_caches=False, workers=None):
+    """Benchmark every file and return a JSON-serializable results document."""
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ezdxf": getattr(dxf_parser.ezdxf, '__version__', 'unknown'),
+            "repeats": repeats,
+            "warmup": warmup,
+            "material": material,
+            "thickness": thickness,
+            "cold_caches": cold_caches,
+            "workers": workers,
+        },
+        "files": {},
+    }
+    for path in files:
+        try:
+            stats = benchmark_file(path, repeats=repeats, warmup=warmup, material=material, thickness=thickness,
+                                   cold_caches=cold_caches, workers=workers)
+        except Exception as e:
+            logging.error(f"Benchmark failed for {path}: {e}", exc_info=True)
+            stats = {"file": os.path.basename(path), "error": str(e)}
+        results["files"][stats["file"]] = stats
+    return results
+
+
+def compare_to_baseline(results, baseline, time_threshold=DEFAULT_TIME_THRESHOLD,
+                        memory_threshold=DEFAULT_MEMORY_THRESHOLD, min_time_ms=DEFAULT_MIN_TIME_MS):
+    """Return a list of regressions of `results` against `baseline`.
+
+    A file regresses when its median time or peak memory exceeds the baseline by more than the given
+    fraction. Files missing from either side are ignored; files that errored now but not before count
+    as regressions.
+    """
+    regressions = []
+    base_files = baseline.get("files", {})
+    for name, current in results.get("files", {}).items():
+        base = base_files.get(name)
+        if not base or "error" in base:
+            continue
+        if "error" in current:
+            regressions.append({"file": name, "metric": "error", "baseline": None, "current": current["error"]})
+            continue
+        base_ms, cur_ms = base.get("median_ms", 0), current.get("median_ms", 0)
+        if max(base_ms, cur_ms) >= min_time_ms and base_ms > 0 and cur_ms > base_ms * (1 + time_threshold):
+            regressions.append({"file": name, "metric": "median_ms", "baseline": base_ms, "current": cur_ms,
+                                "change": round(cur_ms / base_ms - 1, 3)})
+        base_kb, cur_kb = base.get("peak_memory_kb", 0), current.get("peak_memory_kb", 0)
+        if base_kb > 0 and cur_kb > base_kb * (1 + memory_threshold):
+            regressions.append({"file": name, "metric": "peak_memory_kb", "baseline": base_kb, "current": cur_kb,
+                                "change": round(cur_kb / base_kb - 1, 3)})
+    return regressions
+
+
+def _measure_phase(fn, top_n=DEFAULT_TOP_SITES):
+    """Run fn() under tracemalloc and return (value, stats).
+
+    peak_kb is the phase's high-water mark above the memory in use when it started; retained_kb is what is
+    still allocated when it returns (held by the returned value, or garbage waiting in reference cycles) and
+    retained_after_gc_kb what survives a full collection. top_sites lists the source lines holding the most
+    retained memory.
+    """
+    gc.collect()
+    tracemalloc.start(25)
+    try:
+        before = tracemalloc.take_snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        value = fn()
+        end_current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        gc.collect()
+        collected_current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    top_sites = [
+        {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+         "size_kb": round(stat.size_diff / 1024, 1), "count": stat.count_diff}
+        for stat in sorted(diff, key=lambda st: st.size_diff, reverse=True)[:top_n] if stat.size_diff > 0
+    ]
+    return value, {
+        "peak_kb": round((peak - start_current) / 1024, 1),
+        "retained_kb": round((end_current - start_current) / 1024, 1),
+        "retained_after_gc_kb": round((collected_current - start_current) / 1024, 1),
+        "top_sites": top_sites,
+    }
+
+
+def profile_memory_phases(file_path, material="A36 Steel", thickness=0.25, top_n=DEFAULT_TOP_SITES):
+    """Peak and retained memory of each stage an upload goes through in the /parse_dxf route.
+
+    Phases: ezdxf.readfile on its own, the full parse_dxf call (which reads the file again and builds the
+    preview list), serializing the preview to JSON (the route's dump_preview), and BSON encoding of the order_item document, which is the
+    client-side cost of db.order_items.insert_one.
+    """
+    phases = {}
+    doc, phases["readfile"] = _measure_phase(lambda: dxf_parser.ezdxf.readfile(file_path), top_n)
+    del doc
+    result, phases["parse"] = _measure_phase(
+        lambda: dxf_parser.parse_dxf(file_path, material=material, thickness=thickness), top_n)
+    preview_json, phases["preview_json"] = _measure_phase(lambda: parse_result.dump_preview(result), top_n)
+
+    order_item = {
+        'cart_uid': 'benchmark', 'order_id': 'benchmark', 'part_number': os.path.basename(file_path),
+        'preview': preview_json,
+        'gross_min_x': result.get('gross_min_x', 0), 'gross_max_x': result.get('gross_max_x', 0),
+        'gross_min_y': result.get('gross_min_y', 0), 'gross_max_y': result.get('gross_max_y', 0),
+        'net_area_sqin': result.get('net_area_sqin', 0), 'total_length': result.get('total_length', 0),
+        'material': None, 'thickness': None, 'quantity': 1,
+    }
+    try:
+        import bson
+        encoded, phases["mongo_encode"] = _measure_phase(lambda: bson.encode(order_item), top_n)
+        document_kb = round(len(encoded) / 1024, 1)
+    except ImportError:
+        logging.warning("bson (pymongo) not installed; skipping mongo_encode phase")
+        document_kb = None
+
+    return {
+        "file": os.path.basename(file_path),
+        "size_bytes": os.path.getsize(file_path),
+        "phases": phases,
+        "peak_kb": max(phase["peak_kb"] for phase in phases.values()),
+        "preview_json_kb": round(len(preview_json) / 1024, 1),
+        "mongo_document_kb": document_kb,
+    }
+
+
+def run_memory_profile(files, material="A36 Steel", thickness=0.25, top_n=DEFAULT_TOP_SITES):
+    """Profile every file's per-phase memory and summarize the worst case for worker sizing."""
+    results = {"meta": {"timestamp": datetime.now().isoformat(timespec='seconds'),
+                        "python": platform.python_version(), "mode": "memory"},
+               "files": {}}
+    for path in files:
+        try:
+            stats = profile_memory_phases(path, material=material, thickness=thickness, top_n=top_n)
+        except Exception as e:
+            logging.error(f"Memory profile failed for {path}: {e}", exc_info=True)
+            stats = {"file": os.path.basename(path), "error": str(e)}
+        results["files"][stats["file"]] = stats
+    profiled = [stats for stats in results["files"].values() if "error" not in stats]
+    if profiled:
+        worst = max(profiled, key=lambda stats: stats["peak_kb"])
+        results["summary"] = {
+            "max_peak_kb": worst["peak_kb"],
+            "max_peak_file": worst["file"],
+            "max_peak_kb_per_input_kb": round(max(
+                stats["peak_kb"] / (stats["size_bytes"] / 1024) for stats in profiled if stats["size_bytes"]), 1),
+        }
+    return results
+
+
+def print_memory_report(results, top_n=3):
+    print(f"{'File':45} " + " ".join(f"{phase + ' peak/ret/gc KB':>30}" for phase in MEMORY_PHASES))
+    for name, stats in results["files"].items():
+        if "error" in stats:
+            print(f"{name[:45]:45} ERROR: {stats['error']}")
+            continue
+        cells = []
+        for phase in MEMORY_PHASES:
+            data = stats["phases"].get(phase)
+            cells.append(f"{data['peak_kb']:>10.1f}/{data['retained_kb']:.1f}/{data['retained_after_gc_kb']:<8.1f}"
+                         if data else f"{'-':>30}")
+        print(f"{name[:45]:45} " + " ".join(cells))
+    summary = results.get("summary")
+    if summary:
+        print(f"\nWorst peak: {summary['max_peak_kb']:.1f} KB ({summary['max_peak_file']}); "
+              f"up to {summary['max_peak_kb_per_input_kb']}x the input file size.")
+        worst = results["files"][summary["max_peak_file"]]
+        for phase in MEMORY_PHASES:
+            sites = worst["phases"].get(phase, {}).get("top_sites", [])[:top_n]
+            for site in sites:
+                print(f"  {phase:13} {site['size_kb']:10.1f} KB  {site['site']}")
+
+
+def loglog_slope(xs, ys):
+    """Least-squares slope of log(y) against log(x); 1.0 means linear scaling."""
+    pairs = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(pairs) < 2:
+        return None
+    mean_x = sum(p[0] for p in pairs) / len(pairs)
+    mean_y = sum(p[1] for p in pairs) / len(pairs)
+    var_x = sum((p[0] - mean_x) ** 2 for p in pairs)
+    if var_x == 0:
+        return None
+    return sum((p[0] - mean_x) * (p[1] - mean_y) for p in pairs) / var_x
+
+
+def run_scaling(kind, sizes=None, repeats=DEFAULT_REPEATS, warmup=DEFAULT_WARMUP, work_dir=None,
+                slope_threshold=DEFAULT_SLOPE_THRESHOLD, **generator_params):
+    """Generate a synthetic `kind` series, benchmark each size and fit time/memory against entity count.
+
+    The x axis is the parsed entity count (block contents included). A file with more model space entities
+    than the parser's max_entities is only partly parsed: it is reported with "capped" set and left out of
+    the fit, which would otherwise flatten the slope and hide super-linear growth.
+    """
+    sizes = sorted(sizes or DEFAULT_SCALING_SIZES)
+    owns_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix=f"dxf_scaling_{kind}_")
+    max_entities = dxf_parser.parser_config()["max_entities"]
+    series = []
+    try:
+        for n, path in generate_synthetic_dxf.generate_series(kind, sizes, work_dir, **generator_params):
+            stats = benchmark_file(path, repeats=repeats, warmup=warmup)
+            stats["generated_entities"] = n
+            stats["capped"] = sum(dxf_preflight.sniff_dxf(path)["modelspace_counts"].values()) > max_entities
+            series.append(stats)
+    finally:
+        if owns_dir:
+            for fname in os.listdir(work_dir):
+                os.remove(os.path.join(work_dir, fname))
+            os.rmdir(work_dir)
+
+    fitted = [row for row in series if not row["capped"]]
+    if len(fitted) < len(series):
+        logging.warning(f"{len(series) - len(fitted)} {kind} sizes exceed max_entities ({max_entities}) "
+                        f"and are left out of the slope fit")
+    xs = [row["entities"] for row in fitted]
+    time_slope = loglog_slope(xs, [row["median_ms"] for row in fitted])
+    memory_slope = loglog_slope(xs, [row["peak_memory_kb"] for row in fitted])
+    return {
+        "kind": kind,
+        "series": series,
+        "max_entities": max_entities,
+        "time_slope": round(time_slope, 3) if time_slope is not None else None,
+        "memory_slope": round(memory_slope, 3) if memory_slope is not None else None,
+        "slope_threshold": slope_threshold,
+        "superlinear": bool(time_slope is not None and time_slope > slope_threshold),
+    }
+
+
+def print_scaling_report(scaling):
+    print(f"Scaling series: {scaling['kind']}")
+    print(f"{'generated':>10} {'parsed':>8} {'median ms':>10} {'p95 ms':>10} {'peak KB':>10} {'ent/s':>10}")
+    for row in scaling["series"]:
+        print(f"{row['generated_entities']:10d} {row['entities']:8d} {row['median_ms']:10.2f} {row['p95_ms']:10.2f} "
+              f"{row['peak_memory_kb']:10.1f} {row['entities_per_sec']:10.1f}"
+              f"{'  capped at max_entities, not fitted' if row['capped'] else ''}")
+    print(f"log-log slope: time={scaling['time_slope']} memory={scaling['memory_slope']} "
+          f"(threshold {scaling['slope_threshold']})")
+    if scaling["superlinear"]:
+        print("SUPER-LINEAR time scaling detected.")
+
+
+def plot_scaling(scaling, path):
+    """Plot parse time and peak memory against entity count on log-log axes (needs matplotlib)."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        logging.warning("matplotlib not installed; skipping scaling plot")
+        return
+    fitted = [row for row in scaling["series"] if not row["capped"]]
+    xs = [row["entities"] for row in fitted]
+    fig, (ax_time, ax_mem) = plt.subplots(1, 2, figsize=(10, 4))
+    ax_time.loglog(xs, [row["median_ms"] for row in fitted], 'o-')
+    ax_time.set_xlabel("entities")
+    ax_time.set_ylabel("median parse time (ms)")
+    ax_time.set_title(f"{scaling['kind']}: slope {scaling['time_slope']}")
+    ax_mem.loglog(xs, [row["peak_memory_kb"] for row in fitted], 'o-')
+    ax_mem.set_xlabel("entities")
+    ax_mem.set_ylabel("peak memory (KB)")
+    ax_mem.set_title(f"slope {scaling['memory_slope']}")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    logging.info(f"Scaling plot written to {path}")
+
+
+def print_report(results, regressions=None):
+    print(f"{'File':45} {'median ms':>10} {'p95 ms':>10} {'peak KB':>10} {'entities':>9} {'ent/s':>10}")
+    for name, stats in results["files"].items():
+        if "error" in stats:
+            print(f"{name[:45]:45} ERROR: {stats['error']}")
+            continue
+        print(f"{name[:45]:45} {stats['median_ms']:10.2f} {stats['p95_ms']:10.2f} {stats['peak_memory_kb']:10.1f} "
+              f"{stats['entities']:9d} {stats['entities_per_sec']:10.1f}")
+    if regressions is not None:
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against baseline:")
+            for reg in regressions:
+                print(f"  {reg['file']}: {reg['metric']} {reg['baseline']} -> {reg['current']}"
+                      + (f" (+{reg['change'] * 100:.1f}%)" if 'change' in reg else ""))
+        else:
+            print("\nNo regressions against baseline.")
+
+
+def handler_report(stats):
+    """Per-entity-type handler totals from entity_handlers.handler_stats(), slowest first (JSON-serializable)."""
+    rows = [{"type": kind, "calls": row["calls"], "total_ms": round(row["seconds"] * 1000, 3),
+             "us_per_call": round(row["seconds"] * 1e6 / row["calls"], 2) if row["calls"] else 0.0}
+            for kind, row in stats.items()]
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def print_handler_report(rows):
+    print(f"\n{'Handler':20} {'calls':>10} {'total ms':>12} {'us/call':>10}")
+    for row in rows:
+        print(f"{row['type'][:20]:20} {row['calls']:10d} {row['total_ms']:12.2f} {row['us_per_call']:10.2f}")
+
+
+def write_json(data, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    logging.info(f"Benchmark results written to {path}")
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Benchmark dxf_parser.parse_dxf over a DXF corpus.")
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_CORPUS], help="DXF files or directories (default: tests/test_files)")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="Timed runs per file")
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help="Untimed warm-up runs per file")
+    parser.add_argument('--material', default="A36 Steel")
+    parser.add_argument('--thickness', type=float, default=0.25)
+    parser.add_argument('--cold-caches', action='store_true',
+                        help="Clear the SPLINE flattening cache before every timed run")
+    parser.add_argument('--handlers', action='store_true',
+                        help="Also report calls and time per entity handler (inclusive of nested entities)")
+    parser.add_argument('--workers', type=int,
+                        help="Processes measuring each file's model space (default: serial)")
+    parser.add_argument('--output', help="Write results JSON to this path")
+    parser.add_argument('--baseline', help="Compare against this baseline JSON")
+    parser.add_argument('--save-baseline', help="Write results as a new baseline JSON")
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help="Allowed fractional growth of median time (0.2 = 20%%)")
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help="Allowed fractional growth of peak memory (0.2 = 20%%)")
+    parser.add_argument('--min-time-ms', type=float, default=DEFAULT_MIN_TIME_MS,
+                        help="Ignore time regressions on files faster than this")
+    parser.add_argument('--scaling', choices=sorted(generate_synthetic_dxf.GENERATORS),
+                        help="Benchmark a synthetic scaling series of this kind instead of a corpus")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SCALING_SIZES,
+                        help="Entity counts for --scaling")
+    parser.add_argument('--slope-threshold', type=float, default=DEFAULT_SLOPE_THRESHOLD,
+                        help="Fail --scaling when the time log-log slope exceeds this")
+    parser.add_argument('--plot', help="--scaling: write a log-log plot PNG to this path")
+    parser.add_argument('--memory', action='store_true',
+                        help="Profile peak/retained memory per phase (readfile, parse, preview JSON, Mongo encode)")
+    parser.add_argument('--top-sites', type=int, default=DEFAULT_TOP_SITES,
+                        help="--memory: allocation sites to keep per phase")
+    parser.add_argument('--log-level', default='ERROR', help="Logging level while parsing (parser logs heavily at INFO)")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.ERROR),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.scaling:
+        scaling = run_scaling(args.scaling, sizes=args.sizes, repeats=args.repeats, warmup=args.warmup,
+                              slope_threshold=args.slope_threshold)
+        print_scaling_report(scaling)
+        if args.plot:
+            plot_scaling(scaling, args.plot)
+        if args.output:
+            write_json(scaling, args.output)
+        return 1 if scaling["superlinear"] else 0
+
+    files = discover_dxf_files(args.paths)
+    if not files:
+        print(f"No DXF files found in {args.paths}")
+        return 2
+
+    if args.memory:
+        results = run_memory_profile(files, material=args.material, thickness=args.thickness, top_n=args.top_sites)
+        print_memory_report(results)
+        if args.output:
+            write_json(results, args.output)
+        return 0
+
+    entity_handlers.clear_handler_stats()
+    results = run_benchmark(files, repeats=args.repeats, warmup=args.warmup,
+                            material=args.material, thickness=args.thickness, cold_caches=args.cold_caches,
+                            workers=args.workers)
+    regressions = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, time_threshold=args.time_threshold,
+                                          memory_threshold=args.memory_threshold, min_time_ms=args.min_time_ms)
+        results["regressions"] = regressions
+    print_report(results, regressions)
+    if args.handlers:
+        results["handlers"] = handler_report(entity_handlers.handler_stats())
+        print_handler_report(results["handlers"])
+
+    if args.output:
+        write_json(results, args.output)
+    if args.save_baseline:
+        write_json(results, args.save_baseline)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
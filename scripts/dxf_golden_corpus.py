@@ -0,0 +1,175 @@
+# dxf_golden_corpus.py
+# Golden-metric and timing regression tool for dxf_parser.parse_dxf.
+# `record` stores the pricing-relevant outputs (total_length, duplicate_length, common_line_length,
+# net_area_sqin, gross bounds/area, entity counts) and the median parse time for every file in a corpus;
+# `check` re-runs the parser, diffs the metrics within tolerances and reports the timing change per file. Parser performance work can then ship
+# knowing nobody's price moved, and intentional metric changes show up as an explicit re-record.
+#
+# Usage:
+#   python scripts/dxf_golden_corpus.py record                      # tests/test_files -> tests/golden/dxf_metrics.json
+#   python scripts/dxf_golden_corpus.py check --repeats 5
+#   python scripts/dxf_golden_corpus.py check --rel-tol 1e-4 --max-slowdown 0.25 --output golden_report.json
+# `check` exits 1 when any metric drifts past tolerance (or, with --max-slowdown, any file gets slower).
+
+import os
+import sys
+import json
+import math
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_CORPUS = os.path.join(PROJECT_ROOT, 'tests', 'test_files')
+DEFAULT_GOLDEN = os.path.join(PROJECT_ROOT, 'tests', 'golden', 'dxf_metrics.json')
+sys.path.insert(0, SCRIPT_DIR)
+from benchmark_dxf_parser import discover_dxf_files, benchmark_file, dxf_parser
+
+METRIC_KEYS = ["total_length", "duplicate_length", "common_line_length", "net_area_sqin", "gross_min_x", "gross_min_y", "gross_max_x", "gross_max_y",
+               "gross_area_sqin", "oriented_area_sqin", "part_count"]
+DEFAULT_REL_TOL = 1e-6
+DEFAULT_ABS_TOL = 1e-6
+DEFAULT_REPEATS = 3
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_metrics(result):
+    """The parse outputs that feed pricing, rounded to keep the golden file stable across platforms."""
+    metrics = {key: round(float(result.get(key, 0) or 0), 9) for key in METRIC_KEYS}
+    metrics["entity_count"] = {k: v for k, v in sorted(result.get("entity_count", {}).items()) if v}
+    return metrics
+
+
+def measure_corpus(files, repeats=DEFAULT_REPEATS, material="A36 Steel", thickness=0.25):
+    """Parse each file once for metrics and time it `repeats` times. Returns {filename: entry}."""
+    entries = {}
+    for path in files:
+        name = os.path.basename(path)
+        result = dxf_parser.parse_dxf(path, material=material, thickness=thickness)
+        timing = benchmark_file(path, repeats=repeats, warmup=0, material=material, thickness=thickness)
+        entries[name] = {
+            "sha256": file_sha256(path),
+            "metrics": extract_metrics(result),
+            "median_ms": timing["median_ms"],
+        }
+    return entries
+
+
+def record(files, golden_path, repeats=DEFAULT_REPEATS):
+    golden = {
+        "meta": {"recorded": datetime.now().isoformat(timespec='seconds'), "repeats": repeats},
+        "files": measure_corpus(files, repeats=repeats),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(golden_path)), exist_ok=True)
+    with open(golden_path, 'w', encoding='utf-8') as f:
+        json.dump(golden, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return golden
+
+
+def diff_metrics(expected, actual, rel_tol=DEFAULT_REL_TOL, abs_tol=DEFAULT_ABS_TOL):
+    """List of {metric, expected, actual} for every metric outside tolerance (entity counts must match exactly)."""
+    diffs = []
+    for key in METRIC_KEYS:
+        exp, act = expected.get(key, 0), actual.get(key, 0)
+        if not math.isclose(exp, act, rel_tol=rel_tol, abs_tol=abs_tol):
+            diffs.append({"metric": key, "expected": exp, "actual": act})
+    exp_counts, act_counts = expected.get("entity_count", {}), actual.get("entity_count", {})
+    for etype in sorted(set(exp_counts) | set(act_counts)):
+        if exp_counts.get(etype, 0) != act_counts.get(etype, 0):
+            diffs.append({"metric": f"entity_count.{etype}", "expected": exp_counts.get(etype, 0),
+                          "actual": act_counts.get(etype, 0)})
+    return diffs
+
+
+def check(files, golden, repeats=DEFAULT_REPEATS, rel_tol=DEFAULT_REL_TOL, abs_tol=DEFAULT_ABS_TOL,
+          max_slowdown=None):
+    """Compare a fresh run against the golden document and return a per-file report."""
+    current = measure_corpus(files, repeats=repeats)
+    report = {"files": {}, "accuracy_failures": 0, "timing_failures": 0, "missing": []}
+    golden_files = golden.get("files", {})
+    for name, entry in current.items():
+        gold = golden_files.get(name)
+        if gold is None:
+            report["missing"].append(name)
+            continue
+        diffs = diff_metrics(gold["metrics"], entry["metrics"], rel_tol=rel_tol, abs_tol=abs_tol)
+        base_ms, cur_ms = gold.get("median_ms", 0), entry["median_ms"]
+        speed_change = (cur_ms / base_ms - 1) if base_ms else None
+        slow = max_slowdown is not None and speed_change is not None and speed_change > max_slowdown
+        report["files"][name] = {
+            "content_changed": gold.get("sha256") != entry["sha256"],
+            "diffs": diffs,
+            "golden_ms": base_ms,
+            "current_ms": cur_ms,
+            "speed_change": round(speed_change, 3) if speed_change is not None else None,
+            "too_slow": slow,
+        }
+        report["accuracy_failures"] += 1 if diffs else 0
+        report["timing_failures"] += 1 if slow else 0
+    return report
+
+
+def print_check_report(report):
+    print(f"{'File':45} {'accuracy':>10} {'golden ms':>10} {'now ms':>10} {'speed':>8}")
+    for name, entry in report["files"].items():
+        status = "OK" if not entry["diffs"] else f"{len(entry['diffs'])} DIFF"
+        change = entry["speed_change"]
+        speed = f"{-change * 100:+.1f}%" if change is not None else "-"
+        flag = " SLOW" if entry["too_slow"] else ""
+        note = " (file changed)" if entry["content_changed"] else ""
+        print(f"{name[:45]:45} {status:>10} {entry['golden_ms']:10.2f} {entry['current_ms']:10.2f} {speed:>8}{flag}{note}")
+        for diff in entry["diffs"]:
+            print(f"    {diff['metric']}: {diff['expected']} -> {diff['actual']}")
+    if report["missing"]:
+        print(f"Not in golden file (run `record`): {', '.join(report['missing'])}")
+    print(f"\nAccuracy failures: {report['accuracy_failures']}, timing failures: {report['timing_failures']} "
+          f"(speed column: positive = faster than golden)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record or check golden parser metrics for a DXF corpus.")
+    parser.add_argument('command', choices=['record', 'check'])
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_CORPUS], help="DXF files or directories")
+    parser.add_argument('--golden', default=DEFAULT_GOLDEN, help="Golden metrics JSON")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--rel-tol', type=float, default=DEFAULT_REL_TOL)
+    parser.add_argument('--abs-tol', type=float, default=DEFAULT_ABS_TOL)
+    parser.add_argument('--max-slowdown', type=float, help="Fail when a file is slower than golden by this fraction")
+    parser.add_argument('--output', help="check: write the report JSON here")
+    parser.add_argument('--log-level', default='ERROR')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.ERROR),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    files = discover_dxf_files(args.paths)
+    if not files:
+        print(f"No DXF files found in {args.paths}")
+        return 2
+    if args.command == 'record':
+        golden = record(files, args.golden, repeats=args.repeats)
+        print(f"Recorded golden metrics for {len(golden['files'])} files to {args.golden}")
+        return 0
+
+    with open(args.golden, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    report = check(files, golden, repeats=args.repeats, rel_tol=args.rel_tol, abs_tol=args.abs_tol,
+                   max_slowdown=args.max_slowdown)
+    print_check_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["accuracy_failures"] or report["timing_failures"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# generate_synthetic_dxf.py
+# Generates parametric DXF files with ezdxf for scaling benchmarks of dxf_parser.parse_dxf.
+# The tests/test_files corpus tops out at a few dozen entities; these generators produce drawings with
+# thousands of lines/arcs/circles, perforated plates, nested INSERT hierarchies, dense splines and
+# many-layer drawings so parse time and memory can be plotted against entity count.
+#
+# Usage:
+#   python scripts/generate_synthetic_dxf.py --kind perforated --sizes 100 1000 10000 --out-dir synthetic
+#   python scripts/generate_synthetic_dxf.py --kind all --sizes 500 --out-dir synthetic
+# Each file is named <kind>_<size>.dxf. scripts/benchmark_dxf_parser.py --scaling uses the same generators.
+
+import os
+import sys
+import math
+import random
+import inspect
+import argparse
+
+import ezdxf
+
+CUT_LAYER = "CUT"
+# Drawing units: 1 = inches, matching the parser's default unit handling
+INSUNITS_INCHES = 1
+
+
+def _new_doc():
+    doc = ezdxf.new('R2010')
+    doc.header['$INSUNITS'] = INSUNITS_INCHES
+    if CUT_LAYER not in doc.layers:
+        doc.layers.add(CUT_LAYER)
+    return doc
+
+
+def _grid_side(n):
+    return max(1, int(math.ceil(math.sqrt(n))))
+
+
+def make_lines(n, seed=0, cell=1.0):
+    """n short LINE entities laid out on a grid of cells."""
+    rng = random.Random(seed)
+    doc = _new_doc()
+    msp = doc.modelspace()
+    side = _grid_side(n)
+    for i in range(n):
+        x0, y0 = (i % side) * cell, (i // side) * cell
+        angle = rng.uniform(0, 2 * math.pi)
+        length = cell * 0.4
+        msp.add_line((x0, y0), (x0 + length * math.cos(angle), y0 + length * math.sin(angle)),
+                     dxfattribs={'layer': CUT_LAYER})
+    return doc
+
+
+def make_arcs(n, seed=0, cell=1.0):
+    """n ARC entities with random start/end angles."""
+    rng = random.Random(seed)
+    doc = _new_doc()
+    msp = doc.modelspace()
+    side = _grid_side(n)
+    for i in range(n):
+        center = ((i % side) * cell + cell / 2, (i // side) * cell + cell / 2)
+        start = rng.uniform(0, 360)
+        msp.add_arc(center, cell * 0.3, start, start + rng.uniform(10, 350), dxfattribs={'layer': CUT_LAYER})
+    return doc
+
+
+def make_circles(n, seed=0, cell=1.0):
+    """n CIRCLE entities of varying radius."""
+    rng = random.Random(seed)
+    doc = _new_doc()
+    msp = doc.modelspace()
+    side = _grid_side(n)
+    for i in range(n):
+        center = ((i % side) * cell + cell / 2, (i // side) * cell + cell / 2)
+        msp.add_circle(center, cell * rng.uniform(0.1, 0.45), dxfattribs={'layer': CUT_LAYER})
+    return doc
+
+
+def make_mixed(n, seed=0, cell=1.0):
+    """n entities cycling LINE / ARC / CIRCLE."""
+    rng = random.Random(seed)
+    doc = _new_doc()
+    msp = doc.modelspace()
+    side = _grid_side(n)
+    for i in range(n):
+        cx, cy = (i % side) * cell + cell / 2, (i // side) * cell + cell / 2
+        kind = i % 3
+        if kind == 0:
+            msp.add_line((cx - 0.3 * cell, cy), (cx + 0.3 * cell, cy), dxfattribs={'layer': CUT_LAYER})
+        elif kind == 1:
+            start = rng.uniform(0, 360)
+            msp.add_arc((cx, cy), 0.3 * cell, start, start + 180, dxfattribs={'layer': CUT_LAYER})
+        else:
+            msp.add_circle((cx, cy), 0.2 * cell, dxfattribs={'layer': CUT_LAYER})
+    return doc
+
+
+def make_perforated(n, seed=0, pitch=0.5, hole_radius=0.125, margin=1.0):
+    """A rectangular plate outline (LWPOLYLINE) with an n-hole perforated grid of CIRCLEs."""
+    doc = _new_doc()
+    msp = doc.modelspace()
+    side = _grid_side(n)
+    width = (side - 1) * pitch + 2 * margin
+    height = (int(math.ceil(n / side)) - 1) * pitch + 2 * margin
+    msp.add_lwpolyline([(0, 0), (width, 0), (width, height), (0, height)], close=True,
+                       dxfattribs={'layer': CUT_LAYER})
+    for i in range(n):
+        msp.add_circle((margin + (i % side) * pitch, margin + (i // side) * pitch), hole_radius,
+                       dxfattribs={'layer': CUT_LAYER})
+    return doc
+
+
+def make_nested_inserts(n, seed=0, depth=3, fanout=None, cell=1.0):
+    """A hierarchy of blocks `depth` levels deep; each level INSERTs the level below `fanout` times.
+
+    The leaf block holds a square and a hole. When fanout is not given it is chosen so the expanded leaf
+    geometry count is close to n.
+    """
+    depth = max(1, depth)
+    if fanout is None:
+        fanout = max(2, int(round((max(n, 2) / 2.0) ** (1.0 / depth))))
+    doc = _new_doc()
+    leaf = doc.blocks.new(name='LEAF')
+    leaf.add_lwpolyline([(0, 0), (cell * 0.8, 0), (cell * 0.8, cell * 0.8), (0, cell * 0.8)], close=True,
+                        dxfattribs={'layer': CUT_LAYER})
+    leaf.add_circle((cell * 0.4, cell * 0.4), cell * 0.15, dxfattribs={'layer': CUT_LAYER})
+    child_name, child_size = 'LEAF', cell
+    for level in range(1, depth):
+        block = doc.blocks.new(name=f'LEVEL_{level}')
+        for j in range(fanout):
+            block.add_blockref(child_name, (j * child_size, 0) if level % 2 else (0, j * child_size),
+                               dxfattribs={'layer': CUT_LAYER})
+        child_name, child_size = block.name, child_size * fanout
+    msp = doc.modelspace()
+    for j in range(fanout):
+        msp.add_blockref(child_name, (0, j * child_size) if depth % 2 else (j * child_size, 0),
+                         dxfattribs={'layer': CUT_LAYER})
+    return doc
+
+
+def make_splines(n, seed=0, control_points=12, cell=4.0):
+    """n SPLINE entities, each through `control_points` jittered fit points."""
+    rng = random.Random(seed)
+    doc = _new_doc()
+    msp = doc.modelspace()
+    side = _grid_side(n)
+    for i in range(n):
+        x0, y0 = (i % side) * cell, (i // side) * cell
+        points = [(x0 + cell * 0.9 * k / (control_points - 1), y0 + cell * 0.5 + rng.uniform(-0.4, 0.4) * cell)
+                  for k in range(control_points)]
+        msp.add_spline(points, degree=3, dxfattribs={'layer': CUT_LAYER})
+    return doc
+
+
+def make_many_layers(n, seed=0, layers=200, cell=1.0):
+    """n LINE/CIRCLE entities spread over `layers` distinct layer names (a few of them cut layers).
+
+    Most layer names are unknown to the parser, so this exercises the per-entity layer classification.
+    """
+    doc = _new_doc()
+    msp = doc.modelspace()
+    names = [f"LAYER_{k:04d}" for k in range(max(1, layers))]
+    names[:3] = [CUT_LAYER, "0", "OUTLINE"][:len(names[:3])]
+    for name in names:
+        if name not in doc.layers:
+            doc.layers.add(name)
+    side = _grid_side(n)
+    for i in range(n):
+        cx, cy = (i % side) * cell + cell / 2, (i // side) * cell + cell / 2
+        layer = names[i % len(names)]
+        if i % 2:
+            msp.add_circle((cx, cy), 0.3 * cell, dxfattribs={'layer': layer})
+        else:
+            msp.add_line((cx - 0.3 * cell, cy), (cx + 0.3 * cell, cy), dxfattribs={'layer': layer})
+    return doc
+
+
+GENERATORS = {
+    "lines": make_lines,
+    "arcs": make_arcs,
+    "circles": make_circles,
+    "mixed": make_mixed,
+    "perforated": make_perforated,
+    "nested_inserts": make_nested_inserts,
+    "splines": make_splines,
+    "many_layers": make_many_layers,
+}
+
+
+def generate(kind, n, path, seed=0, **params):
+    """Generate a `kind` drawing of roughly n entities and save it to path. Returns path."""
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown synthetic kind: {kind}. Allowed: {sorted(GENERATORS)}")
+    doc = GENERATORS[kind](n, seed=seed, **params)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc.saveas(path)
+    return path
+
+
+def generate_series(kind, sizes, out_dir, seed=0, **params):
+    """Generate one file per size and return [(size, path)]."""
+    series = []
+    for n in sizes:
+        path = os.path.join(out_dir, f"{kind}_{n}.dxf")
+        generate(kind, n, path, seed=seed, **params)
+        series.append((n, path))
+    return series
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic DXF files for parser scaling benchmarks.")
+    parser.add_argument('--kind', default='mixed', choices=sorted(GENERATORS) + ['all'])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help="Approximate entity counts")
+    parser.add_argument('--out-dir', default='synthetic_dxf')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--depth', type=int, help="nested_inserts: hierarchy depth")
+    parser.add_argument('--layers', type=int, help="many_layers: number of layers")
+    parser.add_argument('--control-points', type=int, help="splines: control points per spline")
+    args = parser.parse_args(argv)
+
+    params = {}
+    if args.depth is not None:
+        params['depth'] = args.depth
+    if args.layers is not None:
+        params['layers'] = args.layers
+    if args.control_points is not None:
+        params['control_points'] = args.control_points
+
+    kinds = sorted(GENERATORS) if args.kind == 'all' else [args.kind]
+    for kind in kinds:
+        accepted = inspect.signature(GENERATORS[kind]).parameters
+        kind_params = {k: v for k, v in params.items() if k in accepted}
+        for n, path in generate_series(kind, args.sizes, args.out_dir, seed=args.seed, **kind_params):
+            print(f"{kind:15} n={n:<8} -> {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import os
 import csv
 import sys
+from collections.abc import Mapping
 import sys
 import os
 # Ensure project root is in sys.path
@@ -31,7 +32,7 @@ def main():
         try:
             # Only need entity_count from parse_dxf
             result = dxf_parser.parse_dxf(path)
-            entity_count = result.get('entity_count') if isinstance(result, dict) else None
+            entity_count = result.get('entity_count') if isinstance(result, Mapping) else None
             if entity_count is None:
                 print(f"Warning: {fname} did not return entity_count.")
                 entity_count = {k: 'ERR' for k in entity_types}
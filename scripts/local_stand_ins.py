@@ -0,0 +1,182 @@
+# local_stand_ins.py
+# In-process stand-ins for MongoDB and Firebase so the Flask app can be created and driven through its test
+# client without network services (used by the soak harness and other local tooling).
+# install_stand_ins() must run BEFORE `import app`, because app/__init__.py connects to MongoDB and
+# initializes Firebase at import time.
+#
+# Only the subset of the pymongo API the routes use is implemented: insert_one, find (with sort), find_one,
+# update_one ($set), delete_one, delete_many, count_documents and list_collection_names. Queries support
+# plain equality and $in.
+
+import os
+import copy
+import itertools
+
+_id_counter = itertools.count(1)
+
+
+def _new_object_id():
+    try:
+        from bson import ObjectId
+        return ObjectId()
+    except ImportError:
+        return f"local-{next(_id_counter)}"
+
+
+def _matches(document, query):
+    for key, condition in (query or {}).items():
+        value = document.get(key)
+        if isinstance(condition, dict) and '$in' in condition:
+            if value not in condition['$in']:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+        self.acknowledged = True
+
+
+class UpdateResult:
+    def __init__(self, matched_count):
+        self.matched_count = matched_count
+        self.modified_count = matched_count
+        self.acknowledged = True
+
+
+class DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+        self.acknowledged = True
+
+
+class InMemoryCursor:
+    def __init__(self, documents):
+        self._documents = documents
+
+    def sort(self, key, direction=1):
+        self._documents.sort(key=lambda doc: (doc.get(key) is None, doc.get(key)), reverse=direction < 0)
+        return self
+
+    def __iter__(self):
+        return iter(self._documents)
+
+    def __len__(self):
+        return len(self._documents)
+
+
+class InMemoryCollection:
+    """A list of documents with the pymongo collection methods used by the app."""
+
+    def __init__(self, name):
+        self.name = name
+        self.documents = []
+
+    def insert_one(self, document):
+        if '_id' not in document:
+            document['_id'] = _new_object_id()
+        self.documents.append(copy.deepcopy(document))
+        return InsertOneResult(document['_id'])
+
+    def find(self, query=None, projection=None):
+        return InMemoryCursor([copy.deepcopy(doc) for doc in self.documents if _matches(doc, query)])
+
+    def find_one(self, query=None, projection=None):
+        for doc in self.documents:
+            if _matches(doc, query):
+                return copy.deepcopy(doc)
+        return None
+
+    def update_one(self, query, update, upsert=False):
+        for doc in self.documents:
+            if _matches(doc, query):
+                doc.update(copy.deepcopy(update.get('$set', {})))
+                return UpdateResult(1)
+        if upsert:
+            new_doc = dict(query)
+            new_doc.update(copy.deepcopy(update.get('$set', {})))
+            self.insert_one(new_doc)
+        return UpdateResult(0)
+
+    def delete_one(self, query):
+        for i, doc in enumerate(self.documents):
+            if _matches(doc, query):
+                del self.documents[i]
+                return DeleteResult(1)
+        return DeleteResult(0)
+
+    def delete_many(self, query):
+        kept = [doc for doc in self.documents if not _matches(doc, query)]
+        deleted = len(self.documents) - len(kept)
+        self.documents = kept
+        return DeleteResult(deleted)
+
+    def count_documents(self, query):
+        return sum(1 for doc in self.documents if _matches(doc, query))
+
+
+class InMemoryDatabase:
+    def __init__(self, name):
+        self.name = name
+        self._collections = {}
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = InMemoryCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def list_collection_names(self):
+        return list(self._collections)
+
+    def document_counts(self):
+        return {name: len(coll.documents) for name, coll in self._collections.items()}
+
+
+class InMemoryMongoClient:
+    def __init__(self, *args, **kwargs):
+        self._databases = {}
+
+    def __getitem__(self, name):
+        if name not in self._databases:
+            self._databases[name] = InMemoryDatabase(name)
+        return self._databases[name]
+
+    def server_info(self):
+        return {"version": "in-memory"}
+
+    def close(self):
+        pass
+
+
+class _FirebaseApp:
+    name = 'default'
+
+
+def install_stand_ins(upload_folder=None):
+    """Patch pymongo and firebase_admin so `import app` works offline. Returns the in-memory client class.
+
+    Also sets the environment variables app/__init__.py reads unconditionally.
+    """
+    import pymongo
+    import firebase_admin
+    from firebase_admin import credentials
+
+    pymongo.MongoClient = InMemoryMongoClient
+    firebase_admin.initialize_app = lambda *args, **kwargs: _FirebaseApp()
+    credentials.Certificate = lambda data: data
+
+    os.environ.setdefault("MONGODB_URI", "mongodb://in-memory")
+    os.environ.setdefault("MONGODB_DBNAME", "plasmaproject_local")
+    os.environ.setdefault("FIREBASE_PRIVATE_KEY", "local-stand-in")
+    os.environ.setdefault("FLASK_SECRET_KEY", "local-stand-in")
+    if upload_folder:
+        os.environ["UPLOAD_FOLDER"] = upload_folder
+    return InMemoryMongoClient
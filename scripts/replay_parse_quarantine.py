@@ -0,0 +1,142 @@
+# replay_parse_quarantine.py
+# Re-runs the DXF files captured by app/utils/parse_quarantine.py (slow, timed-out and failed uploads)
+# against a parser build and prints the captured vs. replayed timings, worst file first.
+#
+# Usage:
+#   python scripts/replay_parse_quarantine.py instance/parse_quarantine
+#   python scripts/replay_parse_quarantine.py instance/parse_quarantine --engine mypkg.fast_parser:parse_dxf --repeats 5
+#   python scripts/replay_parse_quarantine.py instance/parse_quarantine --list
+#   python scripts/replay_parse_quarantine.py instance/parse_quarantine --export tests/quarantine_corpus
+# The store directory is also a valid corpus for scripts/benchmark_dxf_parser.py and dxf_golden_corpus.py.
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_STORE = os.path.join(PROJECT_ROOT, 'instance', 'parse_quarantine')
+sys.path.append(os.path.join(PROJECT_ROOT, 'app', 'utils'))
+sys.path.insert(0, SCRIPT_DIR)
+import parse_quarantine
+import shadow_parser
+from benchmark_dxf_parser import percentile
+
+DEFAULT_ENGINE = "dxf_parser:parse_dxf"
+
+
+def replay_entry(entry, engine, repeats=1, slow_seconds=None):
+    """Parse one quarantined file `repeats` times. Returns timings and the outcome of the last run."""
+    kwargs = {}
+    if entry.get("captures"):
+        kwargs = dict(entry["captures"][-1].get("parse_kwargs") or {})
+    times_ms = []
+    outcome = "ok"
+    error = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            result = engine(entry["dxf_path"], **kwargs)
+            elapsed = time.perf_counter() - start
+            outcome = parse_quarantine.classify_parse(result, elapsed, slow_seconds) or "ok"
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            outcome, error = parse_quarantine.REASON_ERROR, str(e)
+        times_ms.append(elapsed * 1000)
+    captured = [c["parse_ms"] for c in entry.get("captures", [])]
+    median_ms = percentile(times_ms, 50)
+    worst_ms = entry.get("worst_parse_ms")
+    return {
+        "sha256": entry["sha256"],
+        "part_numbers": entry.get("part_numbers", []),
+        "size_bytes": entry.get("size_bytes"),
+        "captured_reason": entry.get("last_reason"),
+        "captured_worst_ms": worst_ms,
+        "captured_median_ms": percentile(captured, 50) if captured else None,
+        "replay_times_ms": [round(t, 3) for t in times_ms],
+        "replay_median_ms": round(median_ms, 3),
+        "speedup": round(worst_ms / median_ms, 3) if worst_ms and median_ms else None,
+        "outcome": outcome,
+        "error": error,
+    }
+
+
+def replay(store, engine_spec=DEFAULT_ENGINE, repeats=1, slow_seconds=None, limit=None):
+    engine = shadow_parser.load_engine(engine_spec)
+    entries = parse_quarantine.list_entries(store)[:limit]
+    return {"engine": engine_spec, "store": store,
+            "entries": [replay_entry(entry, engine, repeats=repeats, slow_seconds=slow_seconds) for entry in entries]}
+
+
+def export_corpus(store, destination, limit=None):
+    """Copy quarantined files to destination as <first part number stem>_<sha prefix>.dxf."""
+    os.makedirs(destination, exist_ok=True)
+    copied = []
+    for entry in parse_quarantine.list_entries(store)[:limit]:
+        stem = os.path.splitext(entry.get("part_numbers", ["quarantined"])[0])[0]
+        target = os.path.join(destination, f"{stem}_{entry['sha256'][:8]}.dxf")
+        shutil.copyfile(entry["dxf_path"], target)
+        copied.append(target)
+    return copied
+
+
+def print_entries(entries):
+    print(f"{'sha256':14} {'part number':32} {'reason':8} {'worst ms':>10} {'captures':>8}")
+    for entry in entries:
+        name = ', '.join(entry.get("part_numbers", []))
+        print(f"{entry['sha256'][:12]:14} {name[:32]:32} {entry.get('last_reason', ''):8} "
+              f"{entry.get('worst_parse_ms', 0):10.1f} {len(entry.get('captures', [])):8}")
+
+
+def print_replay_report(report):
+    print(f"Engine: {report['engine']}")
+    print(f"{'sha256':14} {'part number':32} {'captured':>10} {'replay ms':>10} {'speedup':>8}  outcome")
+    for row in report["entries"]:
+        name = ', '.join(row["part_numbers"])
+        speedup = f"{row['speedup']:.2f}x" if row["speedup"] else "-"
+        outcome = row["outcome"] + (f" ({row['error']})" if row["error"] else "")
+        print(f"{row['sha256'][:12]:14} {name[:32]:32} {row['captured_worst_ms'] or 0:10.1f} "
+              f"{row['replay_median_ms']:10.1f} {speedup:>8}  {outcome}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay quarantined slow/failed DXF parses against a parser build.")
+    parser.add_argument('store', nargs='?', default=DEFAULT_STORE, help="PARSE_QUARANTINE_FOLDER directory")
+    parser.add_argument('--engine', default=DEFAULT_ENGINE, help="module:function with parse_dxf's signature")
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--limit', type=int, help="Only the N worst entries")
+    parser.add_argument('--slow-seconds', type=float, help="Report replays at or above this latency as slow")
+    parser.add_argument('--list', action='store_true', help="List the store without parsing")
+    parser.add_argument('--export', help="Copy the quarantined files into this directory as a benchmark corpus")
+    parser.add_argument('--output', help="Write the replay report as JSON")
+    parser.add_argument('--log-level', default='ERROR')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.ERROR),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.list:
+        print_entries(parse_quarantine.list_entries(args.store)[:args.limit])
+        return 0
+    if args.export:
+        copied = export_corpus(args.store, args.export, limit=args.limit)
+        print(f"Exported {len(copied)} files to {args.export}")
+        return 0
+
+    report = replay(args.store, engine_spec=args.engine, repeats=args.repeats, slow_seconds=args.slow_seconds,
+                    limit=args.limit)
+    if not report["entries"]:
+        print(f"No quarantined files in {args.store}")
+        return 2
+    print_replay_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 1 if any(row["outcome"] != "ok" for row in report["entries"]) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# shadow_parser_report.py
+# Summarizes shadow-mode parser comparisons recorded by app/utils/shadow_parser.py: speedup of the candidate
+# engine over parse_dxf and the distribution of metric divergence.
+#
+# Usage:
+#   python scripts/shadow_parser_report.py                     # reads MONGODB_URI / MONGODB_DBNAME from .env
+#   python scripts/shadow_parser_report.py --days 7 --engine mypkg.fast_parser:parse_dxf
+#   python scripts/shadow_parser_report.py --json exported_records.json --output shadow_summary.json
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.append(os.path.join(PROJECT_ROOT, 'app', 'utils'))
+import shadow_parser
+
+COLLECTION = "parser_shadow"
+
+
+def load_records_from_mongo(days=None, engine=None):
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+    load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
+    client = MongoClient(os.getenv("MONGODB_URI"))
+    db = client[os.getenv("MONGODB_DBNAME", "plasmaproject")]
+    query = {}
+    if days:
+        query["created_at"] = {"$gte": datetime.utcnow() - timedelta(days=days)}
+    if engine:
+        query["engine"] = engine
+    return list(db[COLLECTION].find(query, {"_id": 0}))
+
+
+def print_summary(summary):
+    print(f"Shadow records: {summary['records']} (completed {summary['completed']}, "
+          f"candidate errors {summary['candidate_errors']})")
+    if not summary["completed"]:
+        return
+    print(f"Median latency: primary {summary['primary_ms_p50']:.1f} ms, candidate {summary['candidate_ms_p50']:.1f} ms")
+    if summary["speedup_p50"] is not None:
+        print(f"Speedup: p50 {summary['speedup_p50']:.2f}x, p95 {summary['speedup_p95']:.2f}x")
+    print("Worst relative metric difference per upload:")
+    for label, count in summary["divergence_buckets"].items():
+        share = count / summary["completed"] * 100
+        print(f"  {label:>8}: {count:6d} ({share:5.1f}%)")
+    print("Per-metric relative difference (p50 / p95 / max):")
+    for key, stats in summary["per_metric_rel_diff"].items():
+        print(f"  {key:16} {stats['p50']:.2e} / {stats['p95']:.2e} / {stats['max']:.2e}")
+    print(f"Uploads with entity count mismatches: {summary['entity_count_mismatches']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize shadow parser comparisons.")
+    parser.add_argument('--json', help="Read records from a JSON array export instead of MongoDB")
+    parser.add_argument('--days', type=int, help="Only records from the last N days")
+    parser.add_argument('--engine', help="Only records for this SHADOW_PARSER engine spec")
+    parser.add_argument('--output', help="Write the summary JSON here")
+    args = parser.parse_args(argv)
+
+    if args.json:
+        with open(args.json, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        if args.engine:
+            records = [r for r in records if r.get("engine") == args.engine]
+    else:
+        records = load_records_from_mongo(days=args.days, engine=args.engine)
+    summary = shadow_parser.summarize_shadow_records(records)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+# soak_parse_calculate.py
+# Long-running soak harness for worker memory leaks.
+# Drives thousands of upload (/parse_dxf) + /calculate + /api/clear cycles through the Flask test client,
+# with in-memory stand-ins for MongoDB and Firebase (scripts/local_stand_ins.py), and samples RSS, the
+# number of live Python objects, live ezdxf documents and root logging handlers over time. After warm-up a
+# least-squares slope per cycle is fitted to each series and the run fails when growth exceeds the limits.
+#
+# Usage:
+#   python scripts/soak_parse_calculate.py --cycles 5000 --sample-every 50 --output soak.json
+#   python scripts/soak_parse_calculate.py --cycles 500 --files tests/test_files/test1.dxf --max-rss-slope-kb 2
+# Exit code is 1 when any slope limit is exceeded.
+
+import gc
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_CORPUS = os.path.join(PROJECT_ROOT, 'tests', 'test_files')
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, SCRIPT_DIR)
+import local_stand_ins
+from benchmark_dxf_parser import discover_dxf_files
+
+DEFAULT_CYCLES = 2000
+DEFAULT_SAMPLE_EVERY = 25
+DEFAULT_WARMUP_CYCLES = 100
+DEFAULT_MAX_RSS_SLOPE_KB = 1.0       # KB of RSS growth per cycle
+DEFAULT_MAX_OBJECT_SLOPE = 2.0       # live Python objects per cycle
+SMALL_FILE_LIMIT_BYTES = 300 * 1024  # default corpus: skip the biggest files to keep cycles fast
+
+
+def current_rss_kb():
+    """Resident set size of this process in KB (Linux /proc; falls back to peak RSS elsewhere)."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+    except ImportError:
+        return 0
+
+
+def count_live_objects():
+    """Live object totals after a full collection, plus counts for the usual leak suspects."""
+    gc.collect()
+    objects = gc.get_objects()
+    drawings = 0
+    try:
+        from ezdxf.document import Drawing
+        drawings = sum(1 for obj in objects if isinstance(obj, Drawing))
+    except ImportError:
+        pass
+    return {
+        "objects": len(objects),
+        "ezdxf_documents": drawings,
+        "root_log_handlers": len(logging.getLogger().handlers),
+    }
+
+
+def linear_slope(xs, ys):
+    """Least-squares slope of ys against xs, or None with fewer than two points."""
+    if len(xs) < 2:
+        return None
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def create_soak_app(upload_folder):
+    """Import the app against the local stand-ins and return (flask_app, in_memory_db)."""
+    local_stand_ins.install_stand_ins(upload_folder=upload_folder)
+    import app as app_package
+    flask_app = app_package.create_app({'TESTING': True, 'UPLOAD_FOLDER': upload_folder})
+    return flask_app, app_package.db
+
+
+def run_cycle(client, file_path, material="A36 Steel", thickness=0.25):
+    """One upload + calculate + clear round trip. Returns the elapsed seconds per step."""
+    timings = {}
+    start = time.perf_counter()
+    with open(file_path, 'rb') as f:
+        response = client.post('/parse_dxf', data={'file': (f, os.path.basename(file_path))},
+                               content_type='multipart/form-data')
+    timings["parse_s"] = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"/parse_dxf failed for {file_path}: {response.status_code} {response.get_data(as_text=True)[:200]}")
+    form = {}
+    for item in response.get_json().get('items', []):
+        uid = item['cart_uid']
+        form[f'material_{uid}'] = material
+        form[f'thickness_{uid}'] = str(thickness)
+        form[f'quantity_{uid}'] = '1'
+    start = time.perf_counter()
+    response = client.post('/calculate', data=form)
+    timings["calculate_s"] = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"/calculate failed: {response.status_code} {response.get_data(as_text=True)[:200]}")
+    client.post('/api/clear')
+    return timings
+
+
+def evaluate(samples, warmup_cycles, max_rss_slope_kb, max_object_slope):
+    """Fit per-cycle slopes on post-warm-up samples and compare them against the limits."""
+    steady = [s for s in samples if s["cycle"] >= warmup_cycles]
+    xs = [s["cycle"] for s in steady]
+    slopes = {
+        "rss_kb_per_cycle": linear_slope(xs, [s["rss_kb"] for s in steady]),
+        "objects_per_cycle": linear_slope(xs, [s["objects"] for s in steady]),
+        "ezdxf_documents_per_cycle": linear_slope(xs, [s["ezdxf_documents"] for s in steady]),
+        "log_handlers_per_cycle": linear_slope(xs, [s["root_log_handlers"] for s in steady]),
+    }
+    failures = []
+    if slopes["rss_kb_per_cycle"] is not None and slopes["rss_kb_per_cycle"] > max_rss_slope_kb:
+        failures.append(f"RSS grows {slopes['rss_kb_per_cycle']:.3f} KB/cycle (limit {max_rss_slope_kb})")
+    if slopes["objects_per_cycle"] is not None and slopes["objects_per_cycle"] > max_object_slope:
+        failures.append(f"Live objects grow {slopes['objects_per_cycle']:.3f}/cycle (limit {max_object_slope})")
+    for key in ("ezdxf_documents_per_cycle", "log_handlers_per_cycle"):
+        if slopes[key] is not None and slopes[key] > 0.01:
+            failures.append(f"{key} = {slopes[key]:.4f} (expected flat)")
+    return slopes, failures
+
+
+def soak(files, cycles=DEFAULT_CYCLES, sample_every=DEFAULT_SAMPLE_EVERY, warmup_cycles=DEFAULT_WARMUP_CYCLES,
+         max_rss_slope_kb=DEFAULT_MAX_RSS_SLOPE_KB, max_object_slope=DEFAULT_MAX_OBJECT_SLOPE, upload_folder=None,
+         log_level=logging.WARNING):
+    owns_folder = upload_folder is None
+    upload_folder = upload_folder or tempfile.mkdtemp(prefix='soak_uploads_')
+    try:
+        flask_app, db = create_soak_app(upload_folder)
+        # app/__init__.py calls logging.basicConfig at INFO on import; apply the requested level afterwards.
+        logging.getLogger().setLevel(log_level)
+        client = flask_app.test_client()
+        samples = []
+        step_totals = {"parse_s": 0.0, "calculate_s": 0.0}
+        started = time.perf_counter()
+        for cycle in range(cycles):
+            timings = run_cycle(client, files[cycle % len(files)])
+            for key, value in timings.items():
+                step_totals[key] += value
+            # /calculate inserts an order document per call; reset the stand-in collections so the soak
+            # measures worker memory rather than the growth of the in-memory database itself.
+            for collection in db.list_collection_names():
+                db[collection].documents.clear()
+            if cycle % sample_every == 0 or cycle == cycles - 1:
+                sample = {"cycle": cycle, "elapsed_s": round(time.perf_counter() - started, 2), "rss_kb": current_rss_kb()}
+                sample.update(count_live_objects())
+                samples.append(sample)
+                logging.warning(f"soak cycle {cycle}: rss={sample['rss_kb']} KB objects={sample['objects']} "
+                                f"ezdxf_docs={sample['ezdxf_documents']} handlers={sample['root_log_handlers']}")
+        slopes, failures = evaluate(samples, warmup_cycles, max_rss_slope_kb, max_object_slope)
+        return {
+            "meta": {"timestamp": datetime.now().isoformat(timespec='seconds'), "cycles": cycles,
+                     "sample_every": sample_every, "warmup_cycles": warmup_cycles,
+                     "files": [os.path.basename(f) for f in files],
+                     "max_rss_slope_kb": max_rss_slope_kb, "max_object_slope": max_object_slope},
+            "mean_parse_ms": round(step_totals["parse_s"] / max(cycles, 1) * 1000, 2),
+            "mean_calculate_ms": round(step_totals["calculate_s"] / max(cycles, 1) * 1000, 2),
+            "samples": samples,
+            "slopes": slopes,
+            "failures": failures,
+        }
+    finally:
+        if owns_folder:
+            shutil.rmtree(upload_folder, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak /parse_dxf + /calculate through the Flask test client and watch memory growth.")
+    parser.add_argument('--files', nargs='*', help="DXF files or directories to cycle through (default: small tests/test_files)")
+    parser.add_argument('--cycles', type=int, default=DEFAULT_CYCLES)
+    parser.add_argument('--sample-every', type=int, default=DEFAULT_SAMPLE_EVERY)
+    parser.add_argument('--warmup-cycles', type=int, default=DEFAULT_WARMUP_CYCLES,
+                        help="Cycles excluded from the slope fit (caches, lazy imports)")
+    parser.add_argument('--max-rss-slope-kb', type=float, default=DEFAULT_MAX_RSS_SLOPE_KB)
+    parser.add_argument('--max-object-slope', type=float, default=DEFAULT_MAX_OBJECT_SLOPE)
+    parser.add_argument('--output', help="Write samples and slopes as JSON")
+    parser.add_argument('--log-level', default='WARNING',
+                        help="Root log level after app import (INFO reproduces production logging volume)")
+    args = parser.parse_args(argv)
+
+    if args.files:
+        files = discover_dxf_files(args.files)
+    else:
+        files = [f for f in discover_dxf_files([DEFAULT_CORPUS]) if os.path.getsize(f) <= SMALL_FILE_LIMIT_BYTES]
+    if not files:
+        print("No DXF files to soak with.")
+        return 2
+
+    result = soak(files, cycles=args.cycles, sample_every=args.sample_every, warmup_cycles=args.warmup_cycles,
+                  max_rss_slope_kb=args.max_rss_slope_kb, max_object_slope=args.max_object_slope,
+                  log_level=getattr(logging, args.log_level.upper(), logging.WARNING))
+
+    print(f"Cycles: {args.cycles}, mean parse {result['mean_parse_ms']} ms, mean calculate {result['mean_calculate_ms']} ms")
+    for key, value in result["slopes"].items():
+        print(f"  {key:28} {value if value is None else round(value, 4)}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    if result["failures"]:
+        print("FAIL:")
+        for failure in result["failures"]:
+            print(f"  {failure}")
+        return 1
+    print("PASS: no growth beyond configured slopes.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
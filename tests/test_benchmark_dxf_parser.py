@@ -0,0 +1,77 @@
+# test_benchmark_dxf_parser.py
+# Checks the parser benchmark helpers (percentiles, baseline comparison) and a smoke run on a small corpus file.
+
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+import benchmark_dxf_parser as bench
+
+TEST_FILES_DIR = os.path.join(script_dir, 'test_files')
+
+
+def test_percentile_interpolates():
+    assert bench.percentile([5.0], 95) == 5.0
+    assert bench.percentile([1, 2, 3, 4, 5], 50) == 3
+    assert abs(bench.percentile([0, 10], 95) - 9.5) < 1e-9
+
+
+def test_compare_to_baseline_flags_time_and_memory():
+    baseline = {"files": {
+        "a.dxf": {"median_ms": 10.0, "peak_memory_kb": 100.0},
+        "b.dxf": {"median_ms": 10.0, "peak_memory_kb": 100.0},
+        "fast.dxf": {"median_ms": 0.5, "peak_memory_kb": 10.0},
+    }}
+    results = {"files": {
+        "a.dxf": {"median_ms": 13.0, "peak_memory_kb": 100.0},
+        "b.dxf": {"median_ms": 10.5, "peak_memory_kb": 150.0},
+        "fast.dxf": {"median_ms": 1.0, "peak_memory_kb": 10.0},
+        "new.dxf": {"median_ms": 99.0, "peak_memory_kb": 999.0},
+    }}
+    regressions = bench.compare_to_baseline(results, baseline, time_threshold=0.2, memory_threshold=0.2, min_time_ms=2.0)
+    flagged = {(r["file"], r["metric"]) for r in regressions}
+    assert flagged == {("a.dxf", "median_ms"), ("b.dxf", "peak_memory_kb")}
+
+
+def test_benchmark_file_smoke():
+    path = os.path.join(TEST_FILES_DIR, '10x10 Square.dxf')
+    stats = bench.benchmark_file(path, repeats=2, warmup=0)
+    assert stats["repeats"] == 2
+    assert stats["median_ms"] > 0
+    assert stats["p95_ms"] >= stats["median_ms"]
+    assert stats["peak_memory_kb"] > 0
+    assert stats["entities"] > 0
+
+
+def test_loglog_slope_detects_superlinear():
+    xs = [10, 100, 1000]
+    assert abs(bench.loglog_slope(xs, [1, 10, 100]) - 1.0) < 1e-9
+    assert abs(bench.loglog_slope(xs, [1, 100, 10000]) - 2.0) < 1e-9
+    assert bench.loglog_slope([10], [1]) is None
+
+
+def test_run_scaling_smoke():
+    scaling = bench.run_scaling("circles", sizes=[10, 40], repeats=1, warmup=0)
+    assert [row["generated_entities"] for row in scaling["series"]] == [10, 40]
+    assert scaling["time_slope"] is not None
+
+
+def test_run_scaling_leaves_capped_sizes_out_of_the_fit():
+    cap = bench.dxf_parser.parser_config()["max_entities"]
+    assert max(bench.DEFAULT_SCALING_SIZES) <= cap
+    scaling = bench.run_scaling("lines", sizes=[100, 300, cap + 500], repeats=1, warmup=0)
+    assert [row["capped"] for row in scaling["series"]] == [False, False, True]
+    # Only the two parsed-in-full points are fitted, on the parsed entity counts
+    uncapped = scaling["series"][:2]
+    expected = bench.loglog_slope([row["entities"] for row in uncapped], [row["median_ms"] for row in uncapped])
+    assert scaling["time_slope"] == round(expected, 3)
+
+
+def test_profile_memory_phases_smoke():
+    stats = bench.profile_memory_phases(os.path.join(TEST_FILES_DIR, 'test5.dxf'), top_n=3)
+    assert set(stats["phases"]) >= {"readfile", "parse", "preview_json"}
+    for phase in stats["phases"].values():
+        assert phase["peak_kb"] >= 0
+        assert len(phase["top_sites"]) <= 3
+    assert stats["peak_kb"] == max(phase["peak_kb"] for phase in stats["phases"].values())
@@ -0,0 +1,81 @@
+# test_block_transforms.py
+# Checks the INSERT placement matrices, MINSERT grid offsets, and that arrayed and nested blocks are measured
+# once per placement.
+
+import os
+import sys
+import math
+
+import ezdxf
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import block_transforms
+import dxf_parser
+
+
+def _hole_plate(path, rows, cols, spacing=2.0, rotation=0.0):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    doc.blocks.new('HOLE').add_circle((0, 0), 0.25)
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (10, 0), (10, 10), (0, 10)], close=True)
+    msp.add_blockref('HOLE', (1, 1), dxfattribs={'rotation': rotation}).grid(size=(rows, cols), spacing=(spacing, spacing))
+    doc.saveas(path)
+    return doc
+
+
+def test_insert_matrix_applies_base_point_scale_rotation_then_offset():
+    doc = ezdxf.new()
+    insert = doc.modelspace().add_blockref('B', (10, 5), dxfattribs={'rotation': 90, 'xscale': 2, 'yscale': 3})
+    matrix = block_transforms.insert_matrix(insert, base_point=(1, 1))
+    assert np.allclose(block_transforms.transform_points(matrix, [(1, 1), (2, 1), (1, 2, 7)]), [(10, 5), (10, 7), (7, 5)])
+    assert np.allclose(block_transforms.transform_point(matrix, 2, 2), (7, 7))
+    assert np.allclose(block_transforms.axis_scales(matrix), (2, 3))
+    assert np.allclose(block_transforms.transform_angles(matrix, 0, 45), (90, 135))
+    mirrored = block_transforms.scale_matrix(-1.0, 1.0)
+    assert np.allclose(block_transforms.transform_angles(mirrored, 0, 45), (135, 180))
+
+
+def test_minsert_offsets_rotate_with_the_insert_and_skip_duplicates():
+    doc = ezdxf.new()
+    insert = doc.modelspace().add_blockref('B', (0, 0), dxfattribs={'rotation': 90})
+    insert.grid(size=(2, 3), spacing=(1.0, 2.0))
+    offsets = block_transforms.minsert_offsets(insert, block_transforms.scale_matrix(2.0))
+    expected = [(0, 2 * col * 2.0) if row == 0 else (-2 * 1.0, 2 * col * 2.0)
+                for row in range(2) for col in range(3)][1:]
+    assert np.allclose(offsets, expected)
+    insert.grid(size=(3, 3), spacing=(0.0, 1.0))
+    assert len(block_transforms.minsert_offsets(insert)) == 2
+    assert len(block_transforms.minsert_offsets(doc.modelspace().add_blockref('B', (0, 0)))) == 0
+
+
+def test_arrayed_holes_are_counted_per_cell(tmp_path):
+    path = str(tmp_path / "plate.dxf")
+    _hole_plate(path, 4, 5)
+    result = dxf_parser.parse_dxf(path)
+    assert result['entity_count']['CIRCLE'] == 20
+    assert math.isclose(result['total_length'], 40 + 20 * 2 * math.pi * 0.25)
+    centers = sorted(tuple(item['center']) for item in result['preview'] if item['type'] == 'circle')
+    assert centers == sorted((1 + 2.0 * c, 1 + 2.0 * r) for r in range(4) for c in range(5))
+    assert (result['gross_max_x'], result['gross_max_y']) == (10, 10)
+
+
+def test_nested_and_repeated_inserts_keep_parent_transforms(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    doc.blocks.new('INNER', base_point=(1, 0)).add_line((1, 0), (3, 0))
+    outer = doc.blocks.new('OUTER')
+    outer.add_blockref('INNER', (10, 0), dxfattribs={'rotation': 90, 'xscale': 2, 'yscale': 2})
+    msp = doc.modelspace()
+    msp.add_blockref('OUTER', (100, 100), dxfattribs={'rotation': 90})
+    msp.add_blockref('OUTER', (200, 100))
+    path = str(tmp_path / "nested.dxf")
+    doc.saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    # The same block inserted twice is measured twice; rotations compose through both levels
+    assert result['entity_count']['LINE'] == 2
+    assert math.isclose(result['total_length'], 8.0)
+    segments = [(item['start'], item['end']) for item in result['preview'] if item['type'] == 'line']
+    assert np.allclose(segments, [((100, 110), (96, 110)), ((210, 100), (210, 104))])
@@ -0,0 +1,156 @@
+# test_contours.py
+# Checks contour faces (parts, holes, islands) and common-line detection between parts nested edge-to-edge.
+
+import os
+import sys
+import math
+
+import ezdxf
+import shapely
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import contours
+import dxf_parser
+
+
+def _square(x0, y0, w, h):
+    corners = [(x0, y0), (x0 + w, y0), (x0 + w, y0 + h), (x0, y0 + h)]
+    return [(a[0], a[1], b[0], b[1], math.hypot(b[0] - a[0], b[1] - a[1])) for a, b in zip(corners, corners[1:] + corners[:1])]
+
+
+def test_faces_classify_parts_holes_and_islands():
+    lines = _square(0, 0, 10, 10) + _square(2, 2, 6, 6) + _square(4, 4, 2, 2) + _square(20, 0, 5, 5)
+    faces, depth = contours.build_faces(lines, arcs=[(22.5, 2.5, 1, 0, 360, 2 * math.pi)])
+    by_area = sorted(zip(shapely.area(faces).round(1).tolist(), depth.tolist()))
+    # island (depth 2), hole in the 25 sq in plate (1), the plate itself, the ring around the hole, the frame
+    assert by_area == [(3.1, 1), (4.0, 2), (21.9, 0), (32.0, 1), (64.0, 0)]
+
+
+def test_common_line_between_adjacent_parts_only():
+    faces, depth = contours.build_faces(_square(0, 0, 10, 10) + _square(10, 0, 10, 4) + _square(2, 2, 2, 2))
+    assert contours.common_lines(faces, depth) == (4.0, 1)
+    # Corner contact shares no edge
+    faces, depth = contours.build_faces(_square(0, 0, 1, 1) + _square(1, 1, 1, 1))
+    assert contours.common_lines(faces, depth) == (0.0, 0)
+
+
+def test_parse_reports_common_line_for_nested_parts(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (10, 0), (10, 5), (0, 5)], close=True)
+    msp.add_lwpolyline([(10, 0), (16, 0), (16, 5), (10, 5)], close=True)
+    path = str(tmp_path / "nested.dxf")
+    doc.saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    assert result['contour_count'] == 2
+    assert math.isclose(result['common_line_length'], 5.0)
+    # The shared edge is drawn twice but cut once
+    assert math.isclose(result['total_length'], 30 + 22 - 5)
+
+
+def test_split_parts_groups_holes_with_their_part_and_islands_apart():
+    lines = _square(0, 0, 10, 10) + _square(2, 2, 6, 6) + _square(4, 4, 2, 2) + _square(20, 0, 5, 5)
+    faces, depth = contours.build_faces(lines, arcs=[(22.5, 2.5, 1, 0, 360, 2 * math.pi)])
+    parts = contours.split_parts(faces, depth)
+    # frame with its hole, plate with its round hole, island
+    assert [round(float(shapely.area(faces[part[0]])), 1) for part in parts] == [64.0, 21.9, 4.0]
+    assert [len(part) for part in parts] == [2, 2, 1]
+
+
+def test_edges_on_a_shared_boundary_belong_to_both_parts():
+    faces, depth = contours.build_faces(_square(0, 0, 10, 10) + _square(10, 0, 10, 4))
+    material = faces[[part[0] for part in contours.split_parts(faces, depth)]]
+    index, part = contours.assign_to_parts(material, [(10, 2), (5, 0), (30, 2)])
+    assert list(zip(index.tolist(), part.tolist())) == [(0, 0), (0, 1), (1, 0), (2, 1)]
+
+
+def test_parse_splits_separate_parts(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (10, 0), (10, 10), (0, 10)], close=True)
+    msp.add_circle((5, 5), 1)
+    # Filleted plate far away: the bulged corner still closes its contour
+    msp.add_lwpolyline([(100, 0, 0), (104, 0, 0.414213562), (106, 2, 0), (106, 6, 0), (100, 6, 0)], format='xyb', close=True)
+    path = str(tmp_path / "two_parts.dxf")
+    doc.saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    assert result['part_count'] == 2
+    square, plate = result['parts']
+    assert math.isclose(square['total_length'], 40 + 2 * math.pi)
+    assert math.isclose(square['net_area_sqin'], 100 - math.pi, rel_tol=1e-3)
+    assert (square['gross_min_x'], square['gross_max_x'], square['gross_area_sqin']) == (0, 10, 100)
+    assert [item['type'] for item in square['preview']] == ['lwpolyline', 'circle']
+    assert (plate['gross_min_x'], plate['gross_max_x'], plate['contour_count']) == (100, 106, 1)
+    assert math.isclose(square['total_length'] + plate['total_length'], result['total_length'])
+    # Far smaller than the merged bounding box
+    assert square['gross_area_sqin'] + plate['gross_area_sqin'] < result['gross_area_sqin'] / 5
+
+
+def test_part_lengths_keep_the_exact_curve_lengths(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_ellipse((5, 5), major_axis=(4, 0), ratio=0.5)
+    # A D-shaped plate: a straight edge closed by a fit-point spline
+    msp.add_line((20, 0), (30, 0))
+    msp.add_spline(fit_points=[(30, 0), (28, 4), (25, 5), (22, 4), (20, 0)])
+    path = str(tmp_path / "curved_parts.dxf")
+    doc.saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    assert result['part_count'] == 2
+    ellipse, plate = sorted(result['parts'], key=lambda part: part['gross_min_x'])
+    assert math.isclose(ellipse['total_length'], 19.376845, rel_tol=1e-5)  # Ramanujan: a = 4, b = 2
+    assert math.isclose(ellipse['total_length'] + plate['total_length'], result['total_length'])
+
+
+def test_parse_dxf_route_offers_parts_as_cart_items(tmp_path):
+    sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+    import soak_parse_calculate
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    doc.modelspace().add_lwpolyline([(0, 0), (10, 0), (10, 10), (0, 10)], close=True)
+    doc.modelspace().add_circle((5, 5), 1)
+    doc.modelspace().add_lwpolyline([(20, 0), (24, 0), (24, 4), (20, 4)], close=True)
+    path = str(tmp_path / "two_parts.dxf")
+    doc.saveas(path)
+    flask_app, db = soak_parse_calculate.create_soak_app(str(tmp_path))
+    client = flask_app.test_client()
+    with open(path, 'rb') as f:
+        items = client.post('/parse_dxf', data={'file': (f, 'two_parts.dxf')}, content_type='multipart/form-data').get_json()['items']
+    assert [(item['part_number'], item['part_count']) for item in items] == [('two_parts.dxf', 2)]
+    whole = list(db.order_items.find({}))
+    assert [item['pierce_count'] for item in whole] == [3]
+    client.post('/api/clear')
+    with open(path, 'rb') as f:
+        items = client.post('/parse_dxf', data={'file': (f, 'two_parts.dxf'), 'split_parts': '1'},
+                            content_type='multipart/form-data').get_json()['items']
+    assert [item['part_number'] for item in items] == ['two_parts.dxf part 1 of 2', 'two_parts.dxf part 2 of 2']
+    stored = sorted((item['total_length'], item['pierce_count']) for item in db.order_items.find({}))
+    assert stored == [(16.0, 1), (40 + 2 * math.pi, 2)]  # the plate and its hole are pierced separately
+    # Without shared edges the split quote cuts and pierces exactly what the whole-drawing quote does
+    costing, pricing_config = sys.modules['app.utils.costing'], sys.modules['app.utils.pricing_config']
+
+    def cut_and_pierce(items):
+        items = [dict(item, material="A36 Steel", thickness=0.5) for item in items]
+        rows = costing.calculate_costs(items, pricing_config.get_inputs(), pricing_config.get_material_densities())
+        return (sum(row["cut_time_min"] for row in rows["detailed_breakdown"]),
+                sum(item['pierce_count'] for item in items))
+    split_time, split_pierces = cut_and_pierce(db.order_items.find({}))
+    whole_time, whole_pierces = cut_and_pierce(whole)
+    assert math.isclose(split_time, whole_time) and split_pierces == whole_pierces
+    client.post('/api/clear')
+
+    open_path = str(tmp_path / "open.dxf")
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    doc.modelspace().add_line((0, 0), (10, 0))
+    doc.modelspace().add_line((10, 0), (10, 5))
+    doc.saveas(open_path)
+    with open(open_path, 'rb') as f:
+        items = client.post('/parse_dxf', data={'file': (f, 'open.dxf'), 'split_parts': '1'},
+                            content_type='multipart/form-data').get_json()['items']
+    assert [(item['part_number'], item['part_count']) for item in items] == [('open.dxf', 1)]
+    client.post('/api/clear')
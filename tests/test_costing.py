@@ -0,0 +1,94 @@
+# test_costing.py
+# Checks calculate_costs against the material catalog: per-material process values and per-item costs.
+
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+import local_stand_ins
+
+local_stand_ins.install_stand_ins()
+from app.utils import costing, pricing_config
+
+
+def _item(part_number, material, thickness=0.5, length=100.0):
+    return {"part_number": part_number, "material": material, "thickness": thickness, "quantity": 1,
+            "length": length, "pierce_count": 2, "gross_min_x": 0, "gross_max_x": 10, "gross_min_y": 0,
+            "gross_max_y": 10}
+
+
+def _unit_price(breakdown, part_number):
+    return next(row["unit_price"] for row in breakdown["detailed_breakdown"] if row["part_number"] == part_number)
+
+
+def test_stainless_prices_above_steel_for_same_geometry():
+    inputs = pricing_config.get_inputs()
+    densities = pricing_config.get_material_densities()
+    steel = costing.calculate_costs([_item("a", "A36 Steel")], inputs, densities)
+    stainless = costing.calculate_costs([_item("a", "Stainless 304")], inputs, densities)
+    assert stainless["total_sell_price"] > steel["total_sell_price"]
+
+
+def test_items_keep_their_own_material_and_cut_costs():
+    inputs = pricing_config.get_inputs()
+    densities = pricing_config.get_material_densities()
+    alone = costing.calculate_costs([_item("small", "A36 Steel", length=10.0)], inputs, densities)
+    mixed = costing.calculate_costs([_item("small", "A36 Steel", length=10.0),
+                                     _item("big", "Aluminum 6061", length=500.0)], inputs, densities)
+    # Order-level setup is shared, but the small part must not inherit the big part's cut time
+    assert _unit_price(mixed, "small") < _unit_price(alone, "small")
+    assert _unit_price(mixed, "big") > _unit_price(mixed, "small")
+
+
+def test_uncatalogued_material_falls_back_to_input_buckets():
+    inputs = pricing_config.get_inputs()
+    densities = pricing_config.get_material_densities()
+    empty = pricing_config.MaterialCatalog()
+    with_catalog = costing.calculate_costs([_item("a", "A36 Steel")], inputs, densities)
+    without = costing.calculate_costs([_item("a", "A36 Steel")], inputs, densities, catalog=empty)
+    # The A36 rows reproduce the inputs.csv buckets, so the price does not move
+    assert abs(with_catalog["total_sell_price"] - without["total_sell_price"]) < 1e-9
+
+
+def test_parsed_total_length_drives_cut_time():
+    inputs = pricing_config.get_inputs()
+    densities = pricing_config.get_material_densities()
+    parsed = _item("a", "A36 Steel", length=250.0)
+    parsed["total_length"] = parsed.pop("length")
+    explicit = costing.calculate_costs([_item("a", "A36 Steel", length=250.0)], inputs, densities)
+    from_cart = costing.calculate_costs([parsed], inputs, densities)
+    assert abs(from_cart["total_sell_price"] - explicit["total_sell_price"]) < 1e-9
+
+
+def test_cart_item_without_length_now_prices_its_cut_time():
+    inputs = pricing_config.get_inputs()
+    densities = pricing_config.get_material_densities()
+    uncut = _item("a", "A36 Steel")
+    del uncut["length"]
+    parsed = dict(uncut, total_length=250.0)
+    before = costing.calculate_costs([uncut], inputs, densities)
+    after = costing.calculate_costs([parsed], inputs, densities)
+    cut_speed = pricing_config.get_material_catalog().process("A36 Steel", 0.5).cut_speed
+    assert before["detailed_breakdown"][0]["cut_time_min"] == 0
+    assert abs(after["detailed_breakdown"][0]["cut_time_min"] - 250.0 / cut_speed) < 1e-9
+    assert after["total_sell_price"] > before["total_sell_price"]
+
+
+def test_common_line_savings_are_reported_per_item():
+    inputs = pricing_config.get_inputs()
+    densities = pricing_config.get_material_densities()
+    item = dict(_item("nested", "A36 Steel", length=200.0), common_line_length=20.0)
+    row = costing.calculate_costs([item], inputs, densities)["detailed_breakdown"][0]
+    assert abs(row["common_line_saved_min"] / row["cut_time_min"] - 0.1) < 1e-9
+
+
+def test_tighter_oriented_area_prices_the_plate():
+    inputs = pricing_config.get_inputs()
+    densities = pricing_config.get_material_densities()
+    axis_aligned = costing.calculate_costs([_item("a", "A36 Steel")], inputs, densities)
+    rotated = costing.calculate_costs([dict(_item("a", "A36 Steel"), oriented_area_sqin=50.0)], inputs, densities)
+    looser = costing.calculate_costs([dict(_item("a", "A36 Steel"), oriented_area_sqin=100.5)], inputs, densities)
+    assert rotated["total_sell_price"] < axis_aligned["total_sell_price"]
+    assert abs(looser["total_sell_price"] - axis_aligned["total_sell_price"]) < 1e-9
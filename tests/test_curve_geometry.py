@@ -0,0 +1,80 @@
+# test_curve_geometry.py
+# Checks the analytic ellipse and quadrature spline lengths against dense sampling, and the chord tolerances.
+
+import os
+import sys
+import math
+
+import numpy as np
+from ezdxf.math import BSpline, ConstructionArc
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import curve_geometry
+
+
+def _sampled_length(points):
+    points = np.asarray(points)
+    return float(np.hypot(*np.diff(points, axis=0).T).sum())
+
+
+def _ellipse_points(major, minor, t0, t1, xscale=1.0, yscale=1.0, n=200000):
+    t = np.linspace(t0, t1, n)
+    x = (major[0] * np.cos(t) + minor[0] * np.sin(t)) * xscale
+    y = (major[1] * np.cos(t) + minor[1] * np.sin(t)) * yscale
+    return np.column_stack([x, y])
+
+
+def test_ellipse_arc_length_matches_sampling():
+    angle = 0.3
+    major = (3 * math.cos(angle), 3 * math.sin(angle))
+    minor = (-1.2 * math.sin(angle), 1.2 * math.cos(angle))
+    for t0, t1 in [(0, 2 * math.pi), (0.4, 2.1), (5.0, 7.0)]:
+        exact = curve_geometry.ellipse_arc_length(3, 1.2, t0, t1)
+        assert math.isclose(exact, _sampled_length(_ellipse_points(major, minor, t0, t1)), rel_tol=1e-8)
+        scaled = curve_geometry.scaled_ellipse_arc_length(major, minor, t0, t1, 2.0, 0.5)
+        assert math.isclose(scaled, _sampled_length(_ellipse_points(major, minor, t0, t1, 2.0, 0.5)), rel_tol=1e-8)
+    assert math.isclose(curve_geometry.ellipse_arc_length(2, 2, 0, math.pi), 2 * math.pi)
+
+
+def test_spline_arc_length_non_rational_and_rational():
+    spline = BSpline([(0, 0), (1, 2), (2, -1), (3, 3), (3, 3), (5, 0)], order=4)
+    sampled = _sampled_length([(p.x, p.y) for p in spline.points(np.linspace(0, spline.max_t, 200000))])
+    assert math.isclose(curve_geometry.spline_arc_length(spline), sampled, rel_tol=1e-8)
+    quarter = BSpline.from_arc(ConstructionArc((0, 0), 2, 0, 90))
+    assert quarter.is_rational
+    assert math.isclose(curve_geometry.spline_arc_length(quarter), math.pi, rel_tol=1e-9)
+    assert math.isclose(curve_geometry.spline_arc_length(quarter, 3.0, 3.0), 3 * math.pi, rel_tol=1e-9)
+
+
+def test_chord_tolerance_scales_with_extent():
+    assert curve_geometry.chord_tolerance(None) == curve_geometry.DEFAULT_CHORD_ERROR_IN
+    assert curve_geometry.chord_tolerance(1.0) == curve_geometry.MIN_CHORD_ERROR_IN
+    assert curve_geometry.chord_tolerance(50.0) == 50.0 * curve_geometry.REL_CHORD_ERROR
+    assert curve_geometry.chord_tolerance(1e5) == curve_geometry.MAX_CHORD_ERROR_IN
+    # 0.002 in is 0.0508 mm in a millimetre drawing
+    assert math.isclose(curve_geometry.drawing_tolerance(0.002, 0.0393701), 0.0508, rel_tol=1e-5)
+    assert curve_geometry.header_extent((1e20, 1e20, 1e20), (-1e20, -1e20, -1e20)) is None
+    assert curve_geometry.header_extent((0, 0, 0), (10, 4, 0), 0.5) == 5.0
+
+
+def test_flatten_spline_memoizes_identical_definitions(monkeypatch):
+    import ezdxf
+    control_points = [(0, 0), (1, 2), (2, -1), (3, 3), (5, 0)]
+    splines = [ezdxf.new().modelspace().add_open_spline(control_points, degree=3) for _ in range(2)]
+    curve_geometry.clear_spline_cache()
+    points, length = curve_geometry.flatten_spline(splines[0], 0.001)
+    again, scaled = curve_geometry.flatten_spline(splines[1], 0.001, 2.0, 2.0)
+    assert curve_geometry.spline_key(splines[0]) == curve_geometry.spline_key(splines[1])
+    assert again is points
+    assert math.isclose(scaled, 2 * length, rel_tol=1e-12)
+    info = curve_geometry.spline_cache_info()
+    assert (info["hits"], info["misses"], info["entries"]) == (1, 1, 1)
+
+    # A different tolerance or x/y ratio is a separate entry; the oldest is evicted past the bound
+    monkeypatch.setattr(curve_geometry, 'SPLINE_CACHE_MAX_ENTRIES', 2)
+    curve_geometry.flatten_spline(splines[0], 0.01)
+    curve_geometry.flatten_spline(splines[0], 0.001, 1.0, 3.0)
+    info = curve_geometry.spline_cache_info()
+    assert (info["entries"], info["evictions"]) == (2, 1)
+    curve_geometry.clear_spline_cache()
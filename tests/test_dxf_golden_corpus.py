@@ -0,0 +1,29 @@
+# test_dxf_golden_corpus.py
+# Guards pricing-relevant parser outputs: every file in tests/test_files must still match
+# tests/golden/dxf_metrics.json. After an intentional metric change, re-run
+# `python scripts/dxf_golden_corpus.py record` and commit the updated golden file.
+
+import os
+import sys
+import json
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+import dxf_golden_corpus as golden_tool
+
+
+def test_diff_metrics_tolerances():
+    expected = {"total_length": 10.0, "net_area_sqin": 0.0, "entity_count": {"LINE": 4}}
+    assert golden_tool.diff_metrics(expected, {"total_length": 10.0 + 1e-9, "entity_count": {"LINE": 4}}) == []
+    diffs = golden_tool.diff_metrics(expected, {"total_length": 10.1, "entity_count": {"LINE": 5}})
+    assert {d["metric"] for d in diffs} == {"total_length", "entity_count.LINE"}
+
+
+def test_corpus_matches_golden_metrics():
+    with open(golden_tool.DEFAULT_GOLDEN, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    files = golden_tool.discover_dxf_files([golden_tool.DEFAULT_CORPUS])
+    report = golden_tool.check(files, golden, repeats=1)
+    failing = {name: entry["diffs"] for name, entry in report["files"].items() if entry["diffs"]}
+    assert not failing, f"Parser metrics drifted from golden: {failing}"
+    assert not report["missing"], f"Files missing from golden: {report['missing']}"
@@ -0,0 +1,106 @@
+# test_dxf_preflight.py
+# Checks the pre-flight sniff against ezdxf's view of the corpus and the reject/fast/heavy routing.
+
+import os
+import sys
+from collections import Counter
+
+import ezdxf
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import dxf_preflight
+
+TEST_FILES_DIR = os.path.join(script_dir, 'test_files')
+
+
+def test_sniff_matches_ezdxf_modelspace_counts():
+    for name in ('test1.dxf', '10x10 Square.dxf', 'lDCxP-the-mandalorian-star-wars-figure.dxf'):
+        path = os.path.join(TEST_FILES_DIR, name)
+        sniff = dxf_preflight.sniff_dxf(path)
+        doc = ezdxf.readfile(path)
+        assert sniff["modelspace_counts"] == dict(Counter(e.dxftype() for e in doc.modelspace()))
+        assert sniff["insunits"] == doc.header.get('$INSUNITS')
+        assert set(sniff["layers"]) <= {layer.dxf.name for layer in doc.layers}
+
+
+def test_corpus_routes_fast():
+    for name in os.listdir(TEST_FILES_DIR):
+        result = dxf_preflight.preflight(os.path.join(TEST_FILES_DIR, name))
+        assert result["route"] == dxf_preflight.ROUTE_FAST, (name, result["reasons"])
+
+
+def test_rejects_paperspace_only_and_3d_only(tmp_path):
+    doc = ezdxf.new()
+    doc.paperspace().add_line((0, 0), (10, 0))
+    paper_path = str(tmp_path / "paper.dxf")
+    doc.saveas(paper_path)
+    route, reasons = dxf_preflight.triage(dxf_preflight.sniff_dxf(paper_path))
+    assert route == dxf_preflight.ROUTE_REJECT and "paper space" in reasons[0]
+
+    doc = ezdxf.new()
+    mesh = doc.modelspace().add_mesh()
+    with mesh.edit_data() as data:
+        data.vertices = [(0, 0, 0), (1, 0, 0), (1, 1, 1)]
+        data.faces = [(0, 1, 2)]
+    mesh_path = str(tmp_path / "mesh.dxf")
+    doc.saveas(mesh_path)
+    route, reasons = dxf_preflight.triage(dxf_preflight.sniff_dxf(mesh_path))
+    assert route == dxf_preflight.ROUTE_REJECT and "3D" in reasons[0]
+
+
+def test_block_geometry_counts_through_insert(tmp_path):
+    doc = ezdxf.new()
+    block = doc.blocks.new("PART")
+    block.add_circle((0, 0), 1)
+    doc.modelspace().add_blockref("PART", (5, 5))
+    path = str(tmp_path / "insert.dxf")
+    doc.saveas(path)
+    sniff = dxf_preflight.sniff_dxf(path)
+    assert sniff["block_counts"] == {"CIRCLE": 1}
+    assert dxf_preflight.triage(sniff)[0] == dxf_preflight.ROUTE_FAST
+    assert dxf_preflight.triage(sniff, {"heavy_entities": 1})[0] == dxf_preflight.ROUTE_HEAVY
+
+
+def test_rejects_non_dxf_and_oversized(tmp_path):
+    path = tmp_path / "notes.dxf"
+    path.write_text("hello\nworld\n")
+    assert dxf_preflight.preflight(str(path))["route"] == dxf_preflight.ROUTE_REJECT
+    square = os.path.join(TEST_FILES_DIR, '10x10 Square.dxf')
+    assert dxf_preflight.preflight(square, {"max_bytes": 100})["route"] == dxf_preflight.ROUTE_REJECT
+
+
+def test_oversized_file_is_rejected_without_reading(tmp_path, monkeypatch):
+    square = os.path.join(TEST_FILES_DIR, '10x10 Square.dxf')
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("an oversized upload was opened")
+    monkeypatch.setattr(dxf_preflight, "open", refuse, raising=False)
+    result = dxf_preflight.preflight(square, {"max_bytes": 100})
+    assert result["route"] == dxf_preflight.ROUTE_REJECT and not result["complete"]
+    assert "limit" in result["reasons"][0]
+
+
+def test_counting_stops_past_the_entity_limit(tmp_path):
+    doc = ezdxf.new()
+    for k in range(50):
+        doc.modelspace().add_line((k, 0), (k, 1))
+    path = str(tmp_path / "lines.dxf")
+    doc.saveas(path)
+    result = dxf_preflight.preflight(path, {"max_entities": 10})
+    assert result["route"] == dxf_preflight.ROUTE_REJECT and not result["complete"]
+    assert result["modelspace_counts"] == {"LINE": 11}
+    assert dxf_preflight.sniff_dxf(path)["complete"]
+
+
+def test_every_measured_type_counts_as_cut_geometry(tmp_path):
+    import entity_handlers
+    assert set(entity_handlers.HANDLERS) - {"INSERT"} <= dxf_preflight.CUT_ENTITY_TYPES
+    doc = ezdxf.new()
+    doc.modelspace().add_solid([(0, 0), (4, 0), (0, 2), (4, 2)])
+    doc.modelspace().add_mline([(0, 5), (10, 5), (10, 8)])
+    path = str(tmp_path / "solid_mline.dxf")
+    doc.saveas(path)
+    sniff = dxf_preflight.sniff_dxf(path)
+    assert sniff["modelspace_counts"] == {"SOLID": 1, "MLINE": 1}
+    assert dxf_preflight.triage(sniff)[0] == dxf_preflight.ROUTE_FAST
@@ -0,0 +1,73 @@
+# test_entity_handlers.py
+# Checks the per-type entity handler registry: new types, the virtual_entities() fallback, handler swaps
+# and the per-handler timings.
+
+import os
+import sys
+import math
+
+import ezdxf
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import entity_handlers
+import dxf_parser
+
+
+def _parse(tmp_path, draw):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    draw(doc.modelspace())
+    path = str(tmp_path / "entities.dxf")
+    doc.saveas(path)
+    return dxf_parser.parse_dxf(path)
+
+
+def test_solid_and_trace_are_cut_along_their_outline(tmp_path):
+    def draw(msp):
+        msp.add_solid([(0, 0), (4, 0), (0, 3), (4, 3)])  # SOLID corner order: the quad's Z path
+        msp.add_trace([(10, 0), (13, 0), (10, 4)])
+    result = _parse(tmp_path, draw)
+    assert math.isclose(result['total_length'], 14 + 12)
+    assert (result['entity_count']['SOLID'], result['entity_count']['TRACE']) == (1, 1)
+    assert result['contour_count'] == 2
+
+
+def test_hatch_polyline_and_ellipse_boundaries(tmp_path):
+    def draw(msp):
+        hatch = msp.add_hatch()
+        hatch.paths.add_polyline_path([(0, 0), (6, 0), (6, 2), (0, 2)], is_closed=True)
+        edges = hatch.paths.add_edge_path()
+        edges.add_ellipse((20, 0), major_axis=(2, 0), ratio=1.0, start_angle=0, end_angle=360)
+    result = _parse(tmp_path, draw)
+    assert math.isclose(result['total_length'], 16 + 4 * math.pi, rel_tol=1e-6)
+    assert result['entity_count']['HATCH'] == 1
+
+
+def test_types_without_handler_use_virtual_entities(tmp_path):
+    def draw(msp):
+        msp.add_mline([(0, 0), (10, 0)])
+        msp.add_point((5, 5))
+    result = _parse(tmp_path, draw)
+    assert result['entity_count']['MLINE'] == 1 and result['entity_count']['LINE'] >= 2
+    assert result['entity_count']['OTHER'] == 1  # the POINT is never expanded into marker lines
+    assert result['total_length'] >= 20
+
+
+def test_handlers_can_be_swapped_and_timed(tmp_path):
+    original = entity_handlers.HANDLERS["CIRCLE"]
+    seen = []
+
+    @entity_handlers.register("CIRCLE")
+    def count_only(ctx, entity, matrix, depth, layer):
+        seen.append(entity.dxf.radius)
+        ctx.entity_count["CIRCLE"] += 1
+
+    entity_handlers.clear_handler_stats()
+    try:
+        result = _parse(tmp_path, lambda msp: [msp.add_circle((0, 0), 2), msp.add_line((0, 0), (3, 4))])
+    finally:
+        entity_handlers.register("CIRCLE")(original)
+    assert seen == [2] and result['total_length'] == 5
+    stats = entity_handlers.handler_stats()
+    assert stats["CIRCLE"]["calls"] == 1 and stats["LINE"]["calls"] == 1
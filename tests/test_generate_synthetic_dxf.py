@@ -0,0 +1,39 @@
+# test_generate_synthetic_dxf.py
+# Checks that each synthetic DXF generator writes a readable drawing with the requested amount of geometry.
+
+import os
+import sys
+
+import ezdxf
+import pytest
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+import generate_synthetic_dxf as synth
+
+
+@pytest.mark.parametrize("kind", sorted(synth.GENERATORS))
+def test_generator_writes_readable_dxf(kind, tmp_path):
+    path = synth.generate(kind, 40, str(tmp_path / f"{kind}.dxf"))
+    doc = ezdxf.readfile(path)
+    assert doc.header['$INSUNITS'] == synth.INSUNITS_INCHES
+    assert len(doc.modelspace()) > 0
+
+
+def test_entity_counts_match_size(tmp_path):
+    doc = ezdxf.readfile(synth.generate("circles", 25, str(tmp_path / "c.dxf")))
+    assert len(doc.modelspace().query('CIRCLE')) == 25
+    doc = ezdxf.readfile(synth.generate("perforated", 30, str(tmp_path / "p.dxf")))
+    assert len(doc.modelspace().query('CIRCLE')) == 30
+    assert len(doc.modelspace().query('LWPOLYLINE')) == 1
+
+
+def test_nested_inserts_depth(tmp_path):
+    doc = ezdxf.readfile(synth.generate("nested_inserts", 100, str(tmp_path / "n.dxf"), depth=3, fanout=2))
+    assert 'LEVEL_2' in doc.blocks
+    assert len(doc.modelspace().query('INSERT')) == 2
+
+
+def test_unknown_kind_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        synth.generate("teapot", 10, str(tmp_path / "x.dxf"))
@@ -0,0 +1,83 @@
+# test_layer_profiles.py
+# Checks geometry-driven cut/reference layer classification.
+
+import os
+import sys
+import math
+
+import ezdxf
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import layer_profiles
+import dxf_parser
+
+CUT_LAYERS = ["0", "1", "cut"]
+REFERENCE_LAYERS = ["dimension", "center"]
+
+
+def _drawing():
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    doc.linetypes.add("DASHED", [0.6, 0.5, -0.1])
+    doc.layers.add("PLASMA")
+    doc.layers.add("SKETCH")
+    doc.layers.add("NOTES")
+    doc.layers.add("HIDDEN_LINES", linetype="DASHED")
+    msp = doc.modelspace()
+    # Unknown layer holding a closed outline of LINEs and a hole
+    corners = [(0, 0), (10, 0), (10, 5), (0, 5)]
+    for a, b in zip(corners, corners[1:] + corners[:1]):
+        msp.add_line(a, b, dxfattribs={'layer': 'PLASMA'})
+    msp.add_circle((5, 2.5), 1, dxfattribs={'layer': 'PLASMA'})
+    # Unknown layers: loose construction lines, and notes
+    msp.add_line((-5, -5), (15, 10), dxfattribs={'layer': 'SKETCH'})
+    msp.add_line((-5, 10), (15, -5), dxfattribs={'layer': 'SKETCH'})
+    msp.add_text("NOTE 1", dxfattribs={'layer': 'NOTES'})
+    msp.add_text("NOTE 2", dxfattribs={'layer': 'NOTES'})
+    msp.add_line((0, 6), (10, 6), dxfattribs={'layer': 'NOTES'})
+    # Listed cut layer drawn entirely dashed
+    msp.add_lwpolyline(corners, close=True, dxfattribs={'layer': 'CUT', 'linetype': 'DASHED'})
+    msp.add_lwpolyline(corners, close=True, dxfattribs={'layer': 'HIDDEN_LINES'})
+    return doc
+
+
+def test_unknown_layers_are_classified_by_geometry():
+    roles = layer_profiles.classify_layers(_drawing(), CUT_LAYERS, REFERENCE_LAYERS)
+    assert roles['plasma'] == layer_profiles.CUT
+    assert roles['sketch'] == layer_profiles.REFERENCE
+    assert roles['notes'] == layer_profiles.REFERENCE
+    assert roles['hidden_lines'] == layer_profiles.REFERENCE
+    assert roles['cut'] == layer_profiles.REFERENCE  # listed, but every entity is dashed
+
+
+def test_layer_one_is_reference_when_layer_zero_cuts():
+    doc = ezdxf.new()
+    doc.layers.add("1")
+    doc.modelspace().add_circle((0, 0), 1)
+    doc.modelspace().add_circle((5, 0), 1, dxfattribs={'layer': '1'})
+    roles = layer_profiles.classify_layers(doc, CUT_LAYERS, REFERENCE_LAYERS)
+    assert (roles['0'], roles['1']) == (layer_profiles.CUT, layer_profiles.REFERENCE)
+
+
+def test_same_layer_table_with_different_geometry_is_classified_per_file(tmp_path):
+    paths = {}
+    for name, layers in (("a", ("0", "1")), ("b", ("1",))):
+        doc = ezdxf.new()
+        doc.header['$INSUNITS'] = 1
+        doc.layers.add("1")
+        for k, layer in enumerate(layers):
+            doc.modelspace().add_circle((10 * k, 0), 1, dxfattribs={'layer': layer})
+        paths[name] = str(tmp_path / f"{name}.dxf")
+        doc.saveas(paths[name])
+    alone = dxf_parser.parse_dxf(paths["b"])['total_length']
+    dxf_parser.parse_dxf(paths["a"])  # cuts layer 0, so layer 1 is construction here
+    assert math.isclose(dxf_parser.parse_dxf(paths["b"])['total_length'], alone) and alone > 0
+
+
+def test_parse_cuts_unlisted_outline_layer(tmp_path):
+    path = str(tmp_path / "plasma_layer.dxf")
+    _drawing().saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    assert math.isclose(result['total_length'], 30 + 2 * math.pi)
+    assert (result['gross_max_x'], result['gross_max_y']) == (10, 5)
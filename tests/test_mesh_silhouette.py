@@ -0,0 +1,57 @@
+# test_mesh_silhouette.py
+# Checks that 3DFACE meshes are measured by their flat silhouette instead of every triangle edge.
+
+import os
+import sys
+
+import ezdxf
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import mesh_silhouette
+import dxf_parser
+
+
+def _plate_faces(z=0.0):
+    """Triangulated 10 x 6 plate with a 2 x 2 hole, as a 3D modeller exports one face of it."""
+    faces = []
+    for x0 in range(10):
+        for y0 in range(6):
+            if x0 in (4, 5) and y0 in (2, 3):
+                continue
+            x1, y1 = x0 + 1, y0 + 1
+            faces.append([(x0, y0, z), (x1, y0, z), (x1, y1, z)])
+            faces.append([(x0, y0, z), (x1, y1, z), (x0, y1, z)])
+    return faces
+
+
+def test_silhouette_keeps_outline_and_hole():
+    faces = [[point[:2] for point in face] for face in _plate_faces()]
+    rings = mesh_silhouette.silhouette(faces)
+    perimeters = sorted(float(np.hypot(*np.diff(ring, axis=0).T).sum()) for ring in rings)
+    assert np.allclose(perimeters, [8, 32])
+
+
+def test_edge_on_faces_are_dropped():
+    faces = [[(0, 0), (1, 0), (1, 0), (0, 0)], [(0, 0), (2, 0), (2, 1)]]
+    assert len(mesh_silhouette.face_polygons(faces)) == 1
+    assert len(mesh_silhouette.silhouette(faces[:1])) == 0
+
+
+def test_parse_measures_mesh_silhouette(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    # Top and bottom faces of a 0.5" plate plus its side walls
+    for face in _plate_faces(0) + _plate_faces(0.5):
+        msp.add_3dface(face)
+    corners = [(0, 0), (10, 0), (10, 6), (0, 6)]
+    for a, b in zip(corners, corners[1:] + corners[:1]):
+        msp.add_3dface([(*a, 0), (*b, 0), (*b, 0.5), (*a, 0.5)])
+    path = str(tmp_path / "mesh.dxf")
+    doc.saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    assert np.isclose(result['total_length'], 40)
+    assert [item['source'] for item in result['preview']] == ['mesh-silhouette'] * 2
+    assert result['part_count'] == 1 and result['parts'][0]['net_area_sqin'] == 56
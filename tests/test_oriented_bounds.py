@@ -0,0 +1,71 @@
+# test_oriented_bounds.py
+# Checks the minimum-area oriented rectangle (convex hull + rotating calipers) and the oriented gross area
+# parse_dxf reports for a part drawn at an angle.
+
+import os
+import sys
+import math
+
+import ezdxf
+import numpy as np
+import pytest
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import oriented_bounds
+import dxf_parser
+
+
+def _rotated_plate(angle_deg, width=10.0, height=4.0, origin=(5.0, 7.0)):
+    a = math.radians(angle_deg)
+    rotation = np.array([[math.cos(a), -math.sin(a)], [math.sin(a), math.cos(a)]])
+    return np.array([[0, 0], [width, 0], [width, height], [0, height]]) @ rotation.T + origin
+
+
+@pytest.mark.parametrize("angle", [0, 10, 45, 80, 90, 135])
+def test_rotated_rectangle_is_recovered(angle):
+    box = oriented_bounds.min_area_rectangle(_rotated_plate(angle))
+    assert math.isclose(box["area"], 40.0)
+    assert math.isclose(box["angle_deg"], angle % 90, abs_tol=1e-9)
+    assert sorted([box["width"], box["height"]]) == pytest.approx([4.0, 10.0])
+
+
+def test_matches_brute_force_over_hull_edges():
+    rng = np.random.default_rng(7)
+    for _ in range(100):
+        points = rng.normal(size=(int(rng.integers(3, 80)), 2)) * rng.uniform(0.1, 10, 2)
+        hull = oriented_bounds.convex_hull(points)
+        best = min(np.ptp(hull @ [math.cos(a), math.sin(a)]) * np.ptp(hull @ [-math.sin(a), math.cos(a)])
+                   for a in np.arctan2(*(np.roll(hull, -1, axis=0) - hull).T[::-1]))
+        assert math.isclose(oriented_bounds.min_area_rectangle(points)["area"], best, rel_tol=1e-9)
+    assert oriented_bounds.min_area_rectangle([]) is None
+    assert oriented_bounds.min_area_rectangle([(0, 0), (3, 3), (1, 1)])["area"] == 0
+
+
+def test_parse_reports_oriented_gross_area(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline(_rotated_plate(45).tolist(), close=True)
+    msp.add_circle(tuple(_rotated_plate(45).mean(axis=0)), 1.0)
+    path = str(tmp_path / "rotated.dxf")
+    doc.saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    assert result.gross_area_sqin == pytest.approx(98.0)  # the axis-aligned box of a 10 x 4 plate at 45 degrees
+    assert result.oriented_area_sqin == pytest.approx(40.0, rel=1e-3)
+    assert result.oriented_angle_deg == pytest.approx(45.0)
+    assert result.parts[0]["oriented_area_sqin"] == pytest.approx(40.0, abs=0.1)  # snapped contour face
+
+
+def test_only_arcs_on_the_hull_pad_the_box(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline(_rotated_plate(45).tolist(), close=True)
+    msp.add_circle(tuple(_rotated_plate(45).mean(axis=0)), 1.9)  # a bore nearly as wide as the plate
+    msp.add_circle((40, 40), 2.0)  # a disc: its flattened outline sits inside the true circle
+    path = str(tmp_path / "bored.dxf")
+    doc.saveas(path)
+    plate, disc = sorted(dxf_parser.parse_dxf(path).parts, key=lambda part: part["gross_min_x"])
+    assert plate["oriented_area_sqin"] == pytest.approx(40.0, abs=0.01)  # unpadded: the bore is inside the hull
+    assert disc["oriented_area_sqin"] == pytest.approx(16.0, abs=0.01)  # padded: unpadded chords give 15.96
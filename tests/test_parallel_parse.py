@@ -0,0 +1,92 @@
+# test_parallel_parse.py
+# Checks chunked parallel measurement: shared memory round trips, error propagation, that a parse split across
+# workers reduces to the same metrics as a serial one, and that uploads and threaded processes never fork.
+
+import os
+import sys
+import math
+import threading
+
+import numpy as np
+import pytest
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+import parallel_parse
+import dxf_parser
+import generate_synthetic_dxf
+
+needs_fork = pytest.mark.skipif(not parallel_parse.fork_available(), reason="fork start method unavailable")
+
+
+def test_chunks_and_ragged_round_trip():
+    assert parallel_parse.chunk_bounds(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    curves = [[[0, 0], [1, 1]], [], [[2, 2], [3, 3], [4, 4]]]
+    assert parallel_parse.split_ragged(*parallel_parse.ragged_array(curves)) == curves
+    assert parallel_parse.worker_count(100, workers=8) == 1  # too few entities to split
+    assert parallel_parse.worker_count(100000) == 1  # the pool is opt-in
+
+
+@needs_fork
+def test_no_pool_while_other_threads_run():
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait)
+    thread.start()
+    try:
+        assert not parallel_parse.fork_safe()
+        assert parallel_parse.worker_count(5000, workers=4) == 1
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_shared_memory_block_is_freed():
+    array = np.arange(12, dtype=float).reshape(4, 3)
+    handle = parallel_parse.to_shared(array)
+    assert np.array_equal(parallel_parse.from_shared(handle), array)
+    with pytest.raises(FileNotFoundError):
+        parallel_parse.from_shared(handle)
+
+
+@needs_fork
+def test_worker_errors_are_reraised():
+    def job(lo, hi):
+        if lo:
+            raise TimeoutError("Parsing timeout")
+        return {"points": np.zeros((3, 2))}
+
+    with pytest.raises(TimeoutError):
+        parallel_parse.measure_chunks(job, 1000, 2)
+
+
+@needs_fork
+def test_parallel_parse_matches_serial(tmp_path):
+    path = str(tmp_path / "mixed.dxf")
+    generate_synthetic_dxf.generate('mixed', 900, path)
+    assert parallel_parse.worker_count(900, workers=3) == 3
+    serial = dxf_parser.parse_dxf(path, workers=1)
+    parallel = dxf_parser.parse_dxf(path, workers=3)
+    for key in ("total_length", "net_area_sqin", "gross_area_sqin", "duplicate_length"):
+        assert math.isclose(serial[key], parallel[key], rel_tol=1e-9)
+    assert (serial["contour_count"], serial["part_count"]) == (parallel["contour_count"], parallel["part_count"])
+    assert serial["entity_count"] == parallel["entity_count"]
+    assert serial["preview"] == parallel["preview"]
+
+
+def test_upload_route_parses_serially(tmp_path, monkeypatch):
+    import soak_parse_calculate
+    path = tmp_path / "mixed.dxf"
+    generate_synthetic_dxf.generate('mixed', 900, str(path))
+    upload_folder = tmp_path / "uploads"
+    upload_folder.mkdir()
+    flask_app, db = soak_parse_calculate.create_soak_app(str(upload_folder))
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("the upload route forked a parse pool")
+    monkeypatch.setattr(sys.modules['app.utils.parallel_parse'], "measure_chunks", refuse)
+    client = flask_app.test_client()
+    with open(path, 'rb') as f:
+        response = client.post('/parse_dxf', data={'file': (f, 'mixed.dxf')}, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_json()
+    client.post('/api/clear')
@@ -0,0 +1,84 @@
+# test_parse_quarantine.py
+# Checks slow/failed parse capture into the quarantine store and the replay CLI.
+
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+import parse_quarantine
+import replay_parse_quarantine as replay
+
+TEST_FILE = os.path.join(script_dir, 'test_files', 'test1.dxf')
+
+
+def test_classify_parse():
+    clean = {"preview": [{"type": "line"}]}
+    assert parse_quarantine.classify_parse(clean, 0.1, 5.0) is None
+    assert parse_quarantine.classify_parse(clean, 6.0, 5.0) == "slow"
+    timeout = {"preview": [{"type": "error", "message": "Timeout parsing a.dxf"}]}
+    assert parse_quarantine.classify_parse(timeout, 30.0, 5.0) == "timeout"
+    failed = {"preview": [{"type": "error", "message": "Failed to parse a.dxf: bad"}]}
+    assert parse_quarantine.classify_parse(failed, 0.1, 5.0) == "error"
+    assert parse_quarantine.classify_parse(None, 0.1, 5.0, error=ValueError("x")) == "error"
+    # The drawing's own problems are not parser failures
+    empty = {"preview": [{"type": "error", "message": "No cuttable geometry could be parsed from a.dxf."}]}
+    assert parse_quarantine.classify_parse(empty, 0.1, 5.0) is None
+    spline = {"preview": [{"type": "error", "message": "SPLINE processing failed on layer 0: bad knots"}]}
+    assert parse_quarantine.classify_parse(spline, 0.1, 5.0) is None
+
+
+def test_capture_dedupes_by_content(tmp_path):
+    store = str(tmp_path / "quarantine")
+    parse_quarantine.capture_parse(TEST_FILE, store, "slow", 6.5, part_number="a.dxf",
+                                   parse_kwargs={"material": "A36 Steel"})
+    record = parse_quarantine.capture_parse(TEST_FILE, store, "timeout", 30.0, part_number="b.dxf")
+    assert len(os.listdir(store)) == 2
+    assert record["part_numbers"] == ["a.dxf", "b.dxf"]
+    assert record["worst_parse_ms"] == 30000.0
+    assert record["captures"][0]["parser_build"]["dxf_parser_sha256"]
+    assert record["captures"][1]["parser_config"] == {}
+    assert parse_quarantine.capture_parse(TEST_FILE, "", "slow", 6.5) is None
+
+
+def test_upload_route_stores_the_parser_config(tmp_path):
+    import soak_parse_calculate
+    upload_folder = tmp_path / "uploads"
+    upload_folder.mkdir()
+    flask_app, db = soak_parse_calculate.create_soak_app(str(upload_folder))
+    assert not flask_app.config['PARSE_QUARANTINE_FOLDER']  # opt-in
+    store = str(tmp_path / "quarantine")
+    flask_app.config.update(PARSE_QUARANTINE_FOLDER=store, SLOW_PARSE_SECONDS=1e-9)  # every parse is "slow"
+    client = flask_app.test_client()
+    with open(TEST_FILE, 'rb') as f:
+        client.post('/parse_dxf', data={'file': (f, 'test1.dxf')}, content_type='multipart/form-data')
+    client.post('/api/clear')
+    config = parse_quarantine.list_entries(store)[0]["captures"][0]["parser_config"]
+    assert config["max_entities"] > 0 and config["timeout_seconds"] > 0 and "cut_layers" in config
+
+
+def test_store_evicts_oldest_files_past_its_limits(tmp_path):
+    store = str(tmp_path / "quarantine")
+    names = ['test1.dxf', 'test2.dxf', 'test3.dxf']
+    for name in names:
+        parse_quarantine.capture_parse(os.path.join(script_dir, 'test_files', name), store, "slow", 6.0,
+                                       part_number=name, parser_config={"max_entities": 1000}, max_files=2)
+    kept = parse_quarantine.list_entries(store)
+    assert sorted(r["part_numbers"][0] for r in kept) == ['test2.dxf', 'test3.dxf']
+    assert kept[0]["captures"][0]["parser_config"] == {"max_entities": 1000}
+    newest = os.path.join(script_dir, 'test_files', '10x10 Square.dxf')
+    parse_quarantine.capture_parse(newest, store, "slow", 6.0, max_bytes=os.path.getsize(newest))
+    assert [r["part_numbers"] for r in parse_quarantine.list_entries(store)] == [['10x10 Square.dxf']]
+
+
+def test_replay_reports_timings(tmp_path):
+    store = str(tmp_path / "quarantine")
+    parse_quarantine.capture_parse(TEST_FILE, store, "slow", 6.5, part_number="test1.dxf")
+    report = replay.replay(store, repeats=2)
+    row = report["entries"][0]
+    assert row["part_numbers"] == ["test1.dxf"]
+    assert len(row["replay_times_ms"]) == 2
+    assert row["outcome"] == "ok"
+    exported = replay.export_corpus(store, str(tmp_path / "corpus"))
+    assert os.path.basename(exported[0]).startswith("test1_")
@@ -0,0 +1,42 @@
+# test_parse_result.py
+# Checks the slotted ParseResult: dict-style access for existing callers and lazy preview serialization.
+
+import os
+import sys
+import json
+
+import pytest
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import parse_result
+import dxf_parser
+
+
+def test_mapping_access_and_slots():
+    result = parse_result.ParseResult(total_length=12.5, entity_count={"LINE": 4})
+    assert result["total_length"] == result.get("total_length") == result.total_length == 12.5
+    assert result.get("missing", 7) == 7 and "parts" in result
+    with pytest.raises(KeyError):
+        result["missing"]
+    with pytest.raises(AttributeError):
+        result.extra = 1  # slotted: no per-instance __dict__
+    assert set(result.to_dict()) == set(parse_result.FIELDS) == set(dict(result))
+
+
+def test_preview_is_serialized_once_on_demand():
+    preview = [{"type": "line", "start": [0, 0], "end": [i, 1]} for i in range(200)]
+    result = parse_result.ParseResult(preview=preview)
+    head = result.preview_head(100)
+    assert len(head) == 100 and json.dumps(preview).startswith(head)
+    assert result._preview_json is None  # the log head did not serialize everything
+    text = result.preview_json()
+    assert json.loads(text) == preview and result.preview_json() is text
+    assert parse_result.dump_preview({"preview": preview[:1]}) == json.dumps(preview[:1])
+
+
+def test_parse_dxf_returns_parse_result():
+    result = dxf_parser.parse_dxf(os.path.join(script_dir, 'test_files', '10x10 Square.dxf'))
+    assert isinstance(result, parse_result.ParseResult)
+    assert result.total_length == result["total_length"] > 0
+    assert json.loads(parse_result.dump_preview(result)) == result.preview
@@ -0,0 +1,71 @@
+# test_part_fingerprint.py
+# Checks the geometric part fingerprint: re-exports of a part (moved, rotated, entities re-ordered) match,
+# a changed part does not, and the upload route reports a re-exported part already in the cart.
+
+import os
+import sys
+import math
+
+import ezdxf
+from ezdxf.math import Matrix44
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import dxf_parser
+
+
+def _bracket(path, hole=(3, 2), angle=0.0, offset=(0.0, 0.0), reverse=False):
+    """A 10 x 4 plate with a chamfered corner, a round hole and a slot, optionally moved and turned."""
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    entities = [
+        msp.add_lwpolyline([(0, 0), (10, 0), (10, 3), (9, 4), (0, 4)], close=True),
+        msp.add_circle(hole, 0.5),
+        msp.add_lwpolyline([(6, 1.5, 0), (8, 1.5, 1), (8, 2.5, 0), (6, 2.5, 1)], format='xyb', close=True),
+    ]
+    placement = Matrix44.chain(Matrix44.z_rotate(math.radians(angle)), Matrix44.translate(*offset, 0))
+    for entity in entities:
+        entity.transform(placement)
+    if reverse:
+        for entity in entities:
+            msp.unlink_entity(entity)
+        for entity in reversed(entities):
+            msp.add_entity(entity)
+    doc.saveas(path)
+    return dxf_parser.parse_dxf(path)
+
+
+def test_moved_turned_and_reordered_copies_match(tmp_path):
+    original = _bracket(str(tmp_path / "original.dxf"))
+    assert len(original.fingerprint) == 32 and original.parts[0]["fingerprint"]
+    for k, (angle, offset) in enumerate([(0, (123.4567, -8.9012)), (90, (-3.21, 7.0)), (270, (0.0005, 0.0)),
+                                         (180, (55.5, 44.4)), (30, (1.0, 2.0))]):
+        copy = _bracket(str(tmp_path / f"copy{k}.dxf"), angle=angle, offset=offset, reverse=k % 2 == 0)
+        assert copy.fingerprint == original.fingerprint, (angle, offset)
+
+
+def test_changed_part_gets_another_fingerprint(tmp_path):
+    original = _bracket(str(tmp_path / "original.dxf"))
+    moved_hole = _bracket(str(tmp_path / "moved_hole.dxf"), hole=(3, 1.5))
+    assert moved_hole.fingerprint != original.fingerprint
+
+
+def test_route_reports_a_re_exported_part_as_duplicate(tmp_path):
+    sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+    import soak_parse_calculate
+    upload_folder = tmp_path / "uploads"
+    upload_folder.mkdir()
+    _bracket(str(tmp_path / "bracket.dxf"))
+    _bracket(str(tmp_path / "bracket_rev_b.dxf"), angle=90, offset=(40, 40), reverse=True)
+    flask_app, db = soak_parse_calculate.create_soak_app(str(upload_folder))
+    client = flask_app.test_client()
+    with open(tmp_path / "bracket.dxf", 'rb') as f:
+        first = client.post('/parse_dxf', data={'file': (f, 'bracket.dxf')}, content_type='multipart/form-data').get_json()
+    with open(tmp_path / "bracket_rev_b.dxf", 'rb') as f:
+        second = client.post('/parse_dxf', data={'file': (f, 'bracket_rev_b.dxf')}, content_type='multipart/form-data').get_json()
+    assert "duplicates" not in first
+    assert second["duplicates"] == [{"part_number": "bracket_rev_b.dxf", "matches": "bracket.dxf"}]
+    stored = [item for item in db.order_items.find({}) if item['part_number'] in ('bracket.dxf', 'bracket_rev_b.dxf')]
+    assert len(stored) == 2 and stored[0]['fingerprint'] == stored[1]['fingerprint']
+    client.post('/api/clear')
@@ -0,0 +1,69 @@
+# test_pricing_config.py
+# Checks the cached pricing configuration registry: parsing, immutability, mtime reloads and version stamps.
+
+import os
+import sys
+
+import pytest
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import pricing_config
+
+
+def test_repo_inputs_parse_like_the_legacy_loader():
+    inputs = pricing_config.get_inputs()
+    assert inputs["kerf_thickness"]["value"] == 0.05
+    assert inputs["pierce_time"].unit == "sec"  # inline comment stripped
+    assert inputs.value("cut_speed_1.0") == 25.0  # later duplicate wins
+    assert inputs.get("no_such_key", {"value": 7})["value"] == 7
+    densities = pricing_config.get_material_densities()
+    assert densities[0]["material"] == "A36 Steel" and densities[0].density == 0.2836
+
+
+def test_objects_are_immutable():
+    inputs = pricing_config.get_inputs()
+    with pytest.raises(TypeError):
+        inputs["margin"] = 0.9
+    with pytest.raises(AttributeError):
+        inputs["margin"].value = 0.9
+
+
+def test_reloads_only_when_file_changes(tmp_path):
+    path = tmp_path / "inputs.csv"
+    path.write_text("parameter,value,unit\nmargin,0.5,unitless\n")
+    registry = pricing_config.ConfigRegistry()
+    first = registry.inputs(str(path))
+    assert registry.inputs(str(path)) is first
+
+    path.write_text("parameter,value,unit\nmargin,0.4,unitless\n")
+    os.utime(path, ns=(os.stat(path).st_mtime_ns + 10**9,) * 2)
+    second = registry.inputs(str(path))
+    assert second is not first
+    assert second.value("margin") == 0.4
+    assert second.version != first.version
+
+    registry.invalidate()
+    assert registry.inputs(str(path)) is not second
+
+
+def test_missing_files(tmp_path):
+    registry = pricing_config.ConfigRegistry()
+    inputs = registry.inputs(str(tmp_path / "absent.csv"))
+    assert len(inputs) == 0 and inputs.version == "missing"
+    bad = tmp_path / "densities.csv"
+    bad.write_text("name,rho\nSteel,1\n")
+    assert pricing_config.parse_material_densities(bad.read_text(), path=str(bad)) is None
+
+
+def test_material_catalog_indexes_density_and_process():
+    catalog = pricing_config.get_material_catalog()
+    assert catalog.density("Stainless 304") == 0.289
+    steel, stainless = catalog.process("A36 Steel", 0.5), catalog.process("Stainless 304", 0.5)
+    assert steel.cut_speed > stainless.cut_speed
+    assert catalog.process("A36 Steel", 0.375).thickness == 0.5  # nearest thicker row
+    assert catalog.process("A36 Steel", 3.0) is None
+    assert catalog.process("Unobtainium", 0.5) is None
+    assert pricing_config.get_material_catalog() is catalog
+    with pytest.raises(ValueError):
+        catalog.density("Unobtainium")
@@ -0,0 +1,95 @@
+# test_segment_dedup.py
+# Checks that stacked duplicates and collinear/concentric overlaps are cut once, in the dedup stage and in
+# parse_dxf's total_length.
+
+import os
+import sys
+import math
+import time
+
+import ezdxf
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import segment_dedup
+import dxf_parser
+
+
+def _line(sx, sy, ex, ey):
+    return (sx, sy, ex, ey, math.hypot(ex - sx, ey - sy))
+
+
+def test_reversed_duplicates_and_collinear_overlaps():
+    lines = [_line(0, 0, 10, 0), _line(10, 0, 0, 0), _line(5, 0, 15, 0), _line(20, 0, 25, 0),
+             _line(0, 1, 10, 1)]
+    removed, duplicates, overlap = segment_dedup.dedupe_lines(lines)
+    assert duplicates == 1
+    assert math.isclose(overlap, 5.0)
+    assert math.isclose(removed, 15.0)
+    # Diagonal overlap, and parallel segments that do not touch
+    assert math.isclose(segment_dedup.dedupe_lines([_line(0, 0, 3, 4), _line(1.5, 2, 6, 8)])[0], 2.5)
+    assert segment_dedup.dedupe_lines([_line(0, 0, 10, 0), _line(0, 0.01, 10, 0.01)])[0] == 0
+
+
+def test_concentric_arcs_and_stacked_circles():
+    quarter = math.pi / 2
+    arcs = [(0, 0, 1, 0, 360, 2 * math.pi), (0, 0, 1, 0, 360, 2 * math.pi),  # stacked circle
+            (5, 5, 2, 0, 90, quarter * 2), (5, 5, 2, 45, 135, quarter * 2),   # 45 degrees overlap
+            (9, 9, 1, 350, 370, math.radians(20)), (9, 9, 1, 0, 5, math.radians(5))]  # overlap across 0
+    removed = segment_dedup.dedupe_arcs(arcs)
+    assert math.isclose(removed, 2 * math.pi + 2 * math.radians(45) + math.radians(5))
+
+
+def test_dedupe_is_near_linear_on_large_inputs():
+    rng = np.random.default_rng(3)
+    pts = rng.uniform(0, 100, size=(40000, 4))
+    lines = [tuple(row) + (0.0,) for row in pts.tolist()]
+    start = time.perf_counter()
+    removed, duplicates, _ = segment_dedup.dedupe_lines(lines + lines[:1000])
+    assert duplicates == 1000
+    assert time.perf_counter() - start < 5.0
+
+
+def test_parse_removes_outline_drawn_twice(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (10, 0), (10, 5), (0, 5)], close=True)
+    msp.add_line((0, 0), (10, 0))          # stacked on the polyline edge
+    msp.add_line((10, 5), (4, 5))          # overlaps the top edge
+    msp.add_circle((5, 2.5), 1)
+    msp.add_circle((5, 2.5), 1)
+    path = str(tmp_path / "doubled.dxf")
+    doc.saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    assert math.isclose(result['duplicate_length'], 10 + 6 + 2 * math.pi)
+    assert math.isclose(result['total_length'], 30 + 2 * math.pi)
+
+
+def test_bulged_spans_become_counter_clockwise_arcs():
+    (cx, cy, radius, start, end, length), = segment_dedup.polyline_arcs([(0, 0), (2, 0)], bulges=[1, 0])
+    assert (cx, cy, radius, start, end) == (1, 0, 1, 180, 360)  # positive bulge: counter-clockwise, below
+    assert math.isclose(length, math.pi)
+    assert segment_dedup.polyline_arcs([(0, 0), (2, 0)], bulges=[1, 0], mirrored=True)[0][3:5] == (0, 180)
+    assert segment_dedup.polyline_arcs([(0, 0), (2, 0)], bulges=[0, 0]) == []
+
+
+def test_parse_removes_hatch_over_filleted_outline(tmp_path):
+    fillet = math.tan(math.radians(22.5))  # 90 degree corner of radius 1
+    vertices = [(1, 0, 0), (11, 0, fillet), (12, 1, 0), (12, 9, fillet), (11, 10, 0), (1, 10, fillet),
+                (0, 9, 0), (0, 1, fillet)]
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline(vertices, format='xyb', close=True)
+    msp.add_hatch().paths.add_polyline_path(vertices, is_closed=True)
+    # A half-slot: the straight edge is the bulged span's chord but a different cut
+    msp.add_lwpolyline([(20, 0, 1), (22, 0, 0)], format='xyb')
+    msp.add_line((20, 0), (22, 0))
+    path = str(tmp_path / "filleted.dxf")
+    doc.saveas(path)
+    result = dxf_parser.parse_dxf(path)
+    outline = 2 * 10 + 2 * 8 + 2 * math.pi
+    assert math.isclose(result['duplicate_length'], outline, rel_tol=1e-6)
+    assert math.isclose(result['total_length'], outline + math.pi + 2, rel_tol=1e-6)
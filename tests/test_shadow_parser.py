@@ -0,0 +1,64 @@
+# test_shadow_parser.py
+# Checks shadow-mode comparison: metric diffs, the background submit path and the report summary.
+
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+import dxf_parser
+import shadow_parser
+from local_stand_ins import InMemoryCollection
+
+TEST_FILE = os.path.join(script_dir, 'test_files', 'test1.dxf')
+
+
+def test_compare_results_reports_relative_differences():
+    primary = {"total_length": 100.0, "net_area_sqin": 10.0, "entity_count": {"LINE": 2}}
+    candidate = {"total_length": 101.0, "net_area_sqin": 10.0, "entity_count": {"LINE": 3}}
+    diff = shadow_parser.compare_results(primary, candidate)
+    assert abs(diff["metrics"]["total_length"]["rel_diff"] - 1 / 101) < 1e-12
+    assert diff["metrics"]["net_area_sqin"]["rel_diff"] == 0.0
+    assert diff["entity_count_diffs"] == {"LINE": {"primary": 2, "candidate": 3}}
+    assert diff["max_rel_diff"] == diff["metrics"]["total_length"]["rel_diff"]
+
+
+def test_submit_shadow_parse_records_comparison():
+    collection = InMemoryCollection("parser_shadow")
+    primary = dxf_parser.parse_dxf(TEST_FILE)
+    future = shadow_parser.submit_shadow_parse(TEST_FILE, primary, 0.05, collection, "dxf_parser:parse_dxf", 1.0,
+                                               part_number="test1.dxf")
+    record = future.result(timeout=60)
+    assert record["part_number"] == "test1.dxf"
+    assert record["max_rel_diff"] == 0.0
+    assert len(collection.documents) == 1
+
+
+def test_submit_shadow_parse_skips_when_disabled():
+    collection = InMemoryCollection("parser_shadow")
+    assert shadow_parser.submit_shadow_parse(TEST_FILE, {}, 0.01, collection, "", 1.0) is None
+    assert shadow_parser.submit_shadow_parse(TEST_FILE, {}, 0.01, collection, "dxf_parser:parse_dxf", 0.0) is None
+
+
+def test_candidate_errors_are_recorded():
+    collection = InMemoryCollection("parser_shadow")
+    future = shadow_parser.submit_shadow_parse(TEST_FILE, {}, 0.01, collection, "dxf_parser:no_such_engine", 1.0)
+    record = future.result(timeout=60)
+    assert "candidate_error" in record
+
+
+def test_summarize_shadow_records():
+    records = [
+        {"primary_ms": 100.0, "candidate_ms": 50.0, "speedup": 2.0, "max_rel_diff": 0.0,
+         "metrics": {"total_length": {"rel_diff": 0.0}}},
+        {"primary_ms": 100.0, "candidate_ms": 25.0, "speedup": 4.0, "max_rel_diff": 0.005,
+         "metrics": {"total_length": {"rel_diff": 0.005}}, "entity_count_diffs": {"ARC": {}}},
+        {"primary_ms": 100.0, "candidate_error": "boom"},
+    ]
+    summary = shadow_parser.summarize_shadow_records(records)
+    assert summary["completed"] == 2 and summary["candidate_errors"] == 1
+    assert summary["speedup_p50"] == 3.0
+    assert summary["divergence_buckets"]["exact"] == 1
+    assert summary["divergence_buckets"]["<=1e-2"] == 1
+    assert summary["entity_count_mismatches"] == 1
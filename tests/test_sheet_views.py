@@ -0,0 +1,114 @@
+# test_sheet_views.py
+# Checks drawing-sheet detection (frames, title blocks, views) and that only the primary view is measured.
+
+import os
+import sys
+import glob
+import math
+
+import ezdxf
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(script_dir, '..', 'app', 'utils')))
+import sheet_views
+import dxf_parser
+
+
+def _sheet(tmp_path, name="sheet.dxf", flat_pattern=True):
+    """B-size sheet: trim border, inner border of LINEs, title block, and two views of a bent 8 x 4 plate."""
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (17, 0), (17, 11), (0, 11)], close=True)
+    corners = [(0.5, 0.5), (16.5, 0.5), (16.5, 10.5), (0.5, 10.5)]
+    for a, b in zip(corners, corners[1:] + corners[:1]):
+        msp.add_line(a, b)
+    msp.add_lwpolyline([(10.5, 0.5), (16.5, 0.5), (16.5, 2.5), (10.5, 2.5)], close=True)
+    msp.add_line((10.5, 1.5), (16.5, 1.5))
+    msp.add_text("PART 123", dxfattribs={'height': 0.2}).set_placement((11, 1.8))
+    # Flat pattern with a hole and a bend line, and the folded side view next to it
+    msp.add_lwpolyline([(2, 5), (10, 5), (10, 9), (2, 9)], close=True)
+    msp.add_circle((4, 7), 0.5)
+    if flat_pattern:
+        msp.add_line((6, 5), (6, 9), dxfattribs={'layer': 'Bend Centerline (ANSI)'})
+    msp.add_lwpolyline([(12, 5), (16, 5), (16, 5.25), (12.25, 5.25), (12.25, 9), (12, 9)], close=True)
+    # Default text height: the label's box reaches into the side view
+    msp.add_text("FLAT PATTERN").set_placement((4, 4.5))
+    path = str(tmp_path / name)
+    doc.saveas(path)
+    return path
+
+
+def test_sheet_size_includes_borders_inside_the_margins():
+    assert sheet_views.is_sheet_size(17, 11) and sheet_views.is_sheet_size(10, 16)
+    assert not sheet_views.is_sheet_size(17, 4)
+
+
+def test_isolates_flat_pattern_view(tmp_path):
+    msp = ezdxf.readfile(_sheet(tmp_path)).modelspace()
+    sheet = sheet_views.isolate_view(msp, ["0"])
+    assert (sheet['frames'], sheet['views']) == (2, 2)
+    assert sheet['primary_bounds'] == (2.0, 5.0, 10.0, 9.0)
+    kept = [e.dxftype() for e in msp if e.dxf.handle not in sheet['skip']]
+    assert sorted(kept) == ['CIRCLE', 'LINE', 'LWPOLYLINE']
+
+
+def test_largest_view_without_bend_lines(tmp_path):
+    msp = ezdxf.readfile(_sheet(tmp_path, flat_pattern=False)).modelspace()
+    assert sheet_views.isolate_view(msp, ["0"])['primary_bounds'] == (2.0, 5.0, 10.0, 9.0)
+
+
+def test_parse_measures_only_the_primary_view(tmp_path):
+    result = dxf_parser.parse_dxf(_sheet(tmp_path))
+    assert math.isclose(result['total_length'], 24 + math.pi)
+    assert (result['gross_min_x'], result['gross_max_x'], result['gross_min_y'], result['gross_max_y']) == (2, 10, 5, 9)
+
+
+def test_labelled_plate_is_not_a_sheet(tmp_path):
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (17, 0), (17, 11), (0, 11)], close=True)
+    for x in (3, 8, 13):
+        msp.add_circle((x, 5.5), 1)
+    msp.add_text("ENGRAVE 42", dxfattribs={'height': 0.5}).set_placement((6, 8))
+    path = str(tmp_path / "plate.dxf")
+    doc.saveas(path)
+    assert sheet_views.isolate_view(ezdxf.readfile(path).modelspace(), ["0"]) is None
+
+
+def _plate(tmp_path, width, height, holes, label_at):
+    """Plate outline on layer 0 at a sheet size, round holes (x, y, radius) and a label."""
+    doc = ezdxf.new()
+    doc.header['$INSUNITS'] = 1
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (width, 0), (width, height), (0, height)], close=True)
+    for x, y, radius in holes:
+        msp.add_circle((x, y), radius)
+    msp.add_text("REV A", dxfattribs={'height': 0.25}).set_placement(label_at)
+    path = str(tmp_path / "plate.dxf")
+    doc.saveas(path)
+    return path
+
+
+def test_plate_with_a_hole_near_its_edge_is_not_a_sheet(tmp_path):
+    # The edge hole sits within one grid cell of the outline, with the label next to it
+    path = _plate(tmp_path, 24, 18, [(12, 9, 3), (0.15, 9, 0.1)], (0.5, 9.5))
+    assert sheet_views.isolate_view(ezdxf.readfile(path).modelspace(), ["0"]) is None
+    result = dxf_parser.parse_dxf(path)
+    assert math.isclose(result['total_length'], 84 + 6.2 * math.pi)
+    assert math.isclose(result['gross_area_sqin'], 432)
+
+
+def test_large_plate_with_several_holes_is_not_a_sheet(tmp_path):
+    holes = [(12, 9, 1), (36, 9, 1), (12, 27, 1), (36, 27, 1), (47.6, 18, 0.25)]
+    path = _plate(tmp_path, 48, 36, holes, (20, 18))
+    assert sheet_views.isolate_view(ezdxf.readfile(path).modelspace(), ["0"]) is None
+    result = dxf_parser.parse_dxf(path)
+    assert math.isclose(result['total_length'], 168 + 8.5 * math.pi)
+    assert math.isclose(result['gross_area_sqin'], 1728)
+
+
+def test_flat_pattern_exports_in_corpus_are_left_alone():
+    for path in glob.glob(os.path.join(script_dir, 'test_files', '*IDW*')):
+        assert sheet_views.isolate_view(ezdxf.readfile(path).modelspace(), ["0", "VISIBLE (ANSI)"]) is None
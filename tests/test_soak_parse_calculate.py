@@ -0,0 +1,47 @@
+# test_soak_parse_calculate.py
+# Checks the soak harness slope evaluation and the in-memory MongoDB stand-in it runs against.
+
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(script_dir, '..', 'scripts')))
+import soak_parse_calculate as soak
+from local_stand_ins import InMemoryMongoClient
+
+
+def _samples(rss_per_cycle, objects_per_cycle, cycles=1000, every=100):
+    return [{"cycle": c, "rss_kb": 100000 + rss_per_cycle * c, "objects": 50000 + objects_per_cycle * c,
+             "ezdxf_documents": 0, "root_log_handlers": 2} for c in range(0, cycles, every)]
+
+
+def test_linear_slope():
+    assert soak.linear_slope([0, 1, 2], [5, 7, 9]) == 2
+    assert soak.linear_slope([1], [1]) is None
+
+
+def test_evaluate_passes_flat_series():
+    slopes, failures = soak.evaluate(_samples(0, 0), warmup_cycles=100, max_rss_slope_kb=1.0, max_object_slope=2.0)
+    assert failures == []
+    assert abs(slopes["rss_kb_per_cycle"]) < 1e-9
+
+
+def test_evaluate_flags_growth_after_warmup():
+    samples = _samples(4.0, 10.0)
+    slopes, failures = soak.evaluate(samples, warmup_cycles=100, max_rss_slope_kb=1.0, max_object_slope=2.0)
+    assert len(failures) == 2
+    assert abs(slopes["rss_kb_per_cycle"] - 4.0) < 1e-9
+
+
+def test_in_memory_collection_round_trip():
+    db = InMemoryMongoClient()["test"]
+    db.order_items.insert_one({"cart_uid": "a", "order_id": "o1", "quantity": 1})
+    db.order_items.insert_one({"cart_uid": "b", "order_id": "o2", "quantity": 1})
+    db.order_items.update_one({"cart_uid": "a"}, {"$set": {"quantity": 3}})
+    items = list(db.order_items.find({"order_id": "o1"}))
+    assert [item["quantity"] for item in items] == [3]
+    items[0]["quantity"] = 99  # returned documents are copies
+    assert db.order_items.find_one({"cart_uid": "a"})["quantity"] == 3
+    assert db.order_items.count_documents({"order_id": {"$in": ["o1", "o2"]}}) == 2
+    assert db.order_items.delete_many({"order_id": "o1"}).deleted_count == 1
+    assert db.list_collection_names() == ["order_items"]